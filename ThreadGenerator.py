@@ -1,27 +1,66 @@
 # Author-Nick Park
 # Description-Generate set of threads with different tolerance
+import time
+
+_importStartTime = time.perf_counter()
 
 import adsk.cam
 import adsk.core
 import adsk.fusion
 
 from .lib.GenerateThreadsCommand import GenerateThreadsCommand
-from .lib.common.Common import ui, design, printTrace
+from .lib.ThreadDetailCommand import ThreadDetailCommand
+from .lib.ThreadJobsCommand import ThreadJobsCommand
+from .lib.common.Common import getUi, getDesign, printTrace, log
+
+_importTime = time.perf_counter() - _importStartTime
 
 # maintain a global reference to command to keep its handlers alive
 command = None
+detailCommands = []
+jobsCommand = None
 
 
 def run(context):
     try:
-        if not design:
-            ui.messageBox('It is not supported in current workspace, please change to MODEL workspace and try again.')
-            return
-
-        global command
-        command = GenerateThreadsCommand()
-        command.execute()
+        runStartTime = time.perf_counter()
+        global command, detailCommands, jobsCommand
+        if context and context.get('IsApplicationStartup'):
+            # loaded with Fusion, only register the buttons, the dialog is built on first click
+            command = GenerateThreadsCommand(terminateOnDestroy=False)
+            command.addToToolbar()
+            # the stand-in commands need the add-in to stay loaded, a single run terminates with its dialog
+            detailCommands = [ThreadDetailCommand(isFullDetail) for isFullDetail in (True, False)]
+            for detailCommand in detailCommands:
+                detailCommand.addToToolbar()
+            jobsCommand = ThreadJobsCommand()
+            jobsCommand.addToToolbar()
+        else:
+            if not getDesign():
+                getUi().messageBox('It is not supported in current workspace, please change to MODEL workspace and '
+                                   'try again.')
+                return
+            command = GenerateThreadsCommand()
+            command.execute()
+        log('Thread Generator: import {:.1f} ms, run {:.1f} ms'.format(
+            _importTime * 1000, (time.perf_counter() - runStartTime) * 1000))
 
         adsk.autoTerminate(False)
     except:
         printTrace()
+
+
+def stop(context):
+    try:
+        global command, detailCommands, jobsCommand
+        if command:
+            command.delete()
+            command = None
+        for detailCommand in detailCommands:
+            detailCommand.delete()
+        detailCommands = []
+        if jobsCommand:
+            jobsCommand.delete()
+            jobsCommand = None
+    except:
+        printTrace()
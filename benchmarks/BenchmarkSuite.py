@@ -0,0 +1,263 @@
+# Benchmarks the add-in outside of Fusion 360 against the recording `adsk` stand-in in benchmarks/fakeadsk.
+#
+#   python benchmarks/BenchmarkSuite.py                    compare against benchmarks/baseline.json
+#   python benchmarks/BenchmarkSuite.py --update-baseline  record a new baseline
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+_BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+_ADD_IN_FOLDER = os.path.dirname(_BENCHMARK_FOLDER)
+_BASELINE_PATH = os.path.join(_BENCHMARK_FOLDER, 'baseline.json')
+sys.path.insert(0, os.path.join(_BENCHMARK_FOLDER, 'fakeadsk'))
+
+from adsk import recorder
+from adsk.core import Application, CommandInputs, Matrix3D, Point3D
+
+# Fusion object counts reported per scenario, keyed by the recorded `collection.method` calls
+_OBJECT_COUNTS = {
+    'sketches': ['sketches.add'],
+    'constructionPlanes': ['constructionPlanes.add'],
+    'lines': ['sketchLines.addByTwoPoints', 'sketchLines.addTwoPointRectangle'],
+    'splines': ['sketchFittedSplines.add', 'sketchFixedSplines.addByNurbsCurve'],
+    'fitPoints': ['fitPoints'],
+    'lofts': ['loftFeatures.add'],
+    'sweeps': ['sweepFeatures.add'],
+    'extrudes': ['extrudeFeatures.add'],
+    'revolves': ['revolveFeatures.add'],
+    'combines': ['combineFeatures.add'],
+    'sketchSolves': ['sketchSolves'],
+}
+
+_SELECTION_SIZES = [2, 10, 40]
+_LENGTHS = [10, 20]
+_PITCHES = [1, 2]
+_GENERATION_COUNTS = [1, 5, 10]
+# scenario label -> output mode dropdown entry
+_OUTPUT_MODES = {'direct': 'Direct', 'mesh': 'Mesh', 'batched': 'Parametric, Batched Booleans',
+                 'planned': 'Parametric, Planned', 'standIn': 'Stand-In'}
+
+
+class _Selections:
+    # stand-in for UserInterface.activeSelections, holding sketch points of one sketch
+    class _Selection:
+        def __init__(self, entity):
+            self.entity = entity
+
+    class _SketchPoint:
+        def __init__(self, parentSketch, x: float):
+            self.parentSketch = parentSketch
+            self.geometry = Point3D(x, 0, 0)
+            self.worldGeometry = Point3D(x, 0, 0)
+
+    def __init__(self, pointCount: int, spacing: float = 2):
+        sketch = recorder.FakeObject('sketch')
+        sketch.transform = Matrix3D.create()
+        self._selections = [self._Selection(self._SketchPoint(sketch, i * spacing)) for i in range(pointCount)]
+
+    @property
+    def count(self) -> int:
+        return len(self._selections)
+
+    def item(self, index: int):
+        return self._selections[index]
+
+
+def registerAddIn():
+    # the add-in folder is a package with relative imports, load it under the name Fusion gives it
+    spec = importlib.util.spec_from_file_location('ThreadGenerator', os.path.join(_ADD_IN_FOLDER, '__init__.py'),
+                                                  submodule_search_locations=[_ADD_IN_FOLDER])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['ThreadGenerator'] = module
+    spec.loader.exec_module(module)
+
+
+def measureStartup() -> dict:
+    # import and run the add-in entry point the way Fusion does on launch, before anything else is imported
+    recorder.reset()
+    startTime = time.perf_counter()
+    entryPoint = importlib.import_module('ThreadGenerator.ThreadGenerator')
+    entryPoint.run({'IsApplicationStartup': True})
+    elapsedTime = time.perf_counter() - startTime
+    entryPoint.stop({})
+    return {'time': elapsedTime, 'counts': getCounts()}
+
+
+def loadAddIn():
+    if 'ThreadGenerator' not in sys.modules:
+        registerAddIn()
+    # the run log would otherwise be written to the home folder on every scenario
+    importlib.import_module('ThreadGenerator.lib.common.Instrumentation').instrumentation.setSinks([])
+    return (importlib.import_module('ThreadGenerator.lib.UserParameters').UserParameters,
+            importlib.import_module('ThreadGenerator.lib.OnExecuteHandler').OnExecuteHandler,
+            importlib.import_module('ThreadGenerator.lib.sketch.ThreadFeature').ThreadFeature)
+
+
+def getScenarios() -> [dict]:
+    scenarios = []
+    for isMale in (True, False):
+        for length in _LENGTHS:
+            for pitch in _PITCHES:
+                gender = 'male' if isMale else 'female'
+                scenarios.append({'name': 'threadFeature-{}-L{}-P{}'.format(gender, length, pitch),
+                                  'kind': 'threadFeature', 'isMale': isMale, 'length': length, 'pitch': pitch,
+                                  'generationCount': 1})
+                for generationCount in _GENERATION_COUNTS:
+                    scenarios.append({'name': 'run-{}-L{}-P{}-G{}'.format(gender, length, pitch, generationCount),
+                                      'kind': 'run', 'isMale': isMale, 'length': length, 'pitch': pitch,
+                                      'generationCount': generationCount})
+    for label, outputMode in _OUTPUT_MODES.items():
+        for isMale in (True, False):
+            for generationCount in (5, 10):
+                gender = 'male' if isMale else 'female'
+                scenarios.append({'name': 'run-{}-{}-L20-P2-G{}'.format(label, gender, generationCount),
+                                  'kind': 'run', 'outputMode': outputMode, 'isMale': isMale, 'length': 20, 'pitch': 2,
+                                  'generationCount': generationCount})
+    for isMale in (True, False):
+        for generationCount in _GENERATION_COUNTS:
+            gender = 'male' if isMale else 'female'
+            scenarios.append({'name': 'run-deferred-{}-L20-P2-G{}'.format(gender, generationCount), 'kind': 'run',
+                              'isComputeDeferred': True, 'isMale': isMale, 'length': 20, 'pitch': 2,
+                              'generationCount': generationCount})
+    for isMale in (True, False):
+        for generationCount in (5, 10):
+            gender = 'male' if isMale else 'female'
+            scenarios.append({'name': 'run-compacted-{}-L20-P2-G{}'.format(gender, generationCount), 'kind': 'run',
+                              'isTimelineCompacted': True, 'isMale': isMale, 'length': 20, 'pitch': 2,
+                              'generationCount': generationCount})
+    for isMale in (True, False):
+        for selectionSize in _SELECTION_SIZES:
+            gender = 'male' if isMale else 'female'
+            scenarios.append({'name': 'selection-{}-L10-P2-S{}'.format(gender, selectionSize), 'kind': 'run',
+                              'selectionSize': selectionSize, 'outputMode': 'Direct', 'isMale': isMale, 'length': 10,
+                              'pitch': 2, 'generationCount': 1})
+            scenarios.append({'name': 'selection-parametric-{}-L10-P2-S{}'.format(gender, selectionSize),
+                              'kind': 'run', 'selectionSize': selectionSize, 'isMale': isMale, 'length': 10,
+                              'pitch': 2, 'generationCount': 1})
+    return scenarios
+
+
+def runScenario(scenario: dict, addIn, repeats: int) -> dict:
+    UserParameters, OnExecuteHandler, ThreadFeature = addIn
+    commandInputs = CommandInputs()
+    for userParameter in UserParameters.getAllParameters():
+        userParameter.addToCommandInputs(commandInputs)
+    commandInputs.itemById('lengthId').expression = '{} mm'.format(scenario['length'])
+    commandInputs.itemById('pitchId').expression = '{} mm'.format(scenario['pitch'])
+    # the default notch of 0.5 mm is 0.5 mm wider than the protrusion would fit into a 1 mm pitch
+    commandInputs.itemById('notchWidthId').expression = '{} mm'.format(scenario['pitch'] / 4)
+    commandInputs.itemById('isMaleId').value = scenario['isMale']
+    commandInputs.itemById('generationCountId').valueOne = scenario['generationCount']
+    commandInputs.itemById('outputModeId').select(scenario.get('outputMode', 'Parametric'))
+    commandInputs.itemById('deferComputeId').value = scenario.get('isComputeDeferred', False)
+    commandInputs.itemById('compactTimelineId').value = scenario.get('isTimelineCompacted', False)
+    # cached bodies would make the timings depend on earlier runs
+    commandInputs.itemById('bodyCacheId').value = False
+    UserParameters.updateValuesFromCommandInputs(commandInputs)
+
+    def build():
+        if scenario['kind'] == 'run':
+            OnExecuteHandler().run()
+            return
+        component = recorder.FakeObject('component')
+        threadFeature = ThreadFeature(component, Point3D.create(0, 0, 0), component.xYConstructionPlane,
+                                      UserParameters.getCouponSpec().thread)
+        if scenario['isMale']:
+            threadFeature.createMaleThread()
+        else:
+            threadFeature.createFemaleThread()
+
+    elapsedTimes = []
+    userInterface = Application.get().userInterface
+    userInterface.activeSelections = _Selections(scenario.get('selectionSize', 0))
+    try:
+        for _ in range(repeats):
+            recorder.reset()
+            startTime = time.perf_counter()
+            build()
+            elapsedTimes.append(time.perf_counter() - startTime)
+    finally:
+        userInterface.activeSelections = _Selections(0)
+    return {'time': min(elapsedTimes), 'counts': getCounts()}
+
+
+def getCounts() -> dict:
+    counts = {name: sum(recorder.calls[key] for key in keys) for name, keys in _OBJECT_COUNTS.items()}
+    counts['timelineItems'] = recorder.timeline.count
+    # sketch solves are done by Fusion, not called by the add-in
+    counts['apiCalls'] = sum(count for key, count in recorder.calls.items() if key != 'sketchSolves')
+    return counts
+
+
+def findRegressions(name: str, result: dict, baseline: dict, timeThreshold: float, countThreshold: float) -> [str]:
+    regressions = []
+    # a small absolute allowance keeps sub-millisecond scenarios from failing on timer noise
+    allowedTime = baseline['time'] * (1 + timeThreshold) + 0.002
+    if result['time'] > allowedTime:
+        regressions.append('{}: time {:.4f}s > {:.4f}s'.format(name, result['time'], allowedTime))
+    for countName, count in result['counts'].items():
+        baselineCount = baseline['counts'].get(countName)
+        if baselineCount is None:
+            # a count the baseline does not know would otherwise go unguarded
+            regressions.append('{}: {} missing from the baseline'.format(name, countName))
+        elif count > baselineCount * (1 + countThreshold):
+            regressions.append('{}: {} {} > {}'.format(name, countName, count, baselineCount))
+    return regressions
+
+
+def main(argv: [str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the thread generator against a recording adsk stand-in.')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--time-threshold', type=float, default=1.0,
+                        help='allowed relative wall time increase over the baseline')
+    parser.add_argument('--count-threshold', type=float, default=0.0,
+                        help='allowed relative Fusion object count increase over the baseline')
+    parser.add_argument('--filter', default='', help='only run scenarios whose name contains this text')
+    args = parser.parse_args(argv)
+
+    registerAddIn()
+    results = {}
+    # startup is filtered by name like the scenarios
+    startupName = 'startup'
+    if args.filter in startupName:
+        results[startupName] = measureStartup()
+    addIn = loadAddIn()
+    for scenario in getScenarios():
+        if args.filter in scenario['name']:
+            results[scenario['name']] = runScenario(scenario, addIn, args.repeats)
+
+    countNames = list(_OBJECT_COUNTS) + ['timelineItems', 'apiCalls']
+    print('{:<40}{:>10}'.format('scenario', 'time [ms]') + ''.join('{:>20}'.format(name) for name in countNames))
+    for name, result in results.items():
+        print('{:<40}{:>10.2f}'.format(name, result['time'] * 1000) +
+              ''.join('{:>20}'.format(result['counts'][countName]) for countName in countNames))
+
+    if args.update_baseline:
+        with open(_BASELINE_PATH, 'w') as baselineFile:
+            json.dump(results, baselineFile, indent=2, sort_keys=True)
+        print('baseline written to {}'.format(_BASELINE_PATH))
+        return 0
+
+    if not os.path.isfile(_BASELINE_PATH):
+        print('no baseline found, run with --update-baseline first')
+        return 1
+    with open(_BASELINE_PATH) as baselineFile:
+        baselines = json.load(baselineFile)
+    regressions = []
+    for name, result in results.items():
+        if name in baselines:
+            regressions += findRegressions(name, result, baselines[name], args.time_threshold, args.count_threshold)
+        else:
+            regressions.append('{}: missing from the baseline'.format(name))
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
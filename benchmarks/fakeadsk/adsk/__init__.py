@@ -0,0 +1,15 @@
+# Stand-in for the Fusion 360 `adsk` package that records API calls instead of modelling anything.
+# Only used by the benchmark suite, see benchmarks/BenchmarkSuite.py.
+from . import recorder
+
+
+def autoTerminate(value: bool):
+    recorder.record('adsk.autoTerminate')
+
+
+def terminate():
+    recorder.record('adsk.terminate')
+
+
+def doEvents():
+    recorder.record('adsk.doEvents')
@@ -0,0 +1 @@
+# adsk.cam is imported by the add-in entry point but not used
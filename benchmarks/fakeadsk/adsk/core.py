@@ -0,0 +1,274 @@
+import math
+import re
+
+from .recorder import FakeObject, record, timeline
+
+
+class Point3D:
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def create(x: float = 0, y: float = 0, z: float = 0) -> 'Point3D':
+        record('Point3D.create')
+        return Point3D(x, y, z)
+
+    def copy(self) -> 'Point3D':
+        return Point3D(self.x, self.y, self.z)
+
+
+class Vector3D(Point3D):
+    @staticmethod
+    def create(x: float = 0, y: float = 0, z: float = 0) -> 'Vector3D':
+        return Vector3D(x, y, z)
+
+
+class Matrix3D:
+    def __init__(self):
+        self.translation = Vector3D(0, 0, 0)
+
+    @staticmethod
+    def create() -> 'Matrix3D':
+        return Matrix3D()
+
+    def asArray(self) -> [float]:
+        t = self.translation
+        return [1, 0, 0, t.x, 0, 1, 0, t.y, 0, 0, 1, t.z, 0, 0, 0, 1]
+
+    def setWithArray(self, values: [float]) -> bool:
+        self.translation = Vector3D(values[3], values[7], values[11])
+        return True
+
+    def transformBy(self, matrix: 'Matrix3D') -> bool:
+        # translations only, like every matrix of the stand-in
+        t = matrix.translation
+        self.translation = Vector3D(self.translation.x + t.x, self.translation.y + t.y, self.translation.z + t.z)
+        return True
+
+
+class ObjectCollection:
+    def __init__(self):
+        self._items = []
+
+    @staticmethod
+    def create() -> 'ObjectCollection':
+        return ObjectCollection()
+
+    def add(self, item):
+        self._items.append(item)
+
+    def item(self, index: int):
+        return self._items[index]
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+
+class ValueInput:
+    def __init__(self, realValue: float):
+        self.realValue = realValue
+
+    @staticmethod
+    def createByReal(realValue: float) -> 'ValueInput':
+        return ValueInput(realValue)
+
+
+class NurbsCurve3D:
+    @staticmethod
+    def createRational(controlPoints, degree, knots, weights, isPeriodic) -> FakeObject:
+        record('NurbsCurve3D.createRational')
+        record('controlPoints', len(controlPoints))
+        return FakeObject('nurbsCurve3D')
+
+
+class OrientedBoundingBox3D:
+    @staticmethod
+    def create(*args) -> FakeObject:
+        return FakeObject('orientedBoundingBox3D')
+
+
+class UnitsManager:
+    internalUnits = 'cm'
+    # factors to internal units
+    _FACTORS = {'cm': 1.0, 'mm': 0.1, 'm': 100.0, 'in': 2.54, 'deg': math.pi / 180, 'rad': 1.0}
+
+    def convert(self, value: float, inputUnits: str, outputUnits: str) -> float:
+        return value * self._FACTORS[inputUnits] / self._FACTORS[outputUnits]
+
+    def evaluateExpression(self, expression: str, units: str) -> float:
+        match = re.fullmatch(r'\s*([-+0-9.eE]+)\s*([a-z]*)\s*', expression)
+        return float(match.group(1)) * self._FACTORS[match.group(2) or units]
+
+    def formatInternalValue(self, value: float, units: str = 'cm', showUnits: bool = True) -> str:
+        formatted = '{:.4g}'.format(self.convert(value, self.internalUnits, units))
+        return formatted + ' ' + units if showUnits else formatted
+
+
+class _Design(FakeObject):
+    def __init__(self):
+        super().__init__('design')
+        self.timeline = timeline
+        self.unitsManager = UnitsManager()
+        self.designType = 1
+
+
+class Application:
+    _application = None
+
+    def __init__(self):
+        self.userInterface = FakeObject('userInterface')
+        self.activeProduct = _Design()
+
+    @staticmethod
+    def get() -> 'Application':
+        if Application._application is None:
+            Application._application = Application()
+        return Application._application
+
+
+class _CommandInput:
+    def __init__(self, id: str):
+        self.id = id
+
+    @classmethod
+    def cast(cls, value):
+        return value
+
+
+class ValueCommandInput(_CommandInput):
+    def __init__(self, id: str, unitType: str, value: float):
+        super().__init__(id)
+        self.unitType = unitType
+        self.value = value
+        self.expression = UnitsManager().formatInternalValue(value, unitType)
+
+
+class BoolValueCommandInput(_CommandInput):
+    def __init__(self, id: str, value: bool):
+        super().__init__(id)
+        self.value = value
+
+
+class IntegerSliderCommandInput(_CommandInput):
+    def __init__(self, id: str, valueOne: int):
+        super().__init__(id)
+        self.valueOne = valueOne
+
+
+class IntegerSpinnerCommandInput(_CommandInput):
+    def __init__(self, id: str, value: int):
+        super().__init__(id)
+        self.value = value
+
+
+class StringValueCommandInput(_CommandInput):
+    def __init__(self, id: str, value: str):
+        super().__init__(id)
+        self.value = value
+
+
+class _ListItem:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class _ListItems:
+    def __init__(self, dropDown: 'DropDownCommandInput'):
+        self._dropDown = dropDown
+        self._items = []
+
+    def add(self, name: str, isSelected: bool, *args):
+        item = _ListItem(name)
+        self._items.append(item)
+        if isSelected or self._dropDown.selectedItem is None:
+            self._dropDown.selectedItem = item
+        return item
+
+    def clear(self):
+        self._items = []
+        self._dropDown.selectedItem = None
+
+    def item(self, index: int) -> _ListItem:
+        return self._items[index]
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+
+class DropDownCommandInput(_CommandInput):
+    def __init__(self, id: str):
+        super().__init__(id)
+        self.selectedItem = None
+        self.listItems = _ListItems(self)
+
+    def select(self, name: str):
+        self.selectedItem = next(item for item in self.listItems._items if item.name == name)
+
+
+class CommandInputs:
+    def __init__(self):
+        self._inputs = []
+
+    def _add(self, commandInput):
+        record('commandInputs.add')
+        self._inputs.append(commandInput)
+        return commandInput
+
+    def addValueInput(self, id, name, unitType, initialValue: ValueInput):
+        return self._add(ValueCommandInput(id, unitType, initialValue.realValue))
+
+    def addBoolValueInput(self, id, name, isCheckBox, resourceFolder='', initialValue=False):
+        return self._add(BoolValueCommandInput(id, initialValue))
+
+    def addIntegerSliderCommandInput(self, id, name, min, max, hasTwoSliders=False):
+        return self._add(IntegerSliderCommandInput(id, min))
+
+    def addIntegerSpinnerCommandInput(self, id, name, min, max, spinStep, initialValue):
+        return self._add(IntegerSpinnerCommandInput(id, initialValue))
+
+    def addStringValueInput(self, id, name, initialValue=''):
+        return self._add(StringValueCommandInput(id, initialValue))
+
+    def addDropDownCommandInput(self, id, name, dropDownStyle):
+        return self._add(DropDownCommandInput(id))
+
+    def itemById(self, id: str):
+        return next((commandInput for commandInput in self._inputs if commandInput.id == id), None)
+
+    def item(self, index: int):
+        return self._inputs[index]
+
+    @property
+    def count(self) -> int:
+        return len(self._inputs)
+
+
+class DropDownStyles:
+    TextListDropDownStyle = 1
+
+
+class NamedValues:
+    @staticmethod
+    def create() -> FakeObject:
+        return FakeObject('namedValues')
+
+
+class _EventHandler:
+    def __init__(self):
+        pass
+
+
+CommandCreatedEventHandler = _EventHandler
+CommandEventHandler = _EventHandler
+InputChangedEventHandler = _EventHandler
+CustomEventHandler = _EventHandler
+ApplicationCommandEventHandler = _EventHandler
+
+
+def __getattr__(name: str):
+    # every other adsk.core type is only used for annotations and casts
+    return type(name, (_CommandInput,), {})
@@ -0,0 +1,59 @@
+from .recorder import FakeObject
+
+
+class Design:
+    @staticmethod
+    def cast(product):
+        return product
+
+
+class TemporaryBRepManager:
+    _manager = None
+
+    @staticmethod
+    def get() -> FakeObject:
+        if TemporaryBRepManager._manager is None:
+            TemporaryBRepManager._manager = FakeObject('temporaryBRepManager')
+        return TemporaryBRepManager._manager
+
+
+class FeatureOperations:
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+
+class SweepOrientationTypes:
+    ParallelOrientationType = 0
+    PerpendicularOrientationType = 1
+
+
+class BooleanTypes:
+    DifferenceBooleanType = 0
+    IntersectionBooleanType = 1
+    UnionBooleanType = 2
+
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+class BRepEntityTypes:
+    BRepBodyEntityType = 0
+    BRepFaceEntityType = 1
+    BRepEdgeEntityType = 2
+    BRepVertexEntityType = 3
+
+
+class _Castable:
+    @classmethod
+    def cast(cls, value):
+        return value
+
+
+def __getattr__(name: str):
+    # every other adsk.fusion type is only used for annotations and casts
+    return type(name, (_Castable,), {})
@@ -0,0 +1,165 @@
+from collections import Counter
+
+calls = Counter()
+
+# collections whose `add` creates an item in the design timeline
+_TIMELINE_COLLECTIONS = {'sketches', 'constructionPlanes', 'occurrences', 'baseFeatures', 'copyPasteBodies'}
+# collections whose `add` changes a sketch, Fusion solves the sketch after each of them unless compute is deferred
+_SKETCH_COLLECTIONS = {'sketchLines', 'sketchCircles', 'sketchPoints', 'sketchFittedSplines', 'sketchFixedSplines'}
+
+
+def record(key: str, amount: int = 1):
+    calls[key] += amount
+
+
+def reset():
+    calls.clear()
+    timeline.reset()
+
+
+def isTimelineCall(collection: str, method: str) -> bool:
+    if not method.startswith('add'):
+        return False
+    return collection in _TIMELINE_COLLECTIONS or collection.endswith('Features')
+
+
+class Timeline:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.markerPosition = 0
+
+    def addItem(self):
+        # new items are inserted at the marker, everything after it is rolled forward
+        self.count += 1
+        self.markerPosition += 1
+
+    def deleteAllAfterMarker(self):
+        record('timeline.deleteAllAfterMarker')
+        self.count = self.markerPosition
+
+    @property
+    def timelineGroups(self):
+        return FakeObject('timelineGroups')
+
+
+class FakeObject:
+    # any attribute chain resolves, calls are recorded by `collection.method` and return new fake objects
+    def __init__(self, name: str, parent: 'FakeObject' = None, sketch: 'FakeObject' = None):
+        self._name = name
+        self._parent = parent
+        self._sketch = sketch
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name == 'count':
+            return 0
+        if name == 'parentSketch':
+            return self._sketch
+        child = FakeObject(name, self, self._sketch)
+        object.__setattr__(self, name, child)
+        return child
+
+    def __call__(self, *args, **kwargs):
+        collection = self._parent._name if self._parent is not None else ''
+        key = '{}.{}'.format(collection, self._name)
+        record(key)
+        if isTimelineCall(collection, self._name):
+            timeline.addItem()
+        if collection in _SKETCH_COLLECTIONS and not _isComputeDeferred(self._sketch):
+            record('sketchSolves')
+        handler = _handlers.get(key)
+        if handler is not None:
+            return handler(self, *args, **kwargs)
+        return FakeObject(key, None, self._sketch)
+
+
+class _FakeSketch(FakeObject):
+    def __setattr__(self, name: str, value):
+        if name == 'isComputeDeferred' and not value and _isComputeDeferred(self):
+            # the deferred changes are solved at once
+            record('sketchSolves')
+        object.__setattr__(self, name, value)
+
+
+def _isComputeDeferred(sketch: FakeObject) -> bool:
+    return sketch is not None and sketch.__dict__.get('isComputeDeferred', False)
+
+
+def _addSketch(method: FakeObject, plane, *args):
+    from .core import Matrix3D
+    sketch = _FakeSketch('sketch')
+    object.__setattr__(sketch, '_sketch', sketch)
+    sketch.referencePlane = plane
+    sketch.transform = Matrix3D.create()
+    return sketch
+
+
+def _addSketchPoint(method: FakeObject, point):
+    sketchPoint = FakeObject('sketchPoint', None, method._sketch)
+    sketchPoint.geometry = point.copy()
+    # every fake sketch has an identity transform
+    sketchPoint.worldGeometry = point.copy()
+    return sketchPoint
+
+
+def _addFittedSpline(method: FakeObject, points):
+    record('fitPoints', points.count)
+    return FakeObject('sketchFittedSpline', None, method._sketch)
+
+
+def _addNewComponent(method: FakeObject, transform):
+    occurrence = FakeObject('occurrence')
+    occurrence.component = FakeObject('component')
+    return occurrence
+
+
+def _findBRepUsingPoint(method: FakeObject, point, entityType, proximityTolerance=0, isVisibleEntitiesOnly=True):
+    # every point lies on the same plate
+    from .core import ObjectCollection
+    bodies = ObjectCollection()
+    bodies.add(_plate)
+    return bodies
+
+
+def _itemById(method: FakeObject, id: str):
+    # nothing is registered in a fresh user interface
+    return None
+
+
+def _createProgressDialog(method: FakeObject):
+    progressDialog = FakeObject('progressDialog')
+    progressDialog.wasCancelled = False
+    return progressDialog
+
+
+def _createFusionArchiveExportOptions(method: FakeObject, filename: str):
+    exportOptions = FakeObject('exportOptions')
+    exportOptions.filename = filename
+    return exportOptions
+
+
+def _executeExport(method: FakeObject, exportOptions: FakeObject):
+    # nothing is modeled, an empty archive keeps the file size reports working
+    open(exportOptions.filename, 'wb').close()
+    return True
+
+
+_handlers = {
+    'sketches.add': _addSketch,
+    'sketchPoints.add': _addSketchPoint,
+    'sketchFittedSplines.add': _addFittedSpline,
+    'occurrences.addNewComponent': _addNewComponent,
+    'commandDefinitions.itemById': _itemById,
+    'userInterface.createProgressDialog': _createProgressDialog,
+    'rootComponent.findBRepUsingPoint': _findBRepUsingPoint,
+    'exportManager.createFusionArchiveExportOptions': _createFusionArchiveExportOptions,
+    'exportManager.execute': _executeExport,
+}
+
+_plate = FakeObject('plate')
+
+timeline = Timeline()
@@ -0,0 +1,39 @@
+from .OutputMode import OutputMode
+from .geometry.Coupon import CouponParameters, getBaseCuboidCorners, getCylinderDimensions, getGenerationOffset, \
+    getGenerationTolerances
+from .sketch.ThreadSpec import FrozenSpec, ThreadSpec
+
+
+class CouponSpec(FrozenSpec):
+    # dialog state resolved once per execute, with the tolerances of every generation already applied
+    _fields = ('thread', 'isMale', 'generationCount', 'majorDiameterStep', 'minorDiameterStep', 'notchWidthStep',
+               'outputMode', 'isPreviewEndsOnly', 'isBodyCacheEnabled', 'meshResolution', 'isComputeDeferred',
+               'isTimelineCompacted')
+    __slots__ = _fields + ('generations',)
+
+    def __init__(self, thread: ThreadSpec, isMale: bool, generationCount: int, majorDiameterStep: float,
+                 minorDiameterStep: float, notchWidthStep: float, outputMode: OutputMode = OutputMode.PARAMETRIC,
+                 isPreviewEndsOnly: bool = False, isBodyCacheEnabled: bool = False, meshResolution: int = 64,
+                 isComputeDeferred: bool = False, isTimelineCompacted: bool = False):
+        super().__init__(thread, isMale, generationCount, majorDiameterStep, minorDiameterStep, notchWidthStep,
+                         outputMode, isPreviewEndsOnly, isBodyCacheEnabled, meshResolution, isComputeDeferred,
+                         isTimelineCompacted)
+        generations = tuple(thread.withTolerances(*getGenerationTolerances(i, majorDiameterStep, minorDiameterStep,
+                                                                           notchWidthStep))
+                            for i in range(generationCount))
+        object.__setattr__(self, 'generations', generations)
+
+    def getGenerationOffset(self, generationCount: int) -> float:
+        return getGenerationOffset(self.thread.majorDiameter, generationCount)
+
+    def getBaseCuboidCorners(self) -> ((float, float, float), (float, float, float)):
+        return getBaseCuboidCorners(self.thread.majorDiameter, self.generationCount, self.isMale)
+
+    def getCylinderDimensions(self) -> (float, float):
+        return getCylinderDimensions(self.thread.majorDiameter, self.thread.length)
+
+    def toCouponParameters(self) -> CouponParameters:
+        return CouponParameters(self.thread.length, self.thread.majorDiameter, self.thread.minorDiameter,
+                                self.thread.pitch, self.thread.cutAngle, self.thread.notchWidth, self.isMale,
+                                self.generationCount, self.majorDiameterStep, self.minorDiameterStep,
+                                self.notchWidthStep)
@@ -1,29 +1,42 @@
-from adsk.core import CommandCreatedEventArgs, NamedValues, CommandCreatedEventHandler, CommandInputs
+from adsk.core import CommandCreatedEventArgs, NamedValues, CommandCreatedEventHandler
 
-from .OnDestroyHandler import OnDestroyHandler
-from .OnExecuteHandler import OnExecuteHandler
-from .UserParameters import UserParameters
-from .OnInputChangedHandler import OnInputChangedHandler
-from .common.Common import ui, printTrace, resourceFolder
+from .common.Common import getUi, printTrace, resourceFolder
+
+_COMMAND_ID = 'ThreadGenerator'
+PANEL_ID = 'SolidCreatePanel'
 
 
 class GenerateThreadsCommand:
-    def __init__(self):
-        self._commandCreatedHandler = self._CommandCreatedHandler()
-        self._commandDefinition = ui.commandDefinitions.itemById('ThreadGenerator')
+    def __init__(self, terminateOnDestroy: bool = True):
+        self._commandCreatedHandler = self._CommandCreatedHandler(terminateOnDestroy)
+        self._commandDefinition = getUi().commandDefinitions.itemById(_COMMAND_ID)
         if not self._commandDefinition:
-            self._commandDefinition = ui.commandDefinitions.addButtonDefinition('ThreadGenerator', 'Generate Thread',
-                                                                                'Generates threads.', resourceFolder)
+            self._commandDefinition = getUi().commandDefinitions.addButtonDefinition(_COMMAND_ID, 'Generate Thread',
+                                                                                     'Generates threads.',
+                                                                                     resourceFolder)
         self._commandDefinition.commandCreated.add(self._commandCreatedHandler)
 
     def execute(self):
         inputs = NamedValues.create()
         self._commandDefinition.execute(inputs)
 
+    def addToToolbar(self):
+        panel = getUi().allToolbarPanels.itemById(PANEL_ID)
+        if panel and not panel.controls.itemById(_COMMAND_ID):
+            panel.controls.addCommand(self._commandDefinition)
+
+    def delete(self):
+        panel = getUi().allToolbarPanels.itemById(PANEL_ID)
+        control = panel.controls.itemById(_COMMAND_ID) if panel else None
+        if control:
+            control.deleteMe()
+        self._commandDefinition.deleteMe()
+
     # Event handler for the commandCreated event.
     class _CommandCreatedHandler(CommandCreatedEventHandler):
-        def __init__(self):
+        def __init__(self, terminateOnDestroy: bool):
             super().__init__()
+            self._terminateOnDestroy = terminateOnDestroy
             self._onInputChangedHandler = None
             self._onExecuteHandler = None
             self._onExecutePreviewHandler = None
@@ -31,13 +44,19 @@ class GenerateThreadsCommand:
 
         def notify(self, args: CommandCreatedEventArgs):
             try:
+                # the dialog and the thread builders are only imported when the command is first opened
+                from .OnDestroyHandler import OnDestroyHandler
+                from .OnExecuteHandler import OnExecuteHandler
+                from .OnInputChangedHandler import OnInputChangedHandler
+                from .UserParameters import UserParameters
+
                 cmd = args.command
                 cmd.isRepeatable = False
 
                 self._onInputChangedHandler = OnInputChangedHandler()
                 self._onExecuteHandler = OnExecuteHandler()
-                self._onExecutePreviewHandler = OnExecuteHandler()
-                self._onDestroyHandler = OnDestroyHandler()
+                self._onExecutePreviewHandler = OnExecuteHandler(isPreview=True)
+                self._onDestroyHandler = OnDestroyHandler(self._terminateOnDestroy)
                 cmd.inputChanged.add(self._onInputChangedHandler)
                 cmd.execute.add(self._onExecuteHandler)
                 cmd.executePreview.add(self._onExecutePreviewHandler)
@@ -5,11 +5,14 @@ from .common.Common import printTrace
 
 
 class OnDestroyHandler(CommandEventHandler):
-    def __init__(self):
+    def __init__(self, terminateOnDestroy: bool = True):
         super().__init__()
+        # a toolbar button registered at startup must outlive the dialog
+        self._terminateOnDestroy = terminateOnDestroy
 
     def notify(self, args):
         try:
-            adsk.terminate()
+            if self._terminateOnDestroy:
+                adsk.terminate()
         except:
             printTrace()
@@ -1,104 +1,508 @@
-import math
+from collections import OrderedDict
 
-from adsk.core import Point3D, CommandEventArgs, CommandEventHandler
-from adsk.fusion import FeatureOperations, SketchPoint, Component
+from adsk.core import Point3D, CommandEventArgs, CommandEventHandler, Matrix3D
+from adsk.fusion import FeatureOperations, SketchPoint, Component, BRepBody, Feature, BRepEntityTypes
 
+from .CouponSpec import CouponSpec
+from .OutputMode import OutputMode
 from .UserParameters import UserParameters
-from .common.Common import printTrace, ui, design
-from .sketch.SketchUtils import createNewComponent, extrudeProfile, createXYSketch, createCylinder
+from .common.Common import printTrace, getUi, getDesign, log, getUnitsMgr, getDesignFileSize
+from .common.Instrumentation import instrumentation
+from .common.Progress import BuildProgress, BuildCancelledError
+from .geometry.ThreadValidation import ThreadValidationError, validateGenerations
+from .plan.PlanOptimizer import optimizePlan
+from .plan.Planner import planCoupon
+from .sketch.BRepUtils import createTemporaryBox, createTemporaryCylinder, removeTimelineItemsAfter, commitBodies, \
+    copyBody, commitMesh, createTranslation, transformBody, compactTimeline
+from .sketch.PlanReplayer import PlanReplayer
+from .sketch.SketchUtils import createNewComponent, extrudeProfile, createXYSketch, createCylinder, \
+    createCylinders, combineBodies, deferCompute, copyBodyByFeatures
+from .sketch.ThreadBodyCache import ThreadBodyCache
 from .sketch.ThreadFeature import ThreadFeature
+from .sketch.ThreadSpec import ThreadEngine, ThreadSpec
+from .sketch.ThreadStandIn import ThreadStandIn, writeStandIn
+
+# the other output modes already leave a single base feature per build
+_COMPACTED_OUTPUT_MODES = (OutputMode.PARAMETRIC, OutputMode.BATCHED, OutputMode.PLANNED)
 
 
 class OnExecuteHandler(CommandEventHandler):
-    def __init__(self):
+    def __init__(self, isPreview: bool = False, progress: BuildProgress = None):
         super().__init__()
-        self._boltThickness = 0.25
+        self._isPreview = isPreview
+        self._previewHelixTolerance = 0.02
+        self._previewSectionsPerTurn = 1
+        # (thread spec, gender, cylinder dimensions) -> (origin, temporary body) of the last preview
+        self._previewBodies = {}
+        self._bodyCache = ThreadBodyCache()
+        self._spec: CouponSpec = None
+        # previews are rebuilt on every input change, only full builds report progress and can be cancelled
+        self._progress = BuildProgress('Generating Threads', not isPreview) if progress is None else progress
 
     def notify(self, args: CommandEventArgs):
         try:
-            # TODO: different behavior if preview (set `args.isValidResult = False` when rendering preview)
-            ui.messageBox(args.firingEvent.name)
             UserParameters.updateValuesFromCommandInputs(args.firingEvent.sender.commandInputs)
             self.run()
-            args.isValidResult = True
+            # a low detail preview must not be kept, the execute event rebuilds it at full detail
+            args.isValidResult = not self._isPreview
+        except ThreadValidationError as error:
+            # found before anything is built, previews only log it as they run on every input change
+            if self._isPreview:
+                log('Invalid thread parameters:\n{}'.format(error))
+            else:
+                getUi().messageBox('Invalid thread parameters:\n{}'.format(error))
         except:
             printTrace()
 
-    def run(self):
-        initTimelineIndex = design.timeline.markerPosition
-        component = createNewComponent()
-        # TODO: raise error if selection is not exactly 1 point coincident with a face
-        if ui.activeSelections.count > 0:
-            selectedSketchPoint = SketchPoint.cast(ui.activeSelections.item(0).entity)
-            self._buildSingleThread(component, selectedSketchPoint)
-        else:
-            self._buildMultipleThreadsWithTolerances(component)
+    def run(self, spec: CouponSpec = None) -> Component:
+        # the dialog state is resolved once, nothing below reads UserParameters
+        self._spec = UserParameters.getCouponSpec() if spec is None else spec
+        # TODO: raise error if a selected point is not coincident with a face
+        selectedSketchPoints = self._getSelectedSketchPoints()
+        self._validateGenerations(selectedSketchPoints)
+        initTimelineIndex = getDesign().timeline.markerPosition
+        instrumentation.startRun()
+        try:
+            with instrumentation.phase('createNewComponent'):
+                component = createNewComponent()
+            componentTimelineIndex = getDesign().timeline.markerPosition
+            if len(selectedSketchPoints) == 1:
+                self._buildSingleThread(component, selectedSketchPoints[0])
+            elif selectedSketchPoints:
+                self._buildSelectedThreads(component, selectedSketchPoints)
+            else:
+                self._buildMultipleThreadsWithTolerances(component)
+            if self._isTimelineCompacted(selectedSketchPoints):
+                self._compactTimeline(component, componentTimelineIndex)
+        except BuildCancelledError:
+            # nothing of a cancelled build is kept, not even its component
+            removeTimelineItemsAfter(initTimelineIndex)
+            log('Cancelled, the timeline is rolled back')
+            return None
+        except:
+            # a failed build leaves no partial features behind either
+            removeTimelineItemsAfter(initTimelineIndex)
+            raise
+        finally:
+            self._progress.finish()
 
-        timelineGroups = design.timeline.timelineGroups
-        timelineGroup = timelineGroups.add(initTimelineIndex, design.timeline.markerPosition - 1)
+        timelineGroups = getDesign().timeline.timelineGroups
+        timelineGroup = timelineGroups.add(initTimelineIndex, getDesign().timeline.markerPosition - 1)
         timelineGroup.name = 'Thread'
+        instrumentation.finishRun('Preview' if self._isPreview else 'Execute')
+        return component
+
+    def _isTimelineCompacted(self, selectedSketchPoints: [SketchPoint]) -> bool:
+        # female threads on selected points cut bodies outside the new component, their features have to stay
+        if not self._spec.isTimelineCompacted or self._isPreview:
+            return False
+        return self._spec.outputMode in _COMPACTED_OUTPUT_MODES and (self._spec.isMale or not selectedSketchPoints)
+
+    @instrumentation.timed('compactTimeline')
+    def _compactTimeline(self, component: Component, componentTimelineIndex: int):
+        # the sketches, planes and features of the build are folded into one non-parametric base feature
+        itemCount, fileSize = getDesign().timeline.count, getDesignFileSize()
+        compactTimeline(component, componentTimelineIndex)
+        log('Timeline compaction: {} items and {:.0f} KB before, {} items and {:.0f} KB after'.format(
+            itemCount, fileSize / 1024, getDesign().timeline.count, getDesignFileSize() / 1024))
+
+    def _validateGenerations(self, selectedSketchPoints: [SketchPoint]):
+        # selected points are threaded with the first generation, female chamfers are not modeled yet
+        generationIndices = [0] if selectedSketchPoints else self._getGenerationIndices()
+        validateGenerations([(i, self._getThreadSpec(i).getGeometry()) for i in generationIndices],
+                            self._spec.isMale and self._getThreadSpec(0).isChamfered)
 
     def _buildSingleThread(self, component: Component, sketchPoint: SketchPoint):
-        self._buildThread(component, sketchPoint)
+        threadFeature = self._createThreadFeature(component, sketchPoint)
+        # a female thread cuts into an existing body, which is only possible with parametric features
+        if self._spec.outputMode == OutputMode.MESH and self._spec.isMale:
+            self._buildSingleMesh(component, sketchPoint, threadFeature)
+        elif self._spec.outputMode == OutputMode.STAND_IN and self._spec.isMale:
+            self._commitStandIns(component, [self._createSelectedStandIn(sketchPoint)])
+        elif self._spec.outputMode == OutputMode.DIRECT and self._spec.isMale:
+            self._logThreadReport(threadFeature)
+            self._buildDirect(component, lambda _: [threadFeature.createMaleThreadBody()])
+        else:
+            self._buildThread(threadFeature)
+
+    def _getSelectedSketchPoints(self) -> [SketchPoint]:
+        selections = getUi().activeSelections
+        sketchPoints = [SketchPoint.cast(selections.item(i).entity) for i in range(selections.count)]
+        return [sketchPoint for sketchPoint in sketchPoints if sketchPoint]
+
+    def _buildSelectedThreads(self, component: Component, sketchPoints: [SketchPoint]):
+        # points in sketches of the same orientation share one thread, which is built once and copied to the others
+        groups = OrderedDict()
+        for sketchPoint in sketchPoints:
+            groups.setdefault(self._getReplicationKey(sketchPoint), []).append(sketchPoint)
+        log('Selection: {} points, {} thread builds'.format(len(sketchPoints), len(groups)))
+        if self._spec.outputMode == OutputMode.MESH and self._spec.isMale:
+            self._buildSelectedMeshes(component, list(groups.values()))
+        elif self._spec.outputMode == OutputMode.STAND_IN and self._spec.isMale:
+            self._commitStandIns(component, [self._createSelectedStandIn(sketchPoint) for sketchPoint in sketchPoints])
+        elif self._spec.outputMode == OutputMode.DIRECT and self._spec.isMale:
+            self._buildDirect(component, lambda _: self._createReplicatedBodies(
+                component, list(groups.values()), ThreadFeature.createMaleThreadBody, self._copyTemporaryBody))
+        elif self._spec.isMale:
+            # the thread of a group is built as timeline features like a single selected point, the other points
+            # get parametric copies of its body
+            self._createReplicatedBodies(component, list(groups.values()),
+                                         lambda threadFeature: threadFeature.createMaleThread().bodies.item(0),
+                                         lambda body, transform: copyBodyByFeatures(component, body, transform))
+        else:
+            self._cutSelectedThreads(component, list(groups.values()))
+
+    def _getReplicationKey(self, sketchPoint: SketchPoint) -> tuple:
+        # thread parameters and the rotation part of the sketch transform, points that only differ by a translation
+        # share a thread
+        matrix = sketchPoint.parentSketch.transform.asArray()
+        return (self._getThreadSpec(0),) + tuple(round(matrix[i], 9) for i in (0, 1, 2, 4, 5, 6, 8, 9, 10))
+
+    def _createReplicatedBodies(self, component: Component, groups: [[SketchPoint]], createBody,
+                                copyBodyByTransform) -> [BRepBody]:
+        bodies = []
+        self._progress.start(len(groups), 'Thread')
+        for groupCount, sketchPoints in enumerate(groups):
+            threadFeature = self._createThreadFeature(component, sketchPoints[0])
+            self._logThreadReport(threadFeature)
+            body = createBody(threadFeature)
+            bodies.append(body)
+            for sketchPoint in sketchPoints[1:]:
+                bodies.append(copyBodyByTransform(body, createTranslation(sketchPoints[0].worldGeometry,
+                                                                          sketchPoint.worldGeometry)))
+            self._progress.step(groupCount + 1)
+        return bodies
+
+    @staticmethod
+    def _copyTemporaryBody(body: BRepBody, transform: Matrix3D) -> BRepBody:
+        bodyCopy = copyBody(body)
+        transformBody(bodyCopy, transform)
+        return bodyCopy
+
+    def _cutSelectedThreads(self, component: Component, groups: [[SketchPoint]]):
+        # targets are looked up before any tool body exists, so a tool cannot be mistaken for one
+        pointCount = sum(len(sketchPoints) for sketchPoints in groups)
+        targetGroups = [[(sketchPoint, self._findTargetBody(component, sketchPoint)) for sketchPoint in sketchPoints]
+                        for sketchPoints in groups]
+        targetGroups = [[(sketchPoint, target) for sketchPoint, target in pairs if target is not None]
+                        for pairs in targetGroups]
+        groups = [[sketchPoint for sketchPoint, target in pairs] for pairs in targetGroups if pairs]
+        targets = [target for pairs in targetGroups for sketchPoint, target in pairs]
+        skippedCount = pointCount - len(targets)
+        if skippedCount:
+            log('Selection: {} points are not on a body and are skipped'.format(skippedCount))
+        if not groups:
+            return
+        if self._spec.outputMode == OutputMode.DIRECT:
+            helperTimelineIndex = getDesign().timeline.markerPosition
+            tools = self._createReplicatedBodies(component, groups, ThreadFeature.createFemaleThreadToolBody,
+                                                 self._copyTemporaryBody)
+            removeTimelineItemsAfter(helperTimelineIndex)
+            baseFeature = commitBodies(component, tools)
+            tools = [baseFeature.bodies.item(i) for i in range(len(tools))]
+        else:
+            # the tool of a group is built as timeline features, the other points get parametric copies of it
+            tools = self._createReplicatedBodies(component, groups, ThreadFeature.createFemaleThreadTool,
+                                                 lambda body, transform: copyBodyByFeatures(component, body,
+                                                                                            transform))
+        occurrence = getDesign().rootComponent.allOccurrencesByComponent(component).item(0)
+        # one combine feature per target body, with the tools of all its holes
+        toolsByTarget = OrderedDict()
+        for tool, target in zip(tools, targets):
+            toolsByTarget.setdefault(target.entityToken, (target, []))[1].append(
+                tool.createForAssemblyContext(occurrence))
+        for target, targetTools in toolsByTarget.values():
+            combineBodies(getDesign().rootComponent, target, targetTools, FeatureOperations.CutFeatureOperation)
+
+    def _findTargetBody(self, component: Component, sketchPoint: SketchPoint) -> BRepBody:
+        bodies = getDesign().rootComponent.findBRepUsingPoint(sketchPoint.worldGeometry,
+                                                              BRepEntityTypes.BRepBodyEntityType, 0.001, True)
+        for i in range(bodies.count):
+            if bodies.item(i).parentComponent != component:
+                return bodies.item(i)
+        return None
+
+    @instrumentation.timed('mesh')
+    def _buildSelectedMeshes(self, component: Component, groups: [[SketchPoint]]):
+        from .geometry.ThreadMesh import createThreadShells, getMeshResolution, transformShell, mergeShells
+        shells = []
+        for sketchPoints in groups:
+            threadFeature = self._createThreadFeature(component, sketchPoints[0])
+            shell = createThreadShells([threadFeature.getGeometry()], [(0, 0)],
+                                       getMeshResolution(self._spec.meshResolution), True,
+                                       threadFeature.isChamfered())
+            for sketchPoint in sketchPoints:
+                origin = sketchPoint.geometry
+                translation = [1, 0, 0, origin.x, 0, 1, 0, origin.y, 0, 0, 1, origin.z, 0, 0, 0, 1]
+                shells.append(transformShell(transformShell(shell, translation),
+                                             sketchPoint.parentSketch.transform.asArray()))
+        mesh = mergeShells(shells)
+        commitMesh(component, mesh.vertices.ravel().tolist(), mesh.faces.ravel().tolist())
 
     def _buildMultipleThreadsWithTolerances(self, component: Component):
+        if self._spec.outputMode == OutputMode.MESH:
+            self._buildMesh(component)
+            return
+        if self._spec.outputMode == OutputMode.STAND_IN:
+            self._buildStandInCoupon(component)
+            return
+        if self._isPreview:
+            self._buildDirect(component, self._createIncrementalPreviewBodies)
+            return
+        if self._spec.outputMode == OutputMode.DIRECT:
+            self._buildDirect(component, self._createDirectThreadsWithTolerances)
+            return
+        if self._spec.outputMode == OutputMode.BATCHED:
+            self._buildBatched(component)
+            return
+        if self._spec.outputMode == OutputMode.PLANNED:
+            self._buildPlanned(component)
+            return
         self._createBaseCuboid(component)
-        for i, sketchPoint in enumerate(self._createSketchPoints(component)):
-            if not UserParameters.isThreadMale():
-                self._createCylinder(component, sketchPoint.geometry)
-            self._buildThread(component, sketchPoint, i)
-
-    def _createBaseCuboid(self, component: Component):
-        boxWidth = UserParameters.getMajorDiameter()
-        boxLength = (UserParameters.getMajorDiameter() * UserParameters.getGenerationCount() * 2) - UserParameters.getMajorDiameter()
-        boxDepth = 0.1
-        offset = boxWidth / 2
-        if not UserParameters.isThreadMale():
-            boxWidth = boxWidth + (self._boltThickness * 2)
-            boxLength = boxLength + (self._boltThickness * 2)
-            offset = offset + self._boltThickness
+        threadFeatures = self._createThreadFeatures(component)
+        self._progress.start(len(threadFeatures))
+        for doneCount, (i, sketchPoint, threadFeature) in enumerate(threadFeatures, 1):
+            with instrumentation.generation(i):
+                if not self._spec.isMale:
+                    self._createCylinder(component, sketchPoint.geometry)
+                self._buildThread(threadFeature, i)
+            self._progress.step(doneCount)
+
+    def _buildStandInCoupon(self, component: Component):
+        corner1, corner2 = self._getBaseCuboidCorners()
+        tubeDimensions = None if self._spec.isMale else self._spec.getCylinderDimensions()
+        standIns = []
+        for i in self._getGenerationIndices():
+            center = Point3D.create(self._spec.getGenerationOffset(i), 0, 0)
+            transform = createTranslation(Point3D.create(0, 0, 0), center)
+            standIns.append(ThreadStandIn(self._spec.generations[i], self._spec.isMale, tubeDimensions,
+                                          tuple(transform.asArray()), False))
+        self._commitStandIns(component, standIns, [createTemporaryBox(corner1, corner2)])
+
+    def _createSelectedStandIn(self, sketchPoint: SketchPoint) -> ThreadStandIn:
+        transform = createTranslation(Point3D.create(0, 0, 0), sketchPoint.geometry)
+        transform.transformBy(sketchPoint.parentSketch.transform)
+        return ThreadStandIn(self._spec.thread, True, None, tuple(transform.asArray()), False)
+
+    @instrumentation.timed('standIn')
+    def _commitStandIns(self, component: Component, standIns: [ThreadStandIn], bodies: [BRepBody] = ()):
+        # plain bodies carrying their full thread spec, the stand-in commands rebuild them at full detail
+        bodies = list(bodies)
+        localBodies = {}
+        for standIn in standIns:
+            key = standIn.getKey()
+            if key not in localBodies:
+                localBodies[key] = standIn.createLocalBody(component, False)
+            body = copyBody(localBodies[key])
+            transformBody(body, standIn.getTransform())
+            bodies.append(body)
+        baseFeature = commitBodies(component, bodies)
+        standInOffset = len(bodies) - len(standIns)
+        for i, standIn in enumerate(standIns):
+            writeStandIn(baseFeature.bodies.item(standInOffset + i), standIn)
+        log('Stand-ins: {} threads'.format(len(standIns)))
+
+    @instrumentation.timed('mesh')
+    def _buildMesh(self, component: Component):
+        # numpy is only required for mesh output, so the kernel is imported on demand
+        from .geometry.ThreadMesh import createCouponMesh, getMeshResolution
+        mesh = createCouponMesh(self._spec.toCouponParameters(), getMeshResolution(self._spec.meshResolution))
+        commitMesh(component, mesh.vertices.ravel().tolist(), mesh.faces.ravel().tolist())
+        log('Mesh: {} triangles'.format(len(mesh.faces)))
+
+    @instrumentation.timed('mesh')
+    def _buildSingleMesh(self, component: Component, sketchPoint: SketchPoint, threadFeature: ThreadFeature):
+        from .geometry.ThreadMesh import createThreadShells, getMeshResolution, transformShell
+        origin = sketchPoint.geometry
+        shell = createThreadShells([threadFeature.getGeometry()], [(origin.x, origin.y)],
+                                   getMeshResolution(self._spec.meshResolution), True,
+                                   threadFeature.isChamfered())
+        shell = transformShell(shell, sketchPoint.parentSketch.transform.asArray())
+        commitMesh(component, shell.vertices.ravel().tolist(), shell.faces.ravel().tolist())
+
+    def _buildBatched(self, component: Component):
+        # every thread is built from new tool bodies, the booleans happen in one combine feature per target
+        target = self._createBaseCuboid(component).bodies.item(0)
+        threadFeatures = self._createThreadFeatures(component)
+        features = 1
+        joinTools, cutTools = [], []
+        if not self._spec.isMale:
+            diameter, length = self._spec.getCylinderDimensions()
+            with instrumentation.phase('cylinder'):
+                createCylinders(component, [sketchPoint.geometry for i, sketchPoint, threadFeature in threadFeatures],
+                                diameter, length, FeatureOperations.JoinFeatureOperation,
+                                self._spec.isComputeDeferred)
+            features += 1
+        self._progress.start(len(threadFeatures))
+        for doneCount, (i, sketchPoint, threadFeature) in enumerate(threadFeatures, 1):
+            self._logThreadReport(threadFeature, i)
+            with instrumentation.generation(i):
+                if self._spec.isMale:
+                    joinFeatures, cutFeatures = threadFeature.createMaleThreadTools()
+                else:
+                    joinFeatures, cutFeatures = [], threadFeature.createFemaleThreadTools()
+            joinTools += [feature.bodies.item(0) for feature in joinFeatures]
+            cutTools += [feature.bodies.item(0) for feature in cutFeatures]
+            features += len(joinFeatures) + len(cutFeatures)
+            self._progress.step(doneCount)
+        combineCount = 0
+        with instrumentation.phase('combine'):
+            for tools, operation in ((joinTools, FeatureOperations.JoinFeatureOperation),
+                                     (cutTools, FeatureOperations.CutFeatureOperation)):
+                if tools:
+                    combineBodies(component, target, tools, operation)
+                    combineCount += 1
+        # a parametric coupon joins or cuts every loft and cuts every chamfer or hole on its own
+        parametricBooleans = len(threadFeatures) * 2
+        log('Batched booleans: {} features, {} booleans instead of {}'.format(
+            features + combineCount, combineCount + (0 if self._spec.isMale else 1), parametricBooleans))
+
+    def _buildPlanned(self, component: Component):
+        # the whole coupon is planned in pure python first, then the optimized plan is replayed in one pass
+        with instrumentation.phase('plan'):
+            plan = planCoupon(self._spec)
+        with instrumentation.phase('optimizePlan'):
+            optimizedPlan = optimizePlan(plan)
+        with instrumentation.phase('replay'):
+            PlanReplayer(component).replay(optimizedPlan, self._progress)
+        log('Build plan: {} operations, {} after removing duplicate planes, sketches and profiles'.format(
+            len(plan.getOperations()), len(optimizedPlan.getOperations())))
+
+    def _buildDirect(self, component: Component, createBodies):
+        # helper features are only needed to shape the temporary bodies, the result is committed as one base feature
+        helperTimelineIndex = getDesign().timeline.markerPosition
+        bodies = createBodies(component)
+        removeTimelineItemsAfter(helperTimelineIndex)
+        commitBodies(component, bodies)
+        if self._isBodyCacheUsed():
+            statistics = self._bodyCache.getStatistics()
+            log('Body cache: {} hits, {} misses, {} bodies'.format(statistics['hits'], statistics['misses'],
+                                                                   statistics['bodies']))
+
+    def _createDirectThreadsWithTolerances(self, component: Component) -> [BRepBody]:
+        corner1, corner2 = self._getBaseCuboidCorners()
+        bodies = [createTemporaryBox(corner1, corner2)]
+        threadFeatures = self._createThreadFeatures(component)
+        self._progress.start(len(threadFeatures))
+        for doneCount, (i, sketchPoint, threadFeature) in enumerate(threadFeatures, 1):
+            bodies.append(self._createDirectThreadBody(sketchPoint, threadFeature, i))
+            self._progress.step(doneCount)
+        return bodies
+
+    def _createIncrementalPreviewBodies(self, component: Component) -> [BRepBody]:
+        # low detail bodies are cached by spec and translated into place. preview features are rolled back between
+        # events, but the temporary bodies survive, so only generations with a new spec are built again
+        corner1, corner2 = self._getBaseCuboidCorners()
+        bodies = [createTemporaryBox(corner1, corner2)]
+        previewBodies = {}
+        builtCount = 0
+        threadFeatures = self._createThreadFeatures(component)
+        for i, sketchPoint, threadFeature in threadFeatures:
+            key = (threadFeature.getSpec(), self._spec.isMale, self._spec.getCylinderDimensions())
+            previewBody = previewBodies.get(key) or self._previewBodies.get(key)
+            if previewBody is None:
+                previewBody = (sketchPoint.geometry, self._createDirectThreadBody(sketchPoint, threadFeature, i))
+                builtCount += 1
+            previewBodies[key] = previewBody
+            origin, body = previewBody
+            bodies.append(self._copyTemporaryBody(body, createTranslation(origin, sketchPoint.geometry)))
+        log('Preview: built {} thread bodies for {} generations'.format(builtCount, len(threadFeatures)))
+        self._previewBodies = previewBodies
+        return bodies
+
+    def _isBodyCacheUsed(self) -> bool:
+        # low detail preview bodies would only evict full detail ones, previews keep theirs in memory
+        return self._spec.isBodyCacheEnabled and not self._isPreview
+
+    def _createDirectThreadBody(self, sketchPoint: SketchPoint, threadFeature: ThreadFeature,
+                                generationCount: int) -> BRepBody:
+        if not self._isBodyCacheUsed():
+            return self._buildDirectThreadBody(sketchPoint, threadFeature, generationCount)
+        key = ThreadBodyCache.getKey((threadFeature.getSpec(), self._spec.isMale, self._spec.getCylinderDimensions()))
+        body = self._bodyCache.load(key, sketchPoint.geometry)
+        if body is None:
+            body = self._buildDirectThreadBody(sketchPoint, threadFeature, generationCount)
+            self._bodyCache.store(key, body, sketchPoint.geometry)
+        return body
+
+    def _buildDirectThreadBody(self, sketchPoint: SketchPoint, threadFeature: ThreadFeature,
+                               generationCount: int) -> BRepBody:
+        self._logThreadReport(threadFeature, generationCount)
+        with instrumentation.generation(generationCount):
+            if self._spec.isMale:
+                return threadFeature.createMaleThreadBody()
+            diameter, length = self._spec.getCylinderDimensions()
+            cylinder = createTemporaryCylinder(sketchPoint.geometry, diameter / 2, length)
+            threadFeature.cutFemaleThreadBody(cylinder)
+            return cylinder
+
+    def _getBaseCuboidCorners(self) -> (Point3D, Point3D):
+        corner1, corner2 = self._spec.getBaseCuboidCorners()
+        return Point3D.create(*corner1), Point3D.create(*corner2)
+
+    @instrumentation.timed('createBaseCuboid')
+    def _createBaseCuboid(self, component: Component) -> Feature:
+        corner1, corner2 = self._getBaseCuboidCorners()
         sketch = createXYSketch(component)
-        sketch.sketchCurves.sketchLines.addTwoPointRectangle(Point3D.create(-offset, -offset, 0),
-                                                             Point3D.create(boxLength - offset, boxWidth - offset, 0))
+        with deferCompute(sketch, self._spec.isComputeDeferred):
+            sketch.sketchCurves.sketchLines.addTwoPointRectangle(Point3D.create(corner1.x, corner1.y, 0), corner2)
         profile = sketch.profiles.item(0)
-        extrudeProfile(component, profile, -boxDepth, FeatureOperations.NewBodyFeatureOperation)
+        return extrudeProfile(component, profile, corner1.z, FeatureOperations.NewBodyFeatureOperation)
+
+    def _createThreadFeatures(self, component: Component) -> [(int, SketchPoint, ThreadFeature)]:
+        generationIndices = self._getGenerationIndices()
+        sketchPoints = self._createSketchPoints(component, generationIndices)
+        threadFeatures = [self._createThreadFeature(component, sketchPoint, i)
+                          for i, sketchPoint in zip(generationIndices, sketchPoints)]
+        with instrumentation.phase('precomputeHelixes'):
+            ThreadFeature.precomputeHelixes(threadFeatures)
+        return list(zip(generationIndices, sketchPoints, threadFeatures))
 
-    def _createSketchPoints(self, component: Component):
+    def _getGenerationIndices(self) -> [int]:
+        if self._isPreview and self._spec.isPreviewEndsOnly:
+            return sorted({0, self._spec.generationCount - 1})
+        return list(range(self._spec.generationCount))
+
+    @instrumentation.timed('createSketchPoints')
+    def _createSketchPoints(self, component: Component, generationIndices: [int]):
         sketch = createXYSketch(component)
         sketchPoints = []
-        for i in range(int(UserParameters.getGenerationCount())):
-            x = UserParameters.getMajorDiameter() * i * 2
-            sketchPoint = sketch.sketchPoints.add(Point3D.create(x, 0, 0))
-            sketchPoints.append(sketchPoint)
+        with deferCompute(sketch, self._spec.isComputeDeferred):
+            for i in generationIndices:
+                x = self._spec.getGenerationOffset(i)
+                sketchPoint = sketch.sketchPoints.add(Point3D.create(x, 0, 0))
+                sketchPoints.append(sketchPoint)
         return sketchPoints
 
+    @instrumentation.timed('cylinder')
     def _createCylinder(self, component: Component, center: Point3D):
-        diameter = UserParameters.getMajorDiameter() + (self._boltThickness * 2)
-        # TODO: replace compensation offset by chamfer
-        length = UserParameters.getLength() - 0.1
+        diameter, length = self._spec.getCylinderDimensions()
         createCylinder(component, center, diameter, length)
 
-    def _buildThread(self, component: Component, sketchPoint: SketchPoint, generationCount: int = 0):
-        origin = sketchPoint.geometry
-        plane = sketchPoint.parentSketch.referencePlane
-        notchWidthTolerance = self._getToleranceValue(UserParameters.getNotchWidthStep(), generationCount, 1, 3)
-        majorDiameterTolerance = self._getToleranceValue(UserParameters.getMajorDiameterStep(), generationCount, 2, 3)
-        minorDiameterTolerance = self._getToleranceValue(UserParameters.getMinorDiameterStep(), generationCount, 3, 3)
-        threadFeature = ThreadFeature(component,
-                                      origin,
-                                      plane,
-                                      UserParameters.getLength(),
-                                      UserParameters.getMajorDiameter() + majorDiameterTolerance,
-                                      UserParameters.getMinorDiameter() + minorDiameterTolerance,
-                                      UserParameters.getPitch(),
-                                      UserParameters.getCutAngle(),
-                                      UserParameters.getNotchWidth() + notchWidthTolerance)
-        if UserParameters.isThreadMale():
+    def _createThreadFeature(self, component: Component, sketchPoint: SketchPoint,
+                             generationCount: int = 0) -> ThreadFeature:
+        return ThreadFeature(component, sketchPoint.geometry, sketchPoint.parentSketch.referencePlane,
+                             self._getThreadSpec(generationCount), self._spec.isComputeDeferred)
+
+    def _getThreadSpec(self, generationCount: int) -> ThreadSpec:
+        spec = self._spec.generations[generationCount]
+        if self._isPreview:
+            spec = spec.replace(helixTolerance=max(spec.helixTolerance, self._previewHelixTolerance),
+                                sectionsPerTurn=min(spec.sectionsPerTurn, self._previewSectionsPerTurn),
+                                isChamfered=False)
+        return spec
+
+    def _buildThread(self, threadFeature: ThreadFeature, generationCount: int = 0):
+        self._logThreadReport(threadFeature, generationCount)
+        if self._spec.isMale:
             threadFeature.createMaleThread()
         else:
             threadFeature.createFemaleThread()
 
-    def _getToleranceValue(self, stepSize: float, stepCount: int, fromStep: int, interval: int) -> float:
-        # increment tolerance value every `interval` steps
-        intervalCount = math.floor((stepCount - fromStep) / interval) + 1
-        return max(0, intervalCount) * stepSize
+    def _logThreadReport(self, threadFeature: ThreadFeature, generationCount: int = 0):
+        pointCount, maxError = threadFeature.getHelixReport()
+        # the sweep engine sweeps a single profile, the loft engine lofts through its sections
+        isSwept = threadFeature.getSpec().threadEngine == ThreadEngine.SWEEP
+        log('Thread {}: {} helix points, max deviation {}, {} {}'.format(
+            generationCount, pointCount, getUnitsMgr().formatInternalValue(maxError, 'mm', True),
+            threadFeature.getSectionCount(), 'sweep profile' if isSwept else 'loft sections'))
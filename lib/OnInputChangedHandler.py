@@ -1,4 +1,4 @@
-from adsk.core import InputChangedEventHandler, InputChangedEventArgs
+from adsk.core import InputChangedEventHandler, InputChangedEventArgs, StringValueCommandInput
 
 from .UserParameters import UserParameters
 from .common.Common import printTrace
@@ -13,5 +13,7 @@ class OnInputChangedHandler(InputChangedEventHandler):
             # update parameters according to the selected thread definition
             if args.input.id == UserParameters.THREAD_DEFINITION_DROPDOWN.value.getId():
                 UserParameters.applySelectedThreadDefinition()
+            elif args.input.id == UserParameters.THREAD_FILTER.value.getId():
+                UserParameters.filterThreadDefinitions(StringValueCommandInput.cast(args.input).value)
         except:
             printTrace()
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class OutputMode(Enum):
+    PARAMETRIC = 'Parametric'
+    BATCHED = 'Parametric, Batched Booleans'
+    PLANNED = 'Parametric, Planned'
+    DIRECT = 'Direct'
+    MESH = 'Mesh'
+    STAND_IN = 'Stand-In'
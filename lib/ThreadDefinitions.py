@@ -1,6 +1,12 @@
-from enum import Enum
+import bisect
+import csv
+import os
 from typing import NamedTuple
 
+# ISO metric coarse/fine (ISO 261), UNC/UNF/UNEF (ASME B1.1) and BSP parallel (ISO 228) basic profiles in mm and deg
+_THREAD_TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources',
+                                  'threads.csv')
+
 
 class _ThreadParameters(NamedTuple):
     threadName: str
@@ -12,28 +18,53 @@ class _ThreadParameters(NamedTuple):
     notchWidth: float
 
 
-class ThreadDefinition(Enum):
-    G_1_4 = _ThreadParameters(threadName='G 1/4',
-                              length=9.0,
-                              majorDiameter=13.16,
-                              minorDiameter=11.44,
-                              pitch=1.34,
-                              cutAngle=27.5,
-                              notchWidth=0.2)
-    G_1_8 = _ThreadParameters(threadName='G 1/8',
-                              length=9.0,
-                              majorDiameter=13.16,
-                              minorDiameter=11.44,
-                              pitch=1.34,
-                              cutAngle=27.5,
-                              notchWidth=0.2)
+class _ThreadTable:
+    def __init__(self, path: str):
+        with open(path, newline='') as tableFile:
+            reader = csv.reader(tableFile)
+            next(reader)
+            self._rows = [_ThreadParameters(row[0], *map(float, row[1:])) for row in reader]
+        self._names = [row.threadName for row in self._rows]
+        self._rowsByName = {row.threadName: row for row in self._rows}
+        # case insensitive, sorted names for prefix search
+        self._searchNames = sorted((name.lower(), index) for index, name in enumerate(self._names))
+        self._searchKeys = [key for key, index in self._searchNames]
+
+    def getNames(self) -> [str]:
+        return self._names
+
+    def getRow(self, threadName: str) -> _ThreadParameters:
+        return self._rowsByName[threadName]
+
+    def findNames(self, prefix: str, limit: int) -> [str]:
+        prefix = prefix.strip().lower()
+        start = bisect.bisect_left(self._searchKeys, prefix)
+        end = bisect.bisect_left(self._searchKeys, prefix + '\uffff', start)
+        # keep the table order, sizes are listed in ascending order per standard
+        indices = sorted(index for key, index in self._searchNames[start:end])
+        return [self._names[index] for index in indices[:limit]]
+
+
+_threadTable = None
 
+
+class ThreadDefinition:
+    # the table is parsed on first use, not when the add-in is loaded
     @staticmethod
     def fromThreadName(threadName: str) -> _ThreadParameters:
-        threadParams = next(
-            threadParams for threadParams in ThreadDefinition if threadParams.value.threadName == threadName)
-        return threadParams.value
+        return ThreadDefinition._getTable().getRow(threadName)
 
     @staticmethod
     def getThreadNames() -> [str]:
-        return list(map(lambda threadParams: threadParams.value.threadName, ThreadDefinition))
+        return list(ThreadDefinition._getTable().getNames())
+
+    @staticmethod
+    def findThreadNames(prefix: str, limit: int = 100) -> [str]:
+        return ThreadDefinition._getTable().findNames(prefix, limit)
+
+    @staticmethod
+    def _getTable() -> _ThreadTable:
+        global _threadTable
+        if _threadTable is None:
+            _threadTable = _ThreadTable(_THREAD_TABLE_PATH)
+        return _threadTable
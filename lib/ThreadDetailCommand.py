@@ -0,0 +1,71 @@
+from adsk.core import CommandCreatedEventArgs, CommandCreatedEventHandler, CommandEventArgs, CommandEventHandler, \
+    SelectionCommandInput
+from adsk.fusion import BRepBody
+
+from .GenerateThreadsCommand import PANEL_ID
+from .common.Common import getUi, printTrace, resourceFolder, log
+
+_SELECTION_ID = 'standInSelectionId'
+
+
+class ThreadDetailCommand:
+    # rebuilds selected thread stand-ins as full modeled threads, or turns full threads back into stand-ins
+    def __init__(self, isFullDetail: bool):
+        self._commandId = 'ThreadGeneratorUpgrade' if isFullDetail else 'ThreadGeneratorDowngrade'
+        self._commandCreatedHandler = self._CommandCreatedHandler(isFullDetail)
+        self._commandDefinition = getUi().commandDefinitions.itemById(self._commandId)
+        if not self._commandDefinition:
+            if isFullDetail:
+                name, tooltip = 'Model Threads', 'Replaces selected thread stand-ins by full modeled threads.'
+            else:
+                name, tooltip = 'Simplify Threads', 'Replaces selected modeled threads by lightweight stand-ins.'
+            self._commandDefinition = getUi().commandDefinitions.addButtonDefinition(self._commandId, name, tooltip,
+                                                                                     resourceFolder)
+        self._commandDefinition.commandCreated.add(self._commandCreatedHandler)
+
+    def addToToolbar(self):
+        panel = getUi().allToolbarPanels.itemById(PANEL_ID)
+        if panel and not panel.controls.itemById(self._commandId):
+            panel.controls.addCommand(self._commandDefinition)
+
+    def delete(self):
+        panel = getUi().allToolbarPanels.itemById(PANEL_ID)
+        control = panel.controls.itemById(self._commandId) if panel else None
+        if control:
+            control.deleteMe()
+        self._commandDefinition.deleteMe()
+
+    class _CommandCreatedHandler(CommandCreatedEventHandler):
+        def __init__(self, isFullDetail: bool):
+            super().__init__()
+            self._onExecuteHandler = ThreadDetailCommand._OnExecuteHandler(isFullDetail)
+
+        def notify(self, args: CommandCreatedEventArgs):
+            try:
+                cmd = args.command
+                cmd.isRepeatable = False
+                cmd.execute.add(self._onExecuteHandler)
+                selectionInput = cmd.commandInputs.addSelectionInput(_SELECTION_ID, 'Threads',
+                                                                     'Select thread bodies')
+                selectionInput.addSelectionFilter('SolidBodies')
+                selectionInput.setSelectionLimits(1, 0)
+            except:
+                printTrace()
+
+    class _OnExecuteHandler(CommandEventHandler):
+        def __init__(self, isFullDetail: bool):
+            super().__init__()
+            self._isFullDetail = isFullDetail
+
+        def notify(self, args: CommandEventArgs):
+            try:
+                from .sketch.ThreadStandIn import setThreadDetail
+                selectionInput = SelectionCommandInput.cast(
+                    args.firingEvent.sender.commandInputs.itemById(_SELECTION_ID))
+                bodies = [BRepBody.cast(selectionInput.selection(i).entity)
+                          for i in range(selectionInput.selectionCount)]
+                changedCount = setThreadDetail([body for body in bodies if body], self._isFullDetail)
+                log('Stand-ins: {} of {} bodies {}'.format(changedCount, len(bodies),
+                                                           'modeled' if self._isFullDetail else 'simplified'))
+            except:
+                printTrace()
@@ -0,0 +1,184 @@
+from adsk.core import Application, ApplicationCommandEventArgs, ApplicationCommandEventHandler, \
+    CommandCreatedEventArgs, CommandCreatedEventHandler, CommandEventArgs, CommandEventHandler, \
+    CommandTerminationReason, CustomEventArgs, CustomEventHandler, DialogResults
+
+from .GenerateThreadsCommand import PANEL_ID
+from .common.Common import getUi, printTrace, resourceFolder
+from .common.Progress import BuildCancelledError
+
+_COMMAND_ID = 'ThreadGeneratorJobs'
+# hidden command, every job is built in an execution of its own
+_JOB_COMMAND_ID = 'ThreadGeneratorJob'
+_NEXT_JOB_EVENT_ID = 'ThreadGeneratorNextJob'
+
+
+class ThreadJobsCommand:
+    # builds every coupon of a job file, resuming after the last finished job
+    def __init__(self):
+        self._jobSession = None
+        self._commandCreatedHandler = self._CommandCreatedHandler(self)
+        self._commandDefinition = getUi().commandDefinitions.itemById(_COMMAND_ID)
+        if not self._commandDefinition:
+            self._commandDefinition = getUi().commandDefinitions.addButtonDefinition(
+                _COMMAND_ID, 'Run Thread Jobs', 'Builds the coupons of a job file, each into its own component.',
+                resourceFolder)
+        self._commandDefinition.commandCreated.add(self._commandCreatedHandler)
+
+    def addToToolbar(self):
+        panel = getUi().allToolbarPanels.itemById(PANEL_ID)
+        if panel and not panel.controls.itemById(_COMMAND_ID):
+            panel.controls.addCommand(self._commandDefinition)
+
+    def delete(self):
+        if self._jobSession:
+            self._jobSession.stop()
+        panel = getUi().allToolbarPanels.itemById(PANEL_ID)
+        control = panel.controls.itemById(_COMMAND_ID) if panel else None
+        if control:
+            control.deleteMe()
+        self._commandDefinition.deleteMe()
+
+    def _startJobs(self, jobFilePath: str):
+        if self._jobSession:
+            getUi().messageBox('Thread jobs are already running.')
+            return
+        # the job runner pulls in the thread builders, they are only imported when jobs are run
+        from .batch.JobRunner import JobRunner
+        runner = JobRunner(jobFilePath)
+        if runner.start():
+            self._jobSession = _JobSession(runner, self._onJobsFinished)
+
+    def _onJobsFinished(self):
+        self._jobSession = None
+
+    class _CommandCreatedHandler(CommandCreatedEventHandler):
+        def __init__(self, jobsCommand: 'ThreadJobsCommand'):
+            super().__init__()
+            self._onExecuteHandler = ThreadJobsCommand._OnExecuteHandler(jobsCommand)
+
+        def notify(self, args: CommandCreatedEventArgs):
+            try:
+                cmd = args.command
+                cmd.isRepeatable = False
+                cmd.execute.add(self._onExecuteHandler)
+            except:
+                printTrace()
+
+    class _OnExecuteHandler(CommandEventHandler):
+        def __init__(self, jobsCommand: 'ThreadJobsCommand'):
+            super().__init__()
+            self._jobsCommand = jobsCommand
+
+        def notify(self, args: CommandEventArgs):
+            try:
+                fileDialog = getUi().createFileDialog()
+                fileDialog.title = 'Run Thread Jobs'
+                fileDialog.filter = 'Job files (*.json)'
+                if fileDialog.showOpen() != DialogResults.DialogOK:
+                    return
+                self._jobsCommand._startJobs(fileDialog.filename)
+            except:
+                printTrace()
+
+
+class _JobSession:
+    # drives the job command from outside of any command. the next job is started from a custom event, which fires
+    # once the previous command has terminated, so every job commits on its own before the design is saved
+    def __init__(self, runner, onFinished):
+        self._runner = runner
+        self._onFinished = onFinished
+        self._isJobStarted = False
+        self._isCommitted = False
+        self._jobCommandCreatedHandler = _JobCommandCreatedHandler(runner)
+        self._commandTerminatedHandler = _CommandTerminatedHandler(self)
+        self._nextJobHandler = _NextJobHandler(self)
+        self._jobCommandDefinition = getUi().commandDefinitions.itemById(_JOB_COMMAND_ID)
+        if not self._jobCommandDefinition:
+            self._jobCommandDefinition = getUi().commandDefinitions.addButtonDefinition(
+                _JOB_COMMAND_ID, 'Thread Job', 'Builds one job of a job file.', resourceFolder)
+        self._jobCommandDefinition.commandCreated.add(self._jobCommandCreatedHandler)
+        getUi().commandTerminated.add(self._commandTerminatedHandler)
+        self._nextJobEvent = Application.get().registerCustomEvent(_NEXT_JOB_EVENT_ID)
+        self._nextJobEvent.add(self._nextJobHandler)
+        # the first job starts after the jobs command has terminated
+        Application.get().fireCustomEvent(_NEXT_JOB_EVENT_ID)
+
+    def onJobTerminated(self, isCommitted: bool):
+        self._isCommitted = isCommitted
+        Application.get().fireCustomEvent(_NEXT_JOB_EVENT_ID)
+
+    def runNextJob(self):
+        try:
+            if self._isJobStarted:
+                self._isJobStarted = False
+                self._runner.finishJob(self._isCommitted)
+        except BuildCancelledError:
+            self.stop()
+            return
+        if self._runner.hasPendingJobs():
+            self._isJobStarted = True
+            self._jobCommandDefinition.execute()
+        else:
+            self.stop()
+
+    def stop(self):
+        self._runner.finish()
+        self._jobCommandDefinition.commandCreated.remove(self._jobCommandCreatedHandler)
+        self._jobCommandDefinition.deleteMe()
+        getUi().commandTerminated.remove(self._commandTerminatedHandler)
+        self._nextJobEvent.remove(self._nextJobHandler)
+        Application.get().unregisterCustomEvent(_NEXT_JOB_EVENT_ID)
+        self._onFinished()
+
+
+class _NextJobHandler(CustomEventHandler):
+    def __init__(self, jobSession: _JobSession):
+        super().__init__()
+        self._jobSession = jobSession
+
+    def notify(self, args: CustomEventArgs):
+        try:
+            self._jobSession.runNextJob()
+        except:
+            printTrace()
+
+
+class _CommandTerminatedHandler(ApplicationCommandEventHandler):
+    def __init__(self, jobSession: _JobSession):
+        super().__init__()
+        self._jobSession = jobSession
+
+    def notify(self, args: ApplicationCommandEventArgs):
+        try:
+            if args.commandId == _JOB_COMMAND_ID:
+                self._jobSession.onJobTerminated(
+                    args.terminationReason == CommandTerminationReason.CompletedTerminationReason)
+        except:
+            printTrace()
+
+
+class _JobCommandCreatedHandler(CommandCreatedEventHandler):
+    def __init__(self, runner):
+        super().__init__()
+        self._onExecuteHandler = _JobExecuteHandler(runner)
+
+    def notify(self, args: CommandCreatedEventArgs):
+        try:
+            cmd = args.command
+            cmd.isRepeatable = False
+            # without inputs the command executes right away, its changes are committed as one transaction
+            cmd.execute.add(self._onExecuteHandler)
+        except:
+            printTrace()
+
+
+class _JobExecuteHandler(CommandEventHandler):
+    def __init__(self, runner):
+        super().__init__()
+        self._runner = runner
+
+    def notify(self, args: CommandEventArgs):
+        try:
+            self._runner.buildJob()
+        except:
+            printTrace()
@@ -1,10 +1,13 @@
 from enum import Enum
 
 from adsk.core import ValueInput, CommandInputs, BoolValueCommandInput, IntegerSliderCommandInput, ValueCommandInput, \
-    CommandInput, DropDownStyles, DropDownCommandInput
+    CommandInput, DropDownStyles, DropDownCommandInput, IntegerSpinnerCommandInput, StringValueCommandInput
 
+from .CouponSpec import CouponSpec
+from .OutputMode import OutputMode
 from .ThreadDefinitions import ThreadDefinition
-from .common.Common import unitsMgr, resourceFolder, ui
+from .sketch.ThreadSpec import HelixBackend, ThreadEngine, ThreadSpec
+from .common.Common import getUnitsMgr, resourceFolder
 
 
 class _UserParameter:
@@ -38,14 +41,17 @@ class _UserDimensionParameter(_UserParameter):
 
     def getValue(self) -> float:
         # dimensions must be used with internal units
+        unitsMgr = getUnitsMgr()
         return unitsMgr.convert(self._valueInSelfUnits, self._unitType, unitsMgr.internalUnits)
 
     def setValue(self, value):
         self._valueInSelfUnits = value
+        unitsMgr = getUnitsMgr()
         self._commandInput.value = unitsMgr.convert(value, self._unitType, unitsMgr.internalUnits)
 
     def setValueFromCommandInput(self, commandInput: ValueCommandInput):
         # evaluateExpression returns value in internal units
+        unitsMgr = getUnitsMgr()
         valueInInternalUnits = unitsMgr.evaluateExpression(commandInput.expression, self._unitType)
         self._valueInSelfUnits = unitsMgr.convert(valueInInternalUnits, unitsMgr.internalUnits, self._unitType)
 
@@ -86,28 +92,75 @@ class _UserIntegerSliderParameter(_UserParameter):
         commandInputs.addIntegerSliderCommandInput(self._id, self._name, self._min, self._max, False)
 
 
+class _UserIntegerSpinnerParameter(_UserParameter):
+    def __init__(self, id: str, name: str, min: int, max: int, initValue: int):
+        super().__init__(id, name)
+        self._min = min
+        self._max = max
+        self._value = initValue
+
+    def getValue(self) -> int:
+        return self._value
+
+    def setValueFromCommandInput(self, commandInput: IntegerSpinnerCommandInput):
+        self._value = commandInput.value
+
+    def addToCommandInputs(self, commandInputs: CommandInputs):
+        commandInputs.addIntegerSpinnerCommandInput(self._id, self._name, self._min, self._max, 1, self._value)
+
+
+class _UserStringParameter(_UserParameter):
+    def __init__(self, id: str, name: str, initValue: str):
+        super().__init__(id, name)
+        self._value = initValue
+
+    def getValue(self) -> str:
+        return self._value
+
+    def setValue(self, value: str):
+        self._value = value
+
+    def setValueFromCommandInput(self, commandInput: StringValueCommandInput):
+        self._value = commandInput.value
+
+    def addToCommandInputs(self, commandInputs: CommandInputs):
+        commandInputs.addStringValueInput(self._id, self._name, self._value)
+
+
 class UserDropDownParameter(_UserParameter):
-    def __init__(self, id: str, name: str, dropDownOptions: [str], defaultOption: str):
+    def __init__(self, id: str, name: str, dropDownOptions, defaultOption: str = None):
         super().__init__(id, name)
         self._dropDownInput: DropDownCommandInput = DropDownCommandInput.cast(None)
+        # a list of options, or a function returning them when the dialog is opened
         self._dropDownOptions = dropDownOptions
         self._defaultOption = defaultOption
 
     def getValue(self) -> str:
-        return self._dropDownInput.selectedItem.name
+        selectedItem = self._dropDownInput.selectedItem
+        return selectedItem.name if selectedItem else None
 
     def setValueFromCommandInput(self, commandInput: IntegerSliderCommandInput):
         pass
 
+    def setOptions(self, options: [str]):
+        self._dropDownInput.listItems.clear()
+        for i, option in enumerate(options):
+            self._dropDownInput.listItems.add(option, i == 0)
+
     def addToCommandInputs(self, commandInputs: CommandInputs):
         self._dropDownInput = commandInputs.addDropDownCommandInput(self._id, self._name,
                                                                     DropDownStyles.TextListDropDownStyle)
-        for option in self._dropDownOptions:
-            self._dropDownInput.listItems.add(option, option == self._defaultOption)
+        options = self._dropDownOptions() if callable(self._dropDownOptions) else self._dropDownOptions
+        defaultOption = self._defaultOption if self._defaultOption is not None else next(iter(options), None)
+        for option in options:
+            self._dropDownInput.listItems.add(option, option == defaultOption)
 
 
 class UserParameters(Enum):
-    THREAD_DEFINITION_DROPDOWN = UserDropDownParameter('threadDefinitionDropdownId', 'Thread Definition', ThreadDefinition.getThreadNames(), ThreadDefinition.getThreadNames()[0])
+    THREAD_FILTER = _UserStringParameter('threadFilterId', 'Thread Filter', '')
+    THREAD_DEFINITION_DROPDOWN = UserDropDownParameter('threadDefinitionDropdownId', 'Thread Definition',
+                                                       lambda: ThreadDefinition.findThreadNames(
+                                                           UserParameters.THREAD_FILTER.value.getValue()))
     LENGTH = _UserDimensionParameter('lengthId', 'Length', 'mm', 20)
     MAJOR_DIAMETER = _UserDimensionParameter('majorDiameterId', 'Major Diameter', 'mm', 11)
     MINOR_DIAMETER = _UserDimensionParameter('minorDiameterId', 'Minor Diameter', 'mm', 10)
@@ -119,10 +172,25 @@ class UserParameters(Enum):
     MAJOR_DIAMETER_STEP = _UserDimensionParameter('majorDiameterStepId', 'Major Diameter Step', 'mm', 0)
     MINOR_DIAMETER_STEP = _UserDimensionParameter('minorDiameterStepId', 'Minor Diameter Step', 'mm', 0)
     NOTCH_WIDTH_STEP = _UserDimensionParameter('notchWidthStepId', 'Notch Width Step', 'mm', 0)
+    HELIX_TOLERANCE = _UserDimensionParameter('helixToleranceId', 'Helix Tolerance', 'mm', 0.02)
+    HELIX_BACKEND = UserDropDownParameter('helixBackendId', 'Helix Curve', [backend.value for backend in HelixBackend],
+                                          HelixBackend.FITTED_SPLINE.value)
+    SECTIONS_PER_TURN = _UserIntegerSpinnerParameter('sectionsPerTurnId', 'Loft Sections Per Turn', 1, 16, 2)
+    THREAD_ENGINE = UserDropDownParameter('threadEngineId', 'Thread Engine', [engine.value for engine in ThreadEngine],
+                                          ThreadEngine.LOFT.value)
+    OUTPUT_MODE = UserDropDownParameter('outputModeId', 'Output Mode', [mode.value for mode in OutputMode],
+                                        OutputMode.PARAMETRIC.value)
+    PREVIEW_ENDS_ONLY = _UserBoolParameter('previewEndsOnlyId', 'Preview First And Last Only', False)
+    BODY_CACHE = _UserBoolParameter('bodyCacheId', 'Cache Thread Bodies', False)
+    MESH_RESOLUTION = _UserIntegerSpinnerParameter('meshResolutionId', 'Mesh Segments Per Turn', 16, 512, 64)
+    DEFER_COMPUTE = _UserBoolParameter('deferComputeId', 'Defer Sketch Compute', False)
+    COMPACT_TIMELINE = _UserBoolParameter('compactTimelineId', 'Compact Timeline', False)
 
     @staticmethod
     def applySelectedThreadDefinition():
         threadName = UserParameters.THREAD_DEFINITION_DROPDOWN.value.getValue()
+        if threadName is None:
+            return
         threadDefinition = ThreadDefinition.fromThreadName(threadName)
         UserParameters.LENGTH.value.setValue(threadDefinition.length)
         UserParameters.MAJOR_DIAMETER.value.setValue(threadDefinition.majorDiameter)
@@ -131,6 +199,11 @@ class UserParameters(Enum):
         UserParameters.CUT_ANGLE.value.setValue(threadDefinition.cutAngle)
         UserParameters.NOTCH_WIDTH.value.setValue(threadDefinition.notchWidth)
 
+    @staticmethod
+    def filterThreadDefinitions(prefix: str):
+        UserParameters.THREAD_FILTER.value.setValue(prefix)
+        UserParameters.THREAD_DEFINITION_DROPDOWN.value.setOptions(ThreadDefinition.findThreadNames(prefix))
+
     @staticmethod
     def getLength() -> float:
         return UserParameters.LENGTH.value.getValue()
@@ -175,13 +248,78 @@ class UserParameters(Enum):
     def getNotchWidthStep() -> float:
         return UserParameters.NOTCH_WIDTH_STEP.value.getValue()
 
+    @staticmethod
+    def getHelixTolerance() -> float:
+        return UserParameters.HELIX_TOLERANCE.value.getValue()
+
+    @staticmethod
+    def getHelixBackend() -> HelixBackend:
+        return HelixBackend(UserParameters.HELIX_BACKEND.value.getValue())
+
+    @staticmethod
+    def getSectionsPerTurn() -> int:
+        return UserParameters.SECTIONS_PER_TURN.value.getValue()
+
+    @staticmethod
+    def getThreadEngine() -> ThreadEngine:
+        return ThreadEngine(UserParameters.THREAD_ENGINE.value.getValue())
+
+    @staticmethod
+    def getOutputMode() -> OutputMode:
+        return OutputMode(UserParameters.OUTPUT_MODE.value.getValue())
+
+    @staticmethod
+    def isPreviewEndsOnly() -> bool:
+        return UserParameters.PREVIEW_ENDS_ONLY.value.getValue()
+
+    @staticmethod
+    def isBodyCacheEnabled() -> bool:
+        return UserParameters.BODY_CACHE.value.getValue()
+
+    @staticmethod
+    def getMeshResolution() -> int:
+        return UserParameters.MESH_RESOLUTION.value.getValue()
+
+    @staticmethod
+    def isComputeDeferred() -> bool:
+        return UserParameters.DEFER_COMPUTE.value.getValue()
+
+    @staticmethod
+    def isTimelineCompacted() -> bool:
+        return UserParameters.COMPACT_TIMELINE.value.getValue()
+
+    @staticmethod
+    def getCouponSpec() -> CouponSpec:
+        threadSpec = ThreadSpec(UserParameters.getLength(),
+                                UserParameters.getMajorDiameter(),
+                                UserParameters.getMinorDiameter(),
+                                UserParameters.getPitch(),
+                                UserParameters.getCutAngle(),
+                                UserParameters.getNotchWidth(),
+                                UserParameters.getHelixTolerance(),
+                                UserParameters.getHelixBackend(),
+                                UserParameters.getSectionsPerTurn(),
+                                UserParameters.getThreadEngine())
+        return CouponSpec(threadSpec,
+                          UserParameters.isThreadMale(),
+                          int(UserParameters.getGenerationCount()),
+                          UserParameters.getMajorDiameterStep(),
+                          UserParameters.getMinorDiameterStep(),
+                          UserParameters.getNotchWidthStep(),
+                          UserParameters.getOutputMode(),
+                          UserParameters.isPreviewEndsOnly(),
+                          UserParameters.isBodyCacheEnabled(),
+                          UserParameters.getMeshResolution(),
+                          UserParameters.isComputeDeferred(),
+                          UserParameters.isTimelineCompacted())
+
     @staticmethod
     def getAllParameters() -> [_UserParameter]:
         return list(map(lambda param: param.value, UserParameters))
 
     @staticmethod
     def fromId(id: str) -> _UserParameter:
-        return next(param for param in UserParameters.getAllParameters() if param.getId() == id)
+        return _parametersById[id]
 
     @staticmethod
     def updateValuesFromCommandInputs(commandInputs: CommandInputs):
@@ -189,3 +327,6 @@ class UserParameters(Enum):
             commandInput = commandInputs.item(i)
             userParameter = UserParameters.fromId(commandInput.id)
             userParameter.setValueFromCommandInput(commandInput)
+
+
+_parametersById = {param.getId(): param for param in UserParameters.getAllParameters()}
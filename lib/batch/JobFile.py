@@ -0,0 +1,148 @@
+import itertools
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from ..CouponSpec import CouponSpec
+from ..OutputMode import OutputMode
+from ..ThreadDefinitions import ThreadDefinition
+from ..geometry.CouponArguments import MM_TO_CM
+from ..sketch.ThreadSpec import HelixBackend, ThreadEngine, ThreadSpec
+
+# a job file is {"jobs": [entry, ...]}. entries take the fields of ThreadJob, a list value is swept and the entry
+# expands to every combination of its lists. a "threadDefinition" of "*", alone or in a list, sweeps every row of the
+# thread table
+_ALL_THREAD_DEFINITIONS = '*'
+_THREAD_DEFINITION_FIELDS = ('length', 'majorDiameter', 'minorDiameter', 'pitch', 'cutAngle', 'notchWidth')
+
+
+class ThreadJob(NamedTuple):
+    # one coupon build, lengths in millimeters and angles in degrees like the dialog
+    threadDefinition: Optional[str] = None
+    length: float = 20
+    majorDiameter: float = 11
+    minorDiameter: float = 10
+    pitch: float = 2
+    cutAngle: float = 30.0
+    notchWidth: float = 0.5
+    isMale: bool = True
+    generationCount: int = 10
+    majorDiameterStep: float = 0
+    minorDiameterStep: float = 0
+    notchWidthStep: float = 0
+    helixTolerance: float = 0.02
+    helixBackend: str = HelixBackend.FITTED_SPLINE.value
+    sectionsPerTurn: int = 2
+    threadEngine: str = ThreadEngine.LOFT.value
+    outputMode: str = OutputMode.PARAMETRIC.value
+    isComputeDeferred: bool = False
+    isTimelineCompacted: bool = False
+
+    def getKey(self) -> str:
+        return json.dumps(self._asdict(), sort_keys=True)
+
+    def getName(self) -> str:
+        thread = self.threadDefinition or 'M{:g}x{:g}'.format(self.majorDiameter, self.pitch)
+        return '{} {}, steps {:g}/{:g}/{:g} mm'.format(thread, 'male' if self.isMale else 'female',
+                                                      self.majorDiameterStep, self.minorDiameterStep,
+                                                      self.notchWidthStep)
+
+    def toCouponSpec(self) -> CouponSpec:
+        threadSpec = ThreadSpec(self.length * MM_TO_CM,
+                                self.majorDiameter * MM_TO_CM,
+                                self.minorDiameter * MM_TO_CM,
+                                self.pitch * MM_TO_CM,
+                                math.radians(self.cutAngle),
+                                self.notchWidth * MM_TO_CM,
+                                self.helixTolerance * MM_TO_CM,
+                                HelixBackend(self.helixBackend),
+                                self.sectionsPerTurn,
+                                ThreadEngine(self.threadEngine))
+        return CouponSpec(threadSpec,
+                          self.isMale,
+                          self.generationCount,
+                          self.majorDiameterStep * MM_TO_CM,
+                          self.minorDiameterStep * MM_TO_CM,
+                          self.notchWidthStep * MM_TO_CM,
+                          OutputMode(self.outputMode),
+                          isComputeDeferred=self.isComputeDeferred,
+                          isTimelineCompacted=self.isTimelineCompacted)
+
+
+def loadJobs(path: str) -> [ThreadJob]:
+    with open(path) as jobFile:
+        entries = json.load(jobFile)['jobs']
+    jobs = []
+    for entry in entries:
+        unknownFields = set(entry) - set(ThreadJob._fields)
+        if unknownFields:
+            raise ValueError('{}: unknown job fields {}'.format(path, ', '.join(sorted(unknownFields))))
+        sweep = OrderedDict((field, value if isinstance(value, list) else [value]) for field, value in entry.items())
+        if 'threadDefinition' in sweep:
+            sweep['threadDefinition'] = _getThreadNames(path, sweep['threadDefinition'])
+        for values in itertools.product(*sweep.values()):
+            jobs.append(_createJob(dict(zip(sweep, values))))
+    # entries may overlap, every job is built once
+    return list(OrderedDict.fromkeys(jobs))
+
+
+def _getThreadNames(path: str, threadNames: list) -> list:
+    # "*" stands for every row of the thread table, also next to other names
+    allThreadNames = ThreadDefinition.getThreadNames()
+    threadNames = [name for threadName in threadNames
+                   for name in (allThreadNames if threadName == _ALL_THREAD_DEFINITIONS else [threadName])]
+    unknownThreadNames = [threadName for threadName in threadNames
+                          if threadName is not None and threadName not in allThreadNames]
+    if unknownThreadNames:
+        raise ValueError('{}: unknown thread definitions {}'.format(path, ', '.join(map(str, unknownThreadNames))))
+    return threadNames
+
+
+def _createJob(values: dict) -> ThreadJob:
+    # a thread definition fills in the thread dimensions, values given in the entry still take precedence
+    threadName = values.get('threadDefinition')
+    if threadName is not None:
+        threadDefinition = ThreadDefinition.fromThreadName(threadName)
+        values = dict({field: getattr(threadDefinition, field) for field in _THREAD_DEFINITION_FIELDS}, **values)
+    return ThreadJob(**values)
+
+
+class JobCheckpoint:
+    # results of the finished jobs next to the job file. it is replaced after every job, so a crash loses at most
+    # the job that was running
+    def __init__(self, jobFilePath: str):
+        self._path = os.path.splitext(jobFilePath)[0] + '.checkpoint.json'
+        self._results = OrderedDict()
+        if os.path.exists(self._path):
+            with open(self._path) as checkpointFile:
+                self._results = OrderedDict((result['key'], result) for result in json.load(checkpointFile))
+
+    def getPath(self) -> str:
+        return self._path
+
+    def isFinished(self, job: ThreadJob) -> bool:
+        # failed jobs are run again, their result is replaced once they are built
+        result = self._results.get(job.getKey())
+        return result is not None and result['error'] is None
+
+    def getResults(self) -> [dict]:
+        return list(self._results.values())
+
+    def add(self, job: ThreadJob, result: dict):
+        self._results[job.getKey()] = dict(result, key=job.getKey(), name=job.getName(),
+                                           finishedAt=time.strftime('%Y-%m-%d %H:%M:%S'))
+        temporaryPath = self._path + '.tmp'
+        with open(temporaryPath, 'w') as checkpointFile:
+            json.dump(self.getResults(), checkpointFile, indent=1)
+        os.replace(temporaryPath, self._path)
+
+
+def getThroughput(results: [dict]) -> dict:
+    builtResults = [result for result in results if result['error'] is None]
+    elapsedTime = sum(result['time'] for result in results)
+    generationCount = sum(result['generationCount'] for result in builtResults)
+    return {'jobs': len(builtResults), 'failed': len(results) - len(builtResults), 'generations': generationCount,
+            'time': elapsedTime, 'generationsPerMinute': generationCount * 60 / elapsedTime if elapsedTime else 0.0}
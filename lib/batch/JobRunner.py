@@ -0,0 +1,95 @@
+import time
+
+from .JobFile import ThreadJob, JobCheckpoint, loadJobs, getThroughput
+from ..OnExecuteHandler import OnExecuteHandler
+from ..common.Common import getUi, getDesign, log
+from ..common.Progress import BuildProgress
+
+
+class JobRunner:
+    # state of a job file run. every job is built in an execution of its own command, the design is saved and the
+    # job checkpointed once that command has committed, outside of any command. a failed or cancelled job never
+    # rolls back the jobs before it
+    def __init__(self, jobFilePath: str):
+        self._jobFilePath = jobFilePath
+        self._document = getDesign().parentDocument
+        self._checkpoint = None
+        self._pendingJobs = []
+        self._sessionResults = []
+        self._result = None
+        # the coupons of the jobs are not cancelled on their own, the job progress takes their place
+        self._handler = OnExecuteHandler(progress=BuildProgress('Generating Threads', False))
+        self._progress = BuildProgress('Running Thread Jobs')
+
+    def start(self) -> bool:
+        if not self._document.isSaved:
+            # the design is saved after every job, a checkpoint of an unsaved design would skip jobs lost in a crash
+            getUi().messageBox('Save the design before running thread jobs, it is saved again after every job.')
+            return False
+        jobs = loadJobs(self._jobFilePath)
+        self._checkpoint = JobCheckpoint(self._jobFilePath)
+        self._pendingJobs = [job for job in jobs if not self._checkpoint.isFinished(job)]
+        log('Jobs: {} of {} already finished, {} to run, checkpoint {}'.format(
+            len(jobs) - len(self._pendingJobs), len(jobs), len(self._pendingJobs), self._checkpoint.getPath()))
+        self._progress.start(len(self._pendingJobs), 'Job')
+        return True
+
+    def hasPendingJobs(self) -> bool:
+        return len(self._sessionResults) < len(self._pendingJobs)
+
+    def buildJob(self):
+        # in the execute handler of the job command
+        self._result = _runJob(self._handler, self._pendingJobs[len(self._sessionResults)])
+
+    def finishJob(self, isCommitted: bool):
+        # after the job command has terminated. raises BuildCancelledError when the progress dialog was cancelled
+        job = self._pendingJobs[len(self._sessionResults)]
+        result = self._result
+        if result is None:
+            result = {'error': 'the job command did not execute', 'time': 0.0, 'generationCount': job.generationCount,
+                      'timelineItems': 0}
+        elif result['error'] is None and not isCommitted:
+            result = dict(result, error='the job command was not committed')
+        self._result = None
+        # saved before it is checkpointed, a crash in between builds the job again instead of losing it
+        if result['error'] is None:
+            self._document.save('Thread job {}'.format(job.getName()))
+        self._checkpoint.add(job, result)
+        self._sessionResults.append(result)
+        self._progress.step(len(self._sessionResults))
+
+    def finish(self):
+        self._progress.finish()
+        if self.hasPendingJobs():
+            log('Jobs: stopped, {} jobs remain'.format(len(self._pendingJobs) - len(self._sessionResults)))
+        _logThroughput('this session', self._sessionResults)
+        if self._checkpoint is not None:
+            _logThroughput('job file', self._checkpoint.getResults())
+
+
+def _runJob(handler: OnExecuteHandler, job: ThreadJob) -> dict:
+    # a selection would make the handler thread the selected points instead of building a coupon
+    getUi().activeSelections.clear()
+    startTime = time.perf_counter()
+    startItemCount = getDesign().timeline.count
+    error = None
+    try:
+        component = handler.run(job.toCouponSpec())
+        component.name = job.getName()
+    except Exception as exception:
+        # the handler has rolled the timeline back, the remaining jobs still run
+        error = str(exception)
+    result = {'error': error, 'time': time.perf_counter() - startTime, 'generationCount': job.generationCount,
+              'timelineItems': getDesign().timeline.count - startItemCount}
+    if error is None:
+        log('Job {}: {:.1f} s, {} timeline items'.format(job.getName(), result['time'], result['timelineItems']))
+    else:
+        log('Job {}: failed, {}'.format(job.getName(), error))
+    return result
+
+
+def _logThroughput(title: str, results: [dict]):
+    throughput = getThroughput(results)
+    log('Jobs, {}: {} built, {} failed, {} generations in {:.1f} s, {:.1f} generations per minute'.format(
+        title, throughput['jobs'], throughput['failed'], throughput['generations'], throughput['time'],
+        throughput['generationsPerMinute']))
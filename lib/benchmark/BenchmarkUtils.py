@@ -0,0 +1,16 @@
+import time
+
+from ..CouponSpec import CouponSpec
+from ..OnExecuteHandler import OnExecuteHandler
+from ..common.Common import getDesign
+from ..sketch.BRepUtils import removeTimelineItemsAfter
+
+
+def timeRun(spec: CouponSpec) -> float:
+    # builds a whole coupon through the execute path, then removes it from the timeline again
+    initTimelineIndex = getDesign().timeline.markerPosition
+    startTime = time.perf_counter()
+    OnExecuteHandler().run(spec)
+    elapsedTime = time.perf_counter() - startTime
+    removeTimelineItemsAfter(initTimelineIndex)
+    return elapsedTime
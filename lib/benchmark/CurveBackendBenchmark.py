@@ -0,0 +1,38 @@
+import time
+
+from adsk.core import Point3D
+
+from ..common.Common import getDesign, log
+from ..sketch.BRepUtils import removeTimelineItemsAfter
+from ..sketch.SketchUtils import createNewComponent
+from ..sketch.ThreadFeature import ThreadFeature
+from ..sketch.ThreadSpec import HelixBackend, ThreadSpec
+
+
+# run from the text commands palette to compare male thread build times of the helix curve backends, as timeline
+# features and as a temporary body
+def benchmarkCurveBackends(length: float = 2.0, majorDiameter: float = 1.1, minorDiameter: float = 1.0,
+                           pitch: float = 0.2, cutAngle: float = 0.52, notchWidth: float = 0.05,
+                           helixTolerance: float = 0.002, repeats: int = 3) -> dict:
+    results = {}
+    for backend in HelixBackend:
+        spec = ThreadSpec(length, majorDiameter, minorDiameter, pitch, cutAngle, notchWidth, helixTolerance, backend)
+        featureTime = _timeBuild(spec, lambda threadFeature: threadFeature.createMaleThread(), repeats)
+        bodyTime = _timeBuild(spec, lambda threadFeature: threadFeature.createMaleThreadBody(), repeats)
+        results[backend.value] = (featureTime, bodyTime)
+        log('{}: best thread time {:.3f}s, as a body {:.3f}s over {} runs'.format(backend.value, featureTime,
+                                                                                bodyTime, repeats))
+    return results
+
+
+def _timeBuild(spec: ThreadSpec, build, repeats: int) -> float:
+    buildTimes = []
+    for _ in range(repeats):
+        initTimelineIndex = getDesign().timeline.markerPosition
+        component = createNewComponent()
+        threadFeature = ThreadFeature(component, Point3D.create(0, 0, 0), component.xYConstructionPlane, spec)
+        startTime = time.perf_counter()
+        build(threadFeature)
+        buildTimes.append(time.perf_counter() - startTime)
+        removeTimelineItemsAfter(initTimelineIndex)
+    return min(buildTimes)
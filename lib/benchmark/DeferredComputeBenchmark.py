@@ -0,0 +1,21 @@
+from ..CouponSpec import CouponSpec
+from ..common.Common import log
+from ..sketch.ThreadSpec import ThreadSpec
+from .BenchmarkUtils import timeRun
+
+
+# run from the text commands palette to compare coupon build times with and without deferred sketch compute
+def benchmarkDeferredCompute(length: float = 2.0, majorDiameter: float = 1.1, minorDiameter: float = 1.0,
+                             pitch: float = 0.2, cutAngle: float = 0.52, notchWidth: float = 0.05,
+                             helixTolerance: float = 0.002, isMale: bool = True,
+                             generationCounts: [int] = range(1, 11)) -> dict:
+    threadSpec = ThreadSpec(length, majorDiameter, minorDiameter, pitch, cutAngle, notchWidth, helixTolerance)
+    results = {}
+    for generationCount in generationCounts:
+        buildTimes = [timeRun(CouponSpec(threadSpec, isMale, generationCount, 0.01, 0.01, 0.01,
+                                         isComputeDeferred=isComputeDeferred))
+                      for isComputeDeferred in (False, True)]
+        results[generationCount] = tuple(buildTimes)
+        log('{} generations: {:.3f}s, deferred {:.3f}s ({:.0%} faster)'.format(
+            generationCount, buildTimes[0], buildTimes[1], 1 - buildTimes[1] / buildTimes[0]))
+    return results
@@ -0,0 +1,22 @@
+from ..CouponSpec import CouponSpec
+from ..OutputMode import OutputMode
+from ..common.Common import log
+from ..sketch.ThreadSpec import ThreadSpec
+from .BenchmarkUtils import timeRun
+
+
+# run from the text commands palette to compare the BRep and mesh output modes for male coupons. both build the
+# whole coupon through the same execute path, cuboid included
+def benchmarkOutputModes(length: float = 2.0, majorDiameter: float = 1.1, minorDiameter: float = 1.0,
+                         pitch: float = 0.2, cutAngle: float = 0.52, notchWidth: float = 0.05,
+                         helixTolerance: float = 0.002, meshResolution: int = 64,
+                         generationCounts: [int] = range(1, 11)) -> dict:
+    threadSpec = ThreadSpec(length, majorDiameter, minorDiameter, pitch, cutAngle, notchWidth, helixTolerance)
+    results = {}
+    for generationCount in generationCounts:
+        brepTime, meshTime = [timeRun(CouponSpec(threadSpec, True, generationCount, 0.01, 0.01, 0.01, outputMode,
+                                                 meshResolution=meshResolution))
+                              for outputMode in (OutputMode.PARAMETRIC, OutputMode.MESH)]
+        results[generationCount] = (brepTime, meshTime)
+        log('{} generations: BRep {:.3f}s, mesh {:.3f}s'.format(generationCount, brepTime, meshTime))
+    return results
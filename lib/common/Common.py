@@ -1,13 +1,46 @@
+import os
+import tempfile
 import traceback
 
-from adsk.core import Application
+from adsk.core import Application, UserInterface, UnitsManager
 from adsk.fusion import Design
 
-ui = Application.get().userInterface
-unitsMgr = Application.get().activeProduct.unitsManager
-design = Design.cast(Application.get().activeProduct)
 resourceFolder = './resources'
 
+_ui = None
+
+
+# Fusion objects are looked up on first use, importing the add-in must stay cheap
+def getUi() -> UserInterface:
+    global _ui
+    if _ui is None:
+        _ui = Application.get().userInterface
+    return _ui
+
+
+def getDesign() -> Design:
+    # not cached, the active design changes with the active document
+    return Design.cast(Application.get().activeProduct)
+
+
+def getUnitsMgr() -> UnitsManager:
+    return Application.get().activeProduct.unitsManager
+
+
+def getDesignFileSize() -> int:
+    # the design exported as a Fusion archive, the closest measure of what saving it writes
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'design.f3d')
+        exportManager = getDesign().exportManager
+        exportManager.execute(exportManager.createFusionArchiveExportOptions(path))
+        return os.path.getsize(path)
+
 
 def printTrace():
-    ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+    getUi().messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+
+def log(message: str):
+    palette = getUi().palettes.itemById('TextCommands')
+    if palette:
+        palette.writeText(message)
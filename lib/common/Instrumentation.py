@@ -0,0 +1,132 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import NamedTuple, Optional
+
+from .Common import getDesign, log
+
+
+class PhaseRecord(NamedTuple):
+    name: str
+    generation: Optional[int]
+    duration: float
+    # timeline items added while the phase ran
+    createdCount: int
+
+
+class PaletteSink:
+    def write(self, message: str):
+        log(message)
+
+
+class RotatingFileSink:
+    def __init__(self, path: str = os.path.join(os.path.expanduser('~'), '.ThreadGenerator', 'logs', 'run.log'),
+                 maxBytes: int = 1024 * 1024, backupCount: int = 3):
+        self._path = path
+        self._maxBytes = maxBytes
+        self._backupCount = backupCount
+        self._logger = None
+
+    def write(self, message: str):
+        if self._logger is None:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            handler = RotatingFileHandler(self._path, maxBytes=self._maxBytes, backupCount=self._backupCount)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            # not registered with logging.getLogger, reloading the add-in must not stack handlers
+            self._logger = logging.Logger('ThreadGenerator.run')
+            self._logger.addHandler(handler)
+        self._logger.info(message)
+
+
+class Instrumentation:
+    def __init__(self, sinks: list = None):
+        self._sinks = [] if sinks is None else list(sinks)
+        self._records = []
+        self._generation = None
+        self._runStartTime = 0
+        self._runStartCount = 0
+        self._timeline = None
+
+    def setSinks(self, sinks: list):
+        self._sinks = list(sinks)
+
+    def addSink(self, sink):
+        self._sinks.append(sink)
+
+    def write(self, message: str):
+        for sink in self._sinks:
+            sink.write(message)
+
+    def getRecords(self) -> [PhaseRecord]:
+        return list(self._records)
+
+    def startRun(self):
+        self._records = []
+        self._generation = None
+        self._runStartTime = time.perf_counter()
+        # looked up once per run, phases only read its item count
+        self._timeline = getDesign().timeline
+        self._runStartCount = self._timeline.count
+
+    @contextmanager
+    def phase(self, name: str):
+        startTime = time.perf_counter()
+        timeline = self._timeline or getDesign().timeline
+        startCount = timeline.count
+        try:
+            yield
+        finally:
+            self._records.append(PhaseRecord(name, self._generation, time.perf_counter() - startTime,
+                                             timeline.count - startCount))
+
+    @contextmanager
+    def generation(self, generationCount: int):
+        previousGeneration = self._generation
+        self._generation = generationCount
+        try:
+            yield
+        finally:
+            self._generation = previousGeneration
+
+    def timed(self, name: str):
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def finishRun(self, title: str):
+        if not self._sinks:
+            return
+        duration = time.perf_counter() - self._runStartTime
+        createdCount = self._timeline.count - self._runStartCount
+        lines = ['{}: {:.1f} ms, {} timeline items'.format(title, duration * 1000, createdCount)]
+        lines += ['  ' + line for line in self._summarize(self._records)]
+        generations = sorted({record.generation for record in self._records if record.generation is not None})
+        for generationCount in generations:
+            records = [record for record in self._records if record.generation == generationCount]
+            lines.append('  Generation {}: {:.1f} ms, {} timeline items'.format(
+                generationCount, sum(record.duration for record in records) * 1000,
+                sum(record.createdCount for record in records)))
+            lines += ['    ' + line for line in self._summarize(records)]
+        self.write('\n'.join(lines))
+
+    def _summarize(self, records: [PhaseRecord]) -> [str]:
+        # phase name -> [calls, duration, created items], in the order the phases first ran
+        totals = OrderedDict()
+        for record in records:
+            total = totals.setdefault(record.name, [0, 0, 0])
+            total[0] += 1
+            total[1] += record.duration
+            total[2] += record.createdCount
+        return ['{}: {} x, {:.1f} ms, {} timeline items'.format(name, calls, duration * 1000, createdCount)
+                for name, (calls, duration, createdCount) in totals.items()]
+
+
+instrumentation = Instrumentation([PaletteSink(), RotatingFileSink()])
@@ -0,0 +1,50 @@
+import time
+
+import adsk
+
+from .Common import getUi
+
+
+class BuildCancelledError(Exception):
+    pass
+
+
+class BuildProgress:
+    # progress dialog for builds of several steps. pending events are processed after every step, so the dialog
+    # is redrawn and its cancel button is noticed between steps
+    def __init__(self, title: str, isEnabled: bool = True):
+        self._title = title
+        self._isEnabled = isEnabled
+        self._dialog = None
+        self._stepCount = 0
+        self._stepName = ''
+        self._startTime = 0
+
+    def start(self, stepCount: int, stepName: str = 'Generation'):
+        if not self._isEnabled or stepCount < 2:
+            return
+        self._stepCount = stepCount
+        self._stepName = stepName
+        self._startTime = time.perf_counter()
+        self._dialog = getUi().createProgressDialog()
+        self._dialog.isCancelButtonShown = True
+        self._dialog.show(self._title, '{} 1 of {}'.format(stepName, stepCount), 0, stepCount, 0)
+        self._processEvents()
+
+    def step(self, doneCount: int):
+        if self._dialog is None:
+            return
+        self._dialog.progressValue = doneCount
+        self._dialog.message = '{} {} of {} done, {:.1f} s elapsed'.format(
+            self._stepName, doneCount, self._stepCount, time.perf_counter() - self._startTime)
+        self._processEvents()
+
+    def finish(self):
+        if self._dialog is not None:
+            self._dialog.hide()
+            self._dialog = None
+
+    def _processEvents(self):
+        adsk.doEvents()
+        if self._dialog.wasCancelled:
+            raise BuildCancelledError('{} cancelled'.format(self._title))
@@ -0,0 +1,56 @@
+import math
+from typing import NamedTuple
+
+BOLT_THICKNESS = 0.25
+BASE_DEPTH = 0.1
+# TODO: replace compensation offset by chamfer
+CYLINDER_LENGTH_COMPENSATION = 0.1
+
+
+class CouponParameters(NamedTuple):
+    length: float
+    majorDiameter: float
+    minorDiameter: float
+    pitch: float
+    cutAngle: float
+    notchWidth: float
+    isMale: bool
+    generationCount: int
+    majorDiameterStep: float
+    minorDiameterStep: float
+    notchWidthStep: float
+
+
+def getToleranceValue(stepSize: float, stepCount: int, fromStep: int, interval: int) -> float:
+    # increment tolerance value every `interval` steps
+    intervalCount = math.floor((stepCount - fromStep) / interval) + 1
+    return max(0, intervalCount) * stepSize
+
+
+def getGenerationTolerances(generationCount: int, majorDiameterStep: float, minorDiameterStep: float,
+                            notchWidthStep: float) -> (float, float, float):
+    # the three dimensions are stepped in turn, one per generation
+    majorDiameterTolerance = getToleranceValue(majorDiameterStep, generationCount, 2, 3)
+    minorDiameterTolerance = getToleranceValue(minorDiameterStep, generationCount, 3, 3)
+    notchWidthTolerance = getToleranceValue(notchWidthStep, generationCount, 1, 3)
+    return majorDiameterTolerance, minorDiameterTolerance, notchWidthTolerance
+
+
+def getGenerationOffset(majorDiameter: float, generationCount: int) -> float:
+    return majorDiameter * generationCount * 2
+
+
+def getBaseCuboidCorners(majorDiameter: float, generationCount: int, isMale: bool) -> ((float, float, float),
+                                                                                        (float, float, float)):
+    boxWidth = majorDiameter
+    boxLength = (majorDiameter * generationCount * 2) - majorDiameter
+    offset = boxWidth / 2
+    if not isMale:
+        boxWidth = boxWidth + (BOLT_THICKNESS * 2)
+        boxLength = boxLength + (BOLT_THICKNESS * 2)
+        offset = offset + BOLT_THICKNESS
+    return (-offset, -offset, -BASE_DEPTH), (boxLength - offset, boxWidth - offset, 0)
+
+
+def getCylinderDimensions(majorDiameter: float, length: float) -> (float, float):
+    return majorDiameter + (BOLT_THICKNESS * 2), length - CYLINDER_LENGTH_COMPENSATION
@@ -0,0 +1,44 @@
+import argparse
+
+from ..ThreadDefinitions import ThreadDefinition
+
+# parameters are given in millimeters and degrees like in the dialog, the kernel works in Fusion's internal centimeters
+MM_TO_CM = 0.1
+
+
+def createCouponArgumentParser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    # checked after parsing, choices would read the thread table whenever a parser is created
+    parser.add_argument('--thread-definition', metavar='NAME',
+                        help='take length, diameters, pitch, cut angle and notch width from a thread definition of '
+                             'resources/threads.csv, e.g. M6 or "G 1/4"')
+    parser.add_argument('--length', type=float, default=20)
+    parser.add_argument('--major-diameter', type=float, default=11)
+    parser.add_argument('--minor-diameter', type=float, default=10)
+    parser.add_argument('--pitch', type=float, default=2)
+    parser.add_argument('--cut-angle', type=float, default=30.0)
+    parser.add_argument('--notch-width', type=float, default=0.5)
+    parser.add_argument('--female', action='store_true')
+    parser.add_argument('--generation-count', type=int, default=1)
+    parser.add_argument('--major-diameter-step', type=float, default=0)
+    parser.add_argument('--minor-diameter-step', type=float, default=0)
+    parser.add_argument('--notch-width-step', type=float, default=0)
+    return parser
+
+
+def parseCouponArguments(parser: argparse.ArgumentParser, argv: [str] = None) -> argparse.Namespace:
+    args = parser.parse_args(argv)
+    if args.thread_definition:
+        try:
+            threadDefinition = ThreadDefinition.fromThreadName(args.thread_definition)
+        except KeyError:
+            parser.error('unknown thread definition {!r}, names starting with it: {}'.format(
+                args.thread_definition, ', '.join(ThreadDefinition.findThreadNames(args.thread_definition, 10)) or
+                'none'))
+        args.length = threadDefinition.length
+        args.major_diameter = threadDefinition.majorDiameter
+        args.minor_diameter = threadDefinition.minorDiameter
+        args.pitch = threadDefinition.pitch
+        args.cut_angle = threadDefinition.cutAngle
+        args.notch_width = threadDefinition.notchWidth
+    return args
@@ -0,0 +1,155 @@
+import math
+from collections import OrderedDict
+from typing import NamedTuple, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:
+    # numpy is not bundled with every Fusion 360 install, fall back to plain python sampling
+    numpy = None
+
+
+class HelixSpec(NamedTuple):
+    radius: float
+    rise: float  # axial advance per radian
+    height: float
+    tolerance: float  # maximum deviation of the fitted spline from the true helix
+
+
+_CACHE_SIZE = 64
+_MIN_STEPS = 4
+# a fitted spline through the samples must still wind around the axis
+_MAX_STEP_ANGLE = math.pi / 2
+# a quadratic rational arc cannot span half a turn or more
+_MIN_SEGMENTS_PER_TURN = 3
+_MAX_SEGMENTS_PER_TURN = 32
+_unitHelixCache = OrderedDict()
+
+
+def getHelixSteps(spec: HelixSpec) -> int:
+    # cubic interpolation of a circle deviates by 5/384 * r * h^4 for a sample spacing of h radians
+    tRange = spec.height / spec.rise
+    maxStepAngle = min(_MAX_STEP_ANGLE, (384 * spec.tolerance / (5 * spec.radius)) ** 0.25)
+    return max(_MIN_STEPS, math.ceil(tRange / maxStepAngle) + 1)
+
+
+def getHelixDeviation(spec: HelixSpec) -> float:
+    stepAngle = spec.height / spec.rise / (getHelixSteps(spec) - 1)
+    return 5 * spec.radius * stepAngle ** 4 / 384
+
+
+def getTurnCount(spec: HelixSpec) -> float:
+    return spec.height / spec.rise / (2 * math.pi)
+
+
+def getSectionPositions(spec: HelixSpec, sectionsPerTurn: int) -> [float]:
+    # relative positions along the helix, including both end sections
+    sectionCount = max(2, math.ceil(getTurnCount(spec) * sectionsPerTurn) + 1)
+    return [i / (sectionCount - 1) for i in range(sectionCount)]
+
+
+def sampleHelix(spec: HelixSpec, origin: Tuple[float, float, float]):
+    return sampleHelixes([spec], [origin])[0]
+
+
+def sampleHelixes(specs: Sequence[HelixSpec], origins: Sequence[Tuple[float, float, float]]) -> list:
+    # helixes which only differ by translation share the same samples around the origin
+    missingSpecs = list(OrderedDict.fromkeys(spec for spec in specs if spec not in _unitHelixCache))
+    if missingSpecs:
+        for spec, samples in zip(missingSpecs, _computeUnitHelixes(missingSpecs)):
+            _unitHelixCache[spec] = samples
+    for spec in specs:
+        _unitHelixCache.move_to_end(spec)
+    while len(_unitHelixCache) > _CACHE_SIZE:
+        _unitHelixCache.popitem(last=False)
+    return [_translate(_unitHelixCache[spec], origin) for spec, origin in zip(specs, origins)]
+
+
+def clearHelixCache():
+    _unitHelixCache.clear()
+
+
+def _computeUnitHelixes(specs: Sequence[HelixSpec]) -> list:
+    stepCounts = [getHelixSteps(spec) for spec in specs]
+    if numpy is None:
+        return [_computeUnitHelix(spec, steps) for spec, steps in zip(specs, stepCounts)]
+
+    # sample every helix in a single batch, then split the result per helix
+    tRanges = numpy.array([spec.height / spec.rise for spec in specs])
+    counts = numpy.array(stepCounts)
+    helixIndices = numpy.repeat(numpy.arange(len(specs)), counts)
+    sampleIndices = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    t = tRanges[helixIndices] * sampleIndices / (counts[helixIndices] - 1)
+    radii = numpy.array([spec.radius for spec in specs])[helixIndices]
+    rises = numpy.array([spec.rise for spec in specs])[helixIndices]
+    samples = numpy.column_stack((radii * numpy.cos(t), radii * numpy.sin(t), rises * t))
+    samples.flags.writeable = False
+    return numpy.split(samples, numpy.cumsum(counts)[:-1])
+
+
+def _computeUnitHelix(spec: HelixSpec, steps: int) -> list:
+    tRange = spec.height / spec.rise
+    step = 1.0 / (steps - 1)
+    samples = []
+    for i in range(0, steps):
+        t = tRange * step * i
+        samples.append((spec.radius * math.cos(t), spec.radius * math.sin(t), spec.rise * t))
+    return samples
+
+
+def _translate(samples, origin: Tuple[float, float, float]):
+    if numpy is not None:
+        return samples + numpy.array(origin)
+    x, y, z = origin
+    return [(x + sx, y + sy, z + sz) for sx, sy, sz in samples]
+
+
+class RationalHelix(NamedTuple):
+    controlPoints: list
+    weights: list
+    knots: list
+    degree: int
+
+
+def getRationalHelixSegmentsPerTurn(spec: HelixSpec) -> int:
+    for segmentsPerTurn in range(_MIN_SEGMENTS_PER_TURN, _MAX_SEGMENTS_PER_TURN):
+        if getRationalHelixDeviation(spec, segmentsPerTurn) <= spec.tolerance:
+            return segmentsPerTurn
+    return _MAX_SEGMENTS_PER_TURN
+
+
+def getRationalHelix(spec: HelixSpec, segmentsPerTurn: int) -> RationalHelix:
+    # quadratic rational arcs project exactly onto the helix circle, only the axial position is approximated
+    tRange = spec.height / spec.rise
+    segmentCount = max(1, math.ceil(tRange / (2 * math.pi / segmentsPerTurn)))
+    segmentAngle = tRange / segmentCount
+    cornerRadius = spec.radius / math.cos(segmentAngle / 2)
+    controlPoints = [(spec.radius, 0.0, 0.0)]
+    weights = [1.0]
+    knots = [0.0, 0.0, 0.0]
+    for i in range(segmentCount):
+        middle = (i + 0.5) * segmentAngle
+        end = (i + 1) * segmentAngle
+        controlPoints.append((cornerRadius * math.cos(middle), cornerRadius * math.sin(middle), spec.rise * middle))
+        controlPoints.append((spec.radius * math.cos(end), spec.radius * math.sin(end), spec.rise * end))
+        weights.extend((math.cos(segmentAngle / 2), 1.0))
+        knots.extend((i + 1.0, i + 1.0))
+    knots.append(float(segmentCount))
+    return RationalHelix(controlPoints, weights, knots, 2)
+
+
+def getRationalHelixDeviation(spec: HelixSpec, segmentsPerTurn: int, samplesPerSegment: int = 32) -> float:
+    # every segment has the same shape, so measuring the first one is enough
+    helix = getRationalHelix(spec, segmentsPerTurn)
+    (x0, y0, z0), (x1, y1, z1), (x2, y2, z2) = helix.controlPoints[:3]
+    w = helix.weights[1]
+    maxError = 0.0
+    for i in range(samplesPerSegment + 1):
+        u = i / samplesPerSegment
+        b0, b1, b2 = (1 - u) ** 2, 2 * u * (1 - u) * w, u ** 2
+        total = b0 + b1 + b2
+        x = (b0 * x0 + b1 * x1 + b2 * x2) / total
+        y = (b0 * y0 + b1 * y1 + b2 * y2) / total
+        z = (b0 * z0 + b1 * z1 + b2 * z2) / total
+        maxError = max(maxError, abs(z - spec.rise * math.atan2(y, x)))
+    return maxError
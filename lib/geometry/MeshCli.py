@@ -0,0 +1,43 @@
+import math
+import sys
+import time
+
+from .Coupon import CouponParameters
+from .CouponArguments import MM_TO_CM, createCouponArgumentParser, parseCouponArguments
+from .MeshWriters import writeStl, write3mf
+from .ThreadMesh import iterCouponShells, getMeshResolution, getGenerationGeometry
+from .ThreadValidation import ThreadValidationError, validateGenerations
+
+
+def main(argv: [str] = None) -> int:
+    parser = createCouponArgumentParser('Generate a thread tolerance coupon as a triangle mesh.')
+    parser.add_argument('output', help='output file, .stl or .3mf')
+    parser.add_argument('--segments-per-turn', type=int, default=128)
+    args = parseCouponArguments(parser, argv)
+
+    parameters = CouponParameters(args.length * MM_TO_CM,
+                                  args.major_diameter * MM_TO_CM,
+                                  args.minor_diameter * MM_TO_CM,
+                                  args.pitch * MM_TO_CM,
+                                  math.radians(args.cut_angle),
+                                  args.notch_width * MM_TO_CM,
+                                  not args.female,
+                                  args.generation_count,
+                                  args.major_diameter_step * MM_TO_CM,
+                                  args.minor_diameter_step * MM_TO_CM,
+                                  args.notch_width_step * MM_TO_CM)
+    try:
+        validateGenerations([(i, getGenerationGeometry(parameters, i)) for i in range(parameters.generationCount)],
+                            parameters.isMale)
+    except ThreadValidationError as error:
+        parser.error(str(error))
+    write = write3mf if args.output.lower().endswith('.3mf') else writeStl
+    startTime = time.perf_counter()
+    triangleCount = write(args.output, iterCouponShells(parameters, getMeshResolution(args.segments_per_turn)),
+                          1 / MM_TO_CM)
+    print('{}: {} triangles in {:.2f}s'.format(args.output, triangleCount, time.perf_counter() - startTime))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import struct
+import zipfile
+from typing import Iterable
+
+import numpy
+
+from .ThreadMesh import MeshShell
+
+_STL_TRIANGLE = numpy.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attributes', '<u2')])
+_3MF_CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                      '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                      '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+                      '</Types>')
+_3MF_RELATIONSHIPS = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                      '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+                      'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+                      '</Relationships>')
+_ROWS_PER_CHUNK = 4096
+
+
+def writeStl(path: str, shells: Iterable[MeshShell], scale: float = 1.0) -> int:
+    # the triangle count is only known once every shell was written, so it is patched into the header at the end
+    triangleCount = 0
+    with open(path, 'wb') as stlFile:
+        stlFile.write(b'ThreadGenerator'.ljust(80, b' '))
+        stlFile.write(struct.pack('<I', 0))
+        for shell in shells:
+            corners = shell.vertices[shell.faces] * scale
+            normals = numpy.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            lengths = numpy.linalg.norm(normals, axis=1)[:, None]
+            triangles = numpy.zeros(len(corners), dtype=_STL_TRIANGLE)
+            triangles['normal'] = numpy.divide(normals, lengths, out=numpy.zeros_like(normals), where=lengths > 0)
+            triangles['vertices'] = corners
+            stlFile.write(triangles.tobytes())
+            triangleCount += len(triangles)
+        stlFile.seek(80)
+        stlFile.write(struct.pack('<I', triangleCount))
+    return triangleCount
+
+
+def write3mf(path: str, shells: Iterable[MeshShell], scale: float = 1.0) -> int:
+    triangleCount = 0
+    objectIds = []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _3MF_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _3MF_RELATIONSHIPS)
+        with archive.open('3D/3dmodel.model', 'w') as model:
+            model.write(b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                        b'<model unit="millimeter" xml:lang="en-US" '
+                        b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02"><resources>')
+            for objectId, shell in enumerate(shells, 1):
+                model.write('<object id="{}" type="model"><mesh><vertices>'.format(objectId).encode('ascii'))
+                _writeRows(model, shell.vertices * scale, '<vertex x="{:.6g}" y="{:.6g}" z="{:.6g}"/>')
+                model.write(b'</vertices><triangles>')
+                _writeRows(model, shell.faces, '<triangle v1="{}" v2="{}" v3="{}"/>')
+                model.write(b'</triangles></mesh></object>')
+                objectIds.append(objectId)
+                triangleCount += len(shell.faces)
+            model.write(b'</resources><build>')
+            for objectId in objectIds:
+                model.write('<item objectid="{}"/>'.format(objectId).encode('ascii'))
+            model.write(b'</build></model>')
+    return triangleCount
+
+
+def _writeRows(stream, rows: numpy.ndarray, rowFormat: str):
+    for start in range(0, len(rows), _ROWS_PER_CHUNK):
+        chunk = rows[start:start + _ROWS_PER_CHUNK].tolist()
+        stream.write(''.join(rowFormat.format(*row) for row in chunk).encode('ascii'))
@@ -0,0 +1,75 @@
+import math
+
+from .Helix import HelixSpec
+
+# the notch profile reaches slightly past the cut depth so it fully overlaps the shaft or hole
+NOTCH_OVERLAP = 0.001
+# overshoot to compensate for small rounding errors in helix calculations
+CHAMFER_OVERSHOOT = 0.01
+
+
+class ThreadGeometry:
+    def __init__(self,
+                 length: float,
+                 majorDiameter: float,
+                 minorDiameter: float,
+                 pitch: float,
+                 cutAngle: float,
+                 notchWidth: float):
+        self._length = length
+        self._majorDiameter = majorDiameter
+        self._minorDiameter = minorDiameter
+        self._pitch = pitch
+        self._cutAngle = cutAngle
+        self._notchWidth = notchWidth
+        self._cutDepth = (majorDiameter - minorDiameter) / 2
+        self._protrusionWidth = notchWidth + (self._cutDepth * math.tan(cutAngle) * 2)
+
+    def getLength(self) -> float:
+        return self._length
+
+    def getMajorDiameter(self) -> float:
+        return self._majorDiameter
+
+    def getMinorDiameter(self) -> float:
+        return self._minorDiameter
+
+    def getPitch(self) -> float:
+        return self._pitch
+
+    def getCutAngle(self) -> float:
+        return self._cutAngle
+
+    def getNotchWidth(self) -> float:
+        return self._notchWidth
+
+    def getCutDepth(self) -> float:
+        return self._cutDepth
+
+    def getProtrusionWidth(self) -> float:
+        return self._protrusionWidth
+
+    def getHelixAngle(self) -> float:
+        return math.asin(self._pitch / (math.pi * self._majorDiameter))
+
+    def getHelixStart(self) -> float:
+        return self._protrusionWidth / 2
+
+    def getHelixSpec(self, tolerance: float) -> HelixSpec:
+        radius = self._majorDiameter / 2
+        return HelixSpec(radius, math.tan(self.getHelixAngle()) * radius, self._length - self.getHelixStart(),
+                         tolerance)
+
+    def getNotchProfile(self) -> [(float, float)]:
+        # notch corners in the plane normal to the helix, x pointing from the major towards the minor diameter
+        return [(0, self._notchWidth / 2),
+                (self._cutDepth + NOTCH_OVERLAP, self._protrusionWidth / 2),
+                (self._cutDepth + NOTCH_OVERLAP, -self._protrusionWidth / 2),
+                (0, -self._notchWidth / 2)]
+
+    def getChamferTriangle(self) -> (float, float, float, float):
+        minorX = self._minorDiameter / 2 - self._protrusionWidth - CHAMFER_OVERSHOOT
+        majorX = self._majorDiameter / 2 + CHAMFER_OVERSHOOT
+        minorZ = self._length - self._protrusionWidth - CHAMFER_OVERSHOOT
+        majorZ = self._length + self._cutDepth + CHAMFER_OVERSHOOT
+        return minorX, majorX, minorZ, majorZ
@@ -0,0 +1,182 @@
+import math
+from typing import NamedTuple, Iterator
+
+import numpy
+
+from .Coupon import CouponParameters, getBaseCuboidCorners, getCylinderDimensions, getGenerationOffset, \
+    getGenerationTolerances
+from .ThreadGeometry import ThreadGeometry, NOTCH_OVERLAP
+
+
+class MeshResolution(NamedTuple):
+    segmentsPerTurn: int
+    rowsPerPitch: int
+
+
+class MeshShell(NamedTuple):
+    # closed, outward facing triangle mesh
+    vertices: numpy.ndarray
+    faces: numpy.ndarray
+
+
+def getMeshResolution(segmentsPerTurn: int) -> MeshResolution:
+    return MeshResolution(segmentsPerTurn, max(8, segmentsPerTurn // 4))
+
+
+def getThreadRadii(geometries: [ThreadGeometry], theta: numpy.ndarray, z: numpy.ndarray) -> numpy.ndarray:
+    # radius of the threaded surface on a (generation, z, theta) grid, for a shaft as well as for a hole
+    helixSpecs = [geometry.getHelixSpec(0) for geometry in geometries]
+    rise = _column([helixSpec.rise for helixSpec in helixSpecs])
+    tRange = _column([helixSpec.height / helixSpec.rise for helixSpec in helixSpecs])
+    helixStart = _column([geometry.getHelixStart() for geometry in geometries])
+    helixAngle = _column([geometry.getHelixAngle() for geometry in geometries])
+    majorRadius = _column([geometry.getMajorDiameter() / 2 for geometry in geometries])
+    minorRadius = _column([geometry.getMinorDiameter() / 2 for geometry in geometries])
+    notchWidth = _column([geometry.getNotchWidth() for geometry in geometries])
+    cutDepth = _column([geometry.getCutDepth() for geometry in geometries])
+    flankWidth = (_column([geometry.getProtrusionWidth() for geometry in geometries]) - notchWidth) / 2
+
+    lead = 2 * math.pi * rise
+    axialOffset = z[None, :, None] - helixStart - rise * theta[None, None, :]
+    turn = numpy.round(axialOffset / lead)
+    crossing = theta[None, None, :] + 2 * math.pi * turn
+    # distance to the nearest helix crossing, measured in the plane normal to the helix like the notch profile
+    distance = numpy.abs(axialOffset - turn * lead) * numpy.cos(helixAngle)
+    flankDistance = numpy.maximum(0, distance - notchWidth / 2)
+    # a notch without flanks is rectangular
+    flankSlope = (cutDepth + NOTCH_OVERLAP) / numpy.where(flankWidth > 0, flankWidth, 1e-12)
+    notchRadius = majorRadius - flankDistance * flankSlope
+    notchRadius = numpy.where((crossing >= 0) & (crossing <= tRange), notchRadius, minorRadius)
+    return numpy.clip(notchRadius, minorRadius, majorRadius)
+
+
+def createThreadShells(geometries: [ThreadGeometry], origins: [(float, float)], resolution: MeshResolution,
+                       isMale: bool, isChamfered: bool = True, outerRadius: float = 0,
+                       height: float = None) -> MeshShell:
+    # all generations of a coupon share their length and pitch, so they are meshed on the same grid in one batch.
+    # male threads are solid shafts, female threads are tubes of `outerRadius` around the threaded hole
+    height = geometries[0].getLength() if height is None else height
+    segmentCount = resolution.segmentsPerTurn
+    rowCount = max(1, math.ceil(height * resolution.rowsPerPitch / geometries[0].getPitch()))
+    theta = numpy.arange(segmentCount) * (2 * math.pi / segmentCount)
+    z = numpy.linspace(0, height, rowCount + 1)
+    radii = getThreadRadii(geometries, theta, z)
+    if isMale and isChamfered:
+        minorX, majorX, minorZ, majorZ = [_column(values) for values in
+                                          zip(*[geometry.getChamferTriangle() for geometry in geometries])]
+        chamferRadii = majorX - numpy.maximum(0, z[None, :, None] - minorZ) * (majorX - minorX) / (majorZ - minorZ)
+        radii = numpy.maximum(numpy.minimum(radii, chamferRadii), 1e-4)
+
+    cos, sin = numpy.cos(theta), numpy.sin(theta)
+    originX = _column([origin[0] for origin in origins])
+    originY = _column([origin[1] for origin in origins])
+    surface = numpy.stack((originX + radii * cos, originY + radii * sin,
+                           numpy.broadcast_to(z[None, :, None], radii.shape)), axis=-1)
+    surface = surface.reshape(len(geometries), -1, 3)
+    surfaceFaces = _createGridFaces(0, rowCount, segmentCount)
+    surfaceSize = surface.shape[1]
+    bottomRing = numpy.arange(segmentCount)
+    topRing = rowCount * segmentCount + bottomRing
+    if isMale:
+        centerShape = (len(geometries), 2)
+        centers = numpy.stack((numpy.broadcast_to(originX[:, :, 0], centerShape),
+                               numpy.broadcast_to(originY[:, :, 0], centerShape),
+                               numpy.broadcast_to(numpy.array([0, height]), centerShape)), axis=-1)
+        vertices = numpy.concatenate((surface, centers), axis=1)
+        faces = numpy.concatenate((surfaceFaces,
+                                   _createFanFaces(surfaceSize, bottomRing)[:, ::-1],
+                                   _createFanFaces(surfaceSize + 1, topRing)))
+    else:
+        outerBottom = numpy.stack((originX[:, 0] + outerRadius * cos, originY[:, 0] + outerRadius * sin,
+                                   numpy.zeros((len(geometries), segmentCount))), axis=-1)
+        outerTop = outerBottom + numpy.array([0, 0, height])
+        vertices = numpy.concatenate((surface, outerBottom, outerTop), axis=1)
+        faces = numpy.concatenate((surfaceFaces[:, ::-1],
+                                   _createGridFaces(surfaceSize, 1, segmentCount),
+                                   _createRingFaces(surfaceSize + bottomRing, bottomRing)[:, ::-1],
+                                   _createRingFaces(surfaceSize + segmentCount + bottomRing, topRing)))
+    # every generation repeats the same connectivity, shifted by the vertex count of one generation
+    blockSize = vertices.shape[1]
+    faces = (faces[None, :, :] + (numpy.arange(len(geometries)) * blockSize)[:, None, None]).reshape(-1, 3)
+    return MeshShell(vertices.reshape(-1, 3), faces)
+
+
+def createBoxShell(corner1: (float, float, float), corner2: (float, float, float)) -> MeshShell:
+    (x1, y1, z1), (x2, y2, z2) = corner1, corner2
+    vertices = numpy.array([[x1, y1, z1], [x2, y1, z1], [x2, y2, z1], [x1, y2, z1],
+                            [x1, y1, z2], [x2, y1, z2], [x2, y2, z2], [x1, y2, z2]], dtype=float)
+    faces = numpy.array([[0, 2, 1], [0, 3, 2], [4, 5, 6], [4, 6, 7], [0, 1, 5], [0, 5, 4],
+                         [1, 2, 6], [1, 6, 5], [2, 3, 7], [2, 7, 6], [3, 0, 4], [3, 4, 7]])
+    return MeshShell(vertices, faces)
+
+
+def getGenerationGeometry(parameters: CouponParameters, generationCount: int) -> ThreadGeometry:
+    majorDiameterTolerance, minorDiameterTolerance, notchWidthTolerance = getGenerationTolerances(
+        generationCount, parameters.majorDiameterStep, parameters.minorDiameterStep, parameters.notchWidthStep)
+    return ThreadGeometry(parameters.length,
+                          parameters.majorDiameter + majorDiameterTolerance,
+                          parameters.minorDiameter + minorDiameterTolerance,
+                          parameters.pitch,
+                          parameters.cutAngle,
+                          parameters.notchWidth + notchWidthTolerance)
+
+
+def iterCouponShells(parameters: CouponParameters, resolution: MeshResolution) -> Iterator[MeshShell]:
+    # one shell at a time, so writers can stream coupons of any size
+    yield createBoxShell(*getBaseCuboidCorners(parameters.majorDiameter, parameters.generationCount,
+                                               parameters.isMale))
+    for i in range(parameters.generationCount):
+        yield _createGenerationShells(parameters, resolution, [i])
+
+
+def createCouponMesh(parameters: CouponParameters, resolution: MeshResolution) -> MeshShell:
+    box = createBoxShell(*getBaseCuboidCorners(parameters.majorDiameter, parameters.generationCount,
+                                               parameters.isMale))
+    return mergeShells([box, _createGenerationShells(parameters, resolution, range(parameters.generationCount))])
+
+
+def mergeShells(shells: [MeshShell]) -> MeshShell:
+    offsets = numpy.cumsum([0] + [len(shell.vertices) for shell in shells[:-1]])
+    return MeshShell(numpy.concatenate([shell.vertices for shell in shells]),
+                     numpy.concatenate([shell.faces + offset for shell, offset in zip(shells, offsets)]))
+
+
+def transformShell(shell: MeshShell, matrix: [float]) -> MeshShell:
+    # `matrix` is a row major 4x4 matrix, as returned by Matrix3D.asArray
+    matrix = numpy.array(matrix, dtype=float).reshape(4, 4)
+    return MeshShell(shell.vertices @ matrix[:3, :3].T + matrix[:3, 3], shell.faces)
+
+
+def _createGenerationShells(parameters: CouponParameters, resolution: MeshResolution,
+                            generationIndices: [int]) -> MeshShell:
+    geometries = [getGenerationGeometry(parameters, i) for i in generationIndices]
+    origins = [(getGenerationOffset(parameters.majorDiameter, i), 0) for i in generationIndices]
+    if parameters.isMale:
+        return createThreadShells(geometries, origins, resolution, True)
+    cylinderDiameter, cylinderLength = getCylinderDimensions(parameters.majorDiameter, parameters.length)
+    return createThreadShells(geometries, origins, resolution, False, outerRadius=cylinderDiameter / 2,
+                              height=cylinderLength)
+
+
+def _column(values: [float]) -> numpy.ndarray:
+    return numpy.array(values, dtype=float)[:, None, None]
+
+
+def _createGridFaces(offset: int, rowCount: int, segmentCount: int) -> numpy.ndarray:
+    row, segment = numpy.meshgrid(numpy.arange(rowCount), numpy.arange(segmentCount), indexing='ij')
+    a = offset + row * segmentCount + segment
+    b = offset + row * segmentCount + (segment + 1) % segmentCount
+    c = b + segmentCount
+    d = a + segmentCount
+    return numpy.concatenate((numpy.stack((a, b, c), axis=-1).reshape(-1, 3),
+                              numpy.stack((a, c, d), axis=-1).reshape(-1, 3)))
+
+
+def _createFanFaces(center: int, ring: numpy.ndarray) -> numpy.ndarray:
+    return numpy.stack((numpy.full_like(ring, center), ring, numpy.roll(ring, -1)), axis=-1)
+
+
+def _createRingFaces(outerRing: numpy.ndarray, innerRing: numpy.ndarray) -> numpy.ndarray:
+    nextOuter, nextInner = numpy.roll(outerRing, -1), numpy.roll(innerRing, -1)
+    return numpy.concatenate((numpy.stack((outerRing, nextOuter, nextInner), axis=-1),
+                              numpy.stack((outerRing, nextInner, innerRing), axis=-1)))
@@ -0,0 +1,60 @@
+import math
+
+from .ThreadGeometry import ThreadGeometry
+
+# violations are reported in millimeters like the dialog, the geometry is in Fusion's internal centimeters
+_CM_TO_MM = 10
+
+
+class ThreadValidationError(ValueError):
+    def __init__(self, violations: [(int, str)]):
+        super().__init__('\n'.join('Generation {}: {}'.format(i, message) for i, message in violations))
+        self.violations = violations
+
+
+def getViolations(geometry: ThreadGeometry, isChamfered: bool) -> [str]:
+    # parameter combinations the features cannot be built from, found before any of them is created
+    if geometry.getLength() <= 0 or geometry.getMajorDiameter() <= 0 or geometry.getPitch() <= 0:
+        return ['length, major diameter and pitch must be positive']
+    violations = []
+    if geometry.getMinorDiameter() <= 0:
+        violations.append('minor diameter {} is not positive, the cut depth reaches past the thread axis'.format(
+            _format(geometry.getMinorDiameter())))
+    elif geometry.getMinorDiameter() >= geometry.getMajorDiameter():
+        violations.append('minor diameter {} is not less than the major diameter {}'.format(
+            _format(geometry.getMinorDiameter()), _format(geometry.getMajorDiameter())))
+    if geometry.getNotchWidth() < 0:
+        violations.append('notch width {} is negative'.format(_format(geometry.getNotchWidth())))
+    # at 90 degrees or more the notch flanks fold back, the protrusion width and helix start are meaningless
+    isCutAngleValid = 0 < geometry.getCutAngle() < math.pi / 2
+    if not isCutAngleValid:
+        violations.append('cut angle {:g} deg is not between 0 and 90 deg'.format(
+            round(math.degrees(geometry.getCutAngle()), 4)))
+    elif geometry.getProtrusionWidth() >= geometry.getPitch():
+        violations.append('protrusion width {} is not less than the pitch {}, neighbouring turns overlap'.format(
+            _format(geometry.getProtrusionWidth()), _format(geometry.getPitch())))
+    if geometry.getPitch() >= math.pi * geometry.getMajorDiameter():
+        violations.append('pitch {} is not less than the circumference {} at the major diameter'.format(
+            _format(geometry.getPitch()), _format(math.pi * geometry.getMajorDiameter())))
+    elif isCutAngleValid and geometry.getLength() <= geometry.getHelixStart():
+        violations.append('length {} leaves no room for the helix, which starts at {}'.format(
+            _format(geometry.getLength()), _format(geometry.getHelixStart())))
+    if isChamfered and not violations:
+        # the other corners lie outside the thread, so with valid diameters only these can flip over
+        minorX, majorX, minorZ, majorZ = geometry.getChamferTriangle()
+        if minorX <= 0 or minorZ <= 0:
+            violations.append('chamfer triangle inverts past the thread axis or start, the protrusion width {} is '
+                              'too large for the minor diameter and length'.format(
+                                  _format(geometry.getProtrusionWidth())))
+    return violations
+
+
+def validateGenerations(geometries: [(int, ThreadGeometry)], isChamfered: bool):
+    # every violation of every generation is reported at once
+    violations = [(i, message) for i, geometry in geometries for message in getViolations(geometry, isChamfered)]
+    if violations:
+        raise ThreadValidationError(violations)
+
+
+def _format(length: float) -> str:
+    return '{:g} mm'.format(round(length * _CM_TO_MM, 4))
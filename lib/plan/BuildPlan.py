@@ -0,0 +1,177 @@
+import json
+from collections import Counter
+from typing import NamedTuple
+
+# feature operations, replayed as the matching FeatureOperations
+JOIN = 'join'
+CUT = 'cut'
+NEW_BODY = 'newBody'
+
+# references to the construction planes of the component the plan is replayed into
+XY_PLANE = 'xYConstructionPlane'
+
+
+class OffsetPlane(NamedTuple):
+    id: int
+    plane: object
+    offset: float
+
+
+class PathPlane(NamedTuple):
+    # construction plane normal to a sketch curve at a relative position along it
+    id: int
+    path: int
+    distance: float
+
+
+class Sketch(NamedTuple):
+    id: int
+    plane: object
+
+
+class Line(NamedTuple):
+    id: int
+    sketch: int
+    start: tuple
+    end: tuple
+
+
+class Rectangle(NamedTuple):
+    id: int
+    sketch: int
+    corner1: tuple
+    corner2: tuple
+
+
+class Circle(NamedTuple):
+    id: int
+    sketch: int
+    center: tuple
+    radius: float
+
+
+class FittedSpline(NamedTuple):
+    id: int
+    sketch: int
+    points: tuple
+
+
+class RationalSpline(NamedTuple):
+    id: int
+    sketch: int
+    controlPoints: tuple
+    degree: int
+    knots: tuple
+    weights: tuple
+
+
+class Profile(NamedTuple):
+    id: int
+    sketch: int
+    index: int
+
+
+class Extrude(NamedTuple):
+    id: int
+    profile: int
+    distance: float
+    operation: str
+
+
+class Loft(NamedTuple):
+    id: int
+    profiles: tuple
+    centerLine: int
+    operation: str
+
+
+class Sweep(NamedTuple):
+    id: int
+    profile: int
+    path: int
+    operation: str
+
+
+class Revolve(NamedTuple):
+    id: int
+    profile: int
+    axis: int
+    operation: str
+
+
+_OPERATION_TYPES = {operationType.__name__: operationType for operationType in
+                    (OffsetPlane, PathPlane, Sketch, Line, Rectangle, Circle, FittedSpline, RationalSpline, Profile,
+                     Extrude, Loft, Sweep, Revolve)}
+# fields holding the ids of earlier operations, or the name of a component plane
+REFERENCE_FIELDS = {OffsetPlane: ('plane',), PathPlane: ('path',), Sketch: ('plane',), Line: ('sketch',),
+                    Rectangle: ('sketch',), Circle: ('sketch',), FittedSpline: ('sketch',),
+                    RationalSpline: ('sketch',), Profile: ('sketch',), Extrude: ('profile',),
+                    Loft: ('profiles', 'centerLine'), Sweep: ('profile', 'path'), Revolve: ('profile', 'axis')}
+CURVE_TYPES = (Line, Rectangle, Circle, FittedSpline, RationalSpline)
+FEATURE_TYPES = (Extrude, Loft, Sweep, Revolve)
+
+
+class BuildPlan:
+    # operations in replay order, every operation only references operations before it
+    def __init__(self, operations: list = None):
+        self._operations = [] if operations is None else list(operations)
+        self._nextId = max((operation.id for operation in self._operations), default=-1) + 1
+
+    def add(self, operationType, *args) -> int:
+        operationId = self._nextId
+        self._nextId += 1
+        self._operations.append(operationType(operationId, *args))
+        return operationId
+
+    def extend(self, plan: 'BuildPlan'):
+        # appends the operations of `plan` with new ids, references to component planes are kept
+        offset = self._nextId
+        self._operations += [remapOperation(operation, lambda reference: reference + offset, operation.id + offset)
+                             for operation in plan.getOperations()]
+        self._nextId += plan._nextId
+
+    def getOperations(self) -> list:
+        return self._operations
+
+    def getStatistics(self) -> Counter:
+        return Counter(type(operation).__name__ for operation in self._operations)
+
+    def getFeatureCount(self) -> int:
+        return sum(1 for operation in self._operations if isinstance(operation, FEATURE_TYPES))
+
+    def toJson(self, indent: int = None) -> str:
+        return json.dumps([dict(operation._asdict(), type=type(operation).__name__)
+                           for operation in self._operations], indent=indent)
+
+    @staticmethod
+    def fromJson(text: str) -> 'BuildPlan':
+        operations = []
+        for values in json.loads(text):
+            operationType = _OPERATION_TYPES[values.pop('type')]
+            operations.append(operationType(**{field: _toTuple(value) for field, value in values.items()}))
+        return BuildPlan(operations)
+
+
+def remapOperation(operation, remapReference, operationId: int = None):
+    # `remapReference` maps the id of a referenced operation, plane names are passed through unchanged
+    def remap(reference):
+        if isinstance(reference, tuple):
+            return tuple(remap(item) for item in reference)
+        return reference if isinstance(reference, str) else remapReference(reference)
+
+    changes = {}
+    for field in REFERENCE_FIELDS[type(operation)]:
+        reference = getattr(operation, field)
+        remappedReference = remap(reference)
+        if remappedReference != reference:
+            changes[field] = remappedReference
+    if operationId is not None:
+        changes['id'] = operationId
+    return operation._replace(**changes) if changes else operation
+
+
+def _toTuple(value):
+    # json has no tuples, points and id lists come back as lists
+    if isinstance(value, list):
+        return tuple(_toTuple(item) for item in value)
+    return value
@@ -0,0 +1,63 @@
+import math
+import sys
+import time
+
+from .PlanOptimizer import optimizePlan
+from .Planner import planCoupon
+from ..CouponSpec import CouponSpec
+from ..OutputMode import OutputMode
+from ..geometry.CouponArguments import MM_TO_CM, createCouponArgumentParser, parseCouponArguments
+from ..geometry.ThreadValidation import ThreadValidationError, validateGenerations
+from ..sketch.ThreadSpec import HelixBackend, ThreadEngine, ThreadSpec
+
+
+def main(argv: [str] = None) -> int:
+    parser = createCouponArgumentParser('Write the build plan of a thread tolerance coupon as JSON.')
+    parser.add_argument('output', help='output file, .json')
+    parser.add_argument('--helix-tolerance', type=float, default=0.02)
+    parser.add_argument('--helix-backend', choices=[backend.value for backend in HelixBackend],
+                        default=HelixBackend.FITTED_SPLINE.value)
+    parser.add_argument('--sections-per-turn', type=int, default=2)
+    parser.add_argument('--thread-engine', choices=[engine.value for engine in ThreadEngine],
+                        default=ThreadEngine.LOFT.value)
+    parser.add_argument('--workers', type=int, default=0, help='plan the generations in a process pool')
+    parser.add_argument('--no-optimize', action='store_true', help='keep duplicate planes, sketches and profiles')
+    args = parseCouponArguments(parser, argv)
+
+    threadSpec = ThreadSpec(args.length * MM_TO_CM,
+                            args.major_diameter * MM_TO_CM,
+                            args.minor_diameter * MM_TO_CM,
+                            args.pitch * MM_TO_CM,
+                            math.radians(args.cut_angle),
+                            args.notch_width * MM_TO_CM,
+                            args.helix_tolerance * MM_TO_CM,
+                            HelixBackend(args.helix_backend),
+                            args.sections_per_turn,
+                            ThreadEngine(args.thread_engine))
+    spec = CouponSpec(threadSpec,
+                      not args.female,
+                      args.generation_count,
+                      args.major_diameter_step * MM_TO_CM,
+                      args.minor_diameter_step * MM_TO_CM,
+                      args.notch_width_step * MM_TO_CM,
+                      OutputMode.PLANNED)
+    try:
+        validateGenerations([(i, generation.getGeometry()) for i, generation in enumerate(spec.generations)],
+                            spec.isMale and threadSpec.isChamfered)
+    except ThreadValidationError as error:
+        parser.error(str(error))
+    startTime = time.perf_counter()
+    plan = planCoupon(spec, workers=args.workers)
+    operationCount = len(plan.getOperations())
+    if not args.no_optimize:
+        plan = optimizePlan(plan)
+    with open(args.output, 'w') as planFile:
+        planFile.write(plan.toJson(indent=1))
+    print('{}: {} operations ({} before optimizing), {} features in {:.2f}s'.format(
+        args.output, len(plan.getOperations()), operationCount, plan.getFeatureCount(),
+        time.perf_counter() - startTime))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
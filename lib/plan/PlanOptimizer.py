@@ -0,0 +1,39 @@
+from collections import defaultdict
+
+from .BuildPlan import BuildPlan, OffsetPlane, PathPlane, Sketch, Profile, CURVE_TYPES, remapOperation
+
+
+def optimizePlan(plan: BuildPlan) -> BuildPlan:
+    # drops planes, sketches and profiles which repeat an earlier one, features are never merged.
+    # one pass in plan order, so a merged plane already makes the sketches on it comparable
+    curves = defaultdict(list)
+    for operation in plan.getOperations():
+        if isinstance(operation, CURVE_TYPES):
+            curves[operation.sketch].append(operation)
+    replacements = {}
+    keptIds = {}
+    operations = []
+    for operation in plan.getOperations():
+        if operation.id in replacements:
+            # curve of a merged sketch
+            continue
+        operation = remapOperation(operation, lambda reference: replacements.get(reference, reference))
+        key = _getKey(operation, curves)
+        if key is not None:
+            keptId = keptIds.setdefault(key, operation.id)
+            if keptId != operation.id:
+                replacements[operation.id] = keptId
+                for curve, keptCurve in zip(curves[operation.id], curves[keptId]):
+                    replacements[curve.id] = keptCurve.id
+                continue
+        operations.append(operation)
+    return BuildPlan(operations)
+
+
+def _getKey(operation, curves: dict):
+    # everything but the id, a sketch is compared with its curves
+    if isinstance(operation, (OffsetPlane, PathPlane, Profile)):
+        return (type(operation),) + tuple(operation[1:])
+    if isinstance(operation, Sketch):
+        return Sketch, operation.plane, tuple((type(curve),) + tuple(curve[2:]) for curve in curves[operation.id])
+    return None
@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .BuildPlan import BuildPlan, OffsetPlane, PathPlane, Sketch, Line, Rectangle, Circle, FittedSpline, \
+    RationalSpline, Profile, Extrude, Loft, Sweep, Revolve, JOIN, CUT, NEW_BODY, XY_PLANE
+from ..CouponSpec import CouponSpec
+from ..geometry.Helix import sampleHelix, getRationalHelix, getRationalHelixSegmentsPerTurn, getSectionPositions
+from ..geometry.ThreadGeometry import ThreadGeometry
+from ..sketch.ThreadSpec import HelixBackend, ThreadEngine, ThreadSpec
+
+
+def planCoupon(spec: CouponSpec, generationIndices: [int] = None, workers: int = 0) -> BuildPlan:
+    # the same features as the parametric coupon, with every generation planned on its own.
+    # generations are independent, with `workers` > 1 they are planned in a process pool
+    generationIndices = range(spec.generationCount) if generationIndices is None else generationIndices
+    jobs = [(spec.generations[i], (spec.getGenerationOffset(i), 0.0, 0.0), spec.isMale,
+             None if spec.isMale else spec.getCylinderDimensions()) for i in generationIndices]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            generationPlans = list(executor.map(_planGeneration, jobs))
+    else:
+        generationPlans = [_planGeneration(job) for job in jobs]
+
+    plan = BuildPlan()
+    planBaseCuboid(plan, *spec.getBaseCuboidCorners())
+    for generationPlan in generationPlans:
+        plan.extend(generationPlan)
+    return plan
+
+
+def planBaseCuboid(plan: BuildPlan, corner1: (float, float, float), corner2: (float, float, float)) -> int:
+    sketch = plan.add(Sketch, XY_PLANE)
+    plan.add(Rectangle, sketch, (corner1[0], corner1[1], 0.0), tuple(corner2))
+    return plan.add(Extrude, plan.add(Profile, sketch, 0), corner1[2], NEW_BODY)
+
+
+def planCylinder(plan: BuildPlan, center: (float, float, float), diameter: float, height: float) -> int:
+    sketch = plan.add(Sketch, XY_PLANE)
+    plan.add(Circle, sketch, center, diameter / 2)
+    return plan.add(Extrude, plan.add(Profile, sketch, 0), height, NEW_BODY)
+
+
+def planThread(plan: BuildPlan, spec: ThreadSpec, origin: (float, float, float), isMale: bool,
+               plane=XY_PLANE) -> int:
+    geometry = spec.getGeometry()
+    _planShaft(plan, spec, origin, plane, NEW_BODY if isMale else CUT)
+    spline = _planHelix(plan, spec, origin, plane)
+    operation = JOIN if isMale else CUT
+    if spec.threadEngine == ThreadEngine.SWEEP:
+        thread = plan.add(Sweep, _planNotchProfile(plan, geometry, spline, 0.0), spline, operation)
+    else:
+        positions = getSectionPositions(geometry.getHelixSpec(spec.helixTolerance), spec.sectionsPerTurn)
+        profiles = tuple(_planNotchProfile(plan, geometry, spline, position) for position in positions)
+        thread = plan.add(Loft, profiles, spline, operation)
+    if isMale and spec.isChamfered:
+        _planChamfer(plan, geometry, origin, plane)
+    return thread
+
+
+def _planGeneration(job) -> BuildPlan:
+    # module level, so it can be sent to a worker process
+    spec, origin, isMale, cylinderDimensions = job
+    plan = BuildPlan()
+    if cylinderDimensions is not None:
+        planCylinder(plan, origin, *cylinderDimensions)
+    planThread(plan, spec, origin, isMale)
+    return plan
+
+
+def _planSketchByPlane(plan: BuildPlan, plane) -> int:
+    return plan.add(Sketch, plan.add(OffsetPlane, plane, 0.0))
+
+
+def _planShaft(plan: BuildPlan, spec: ThreadSpec, origin: (float, float, float), plane, operation: str) -> int:
+    sketch = _planSketchByPlane(plan, plane)
+    plan.add(Circle, sketch, origin, spec.minorDiameter / 2)
+    return plan.add(Extrude, plan.add(Profile, sketch, 0), spec.length, operation)
+
+
+def _planHelix(plan: BuildPlan, spec: ThreadSpec, origin: (float, float, float), plane) -> int:
+    geometry = spec.getGeometry()
+    helixSpec = geometry.getHelixSpec(spec.helixTolerance)
+    x, y, z = origin
+    helixOrigin = (x, y, z + geometry.getHelixStart())
+    sketch = _planSketchByPlane(plan, plane)
+    if spec.helixBackend == HelixBackend.NURBS:
+        rationalHelix = getRationalHelix(helixSpec, getRationalHelixSegmentsPerTurn(helixSpec))
+        controlPoints = tuple(_translate(point, helixOrigin) for point in rationalHelix.controlPoints)
+        return plan.add(RationalSpline, sketch, controlPoints, rationalHelix.degree, tuple(rationalHelix.knots),
+                        tuple(rationalHelix.weights))
+    samples = sampleHelix(helixSpec, helixOrigin)
+    rows = samples.tolist() if hasattr(samples, 'tolist') else samples
+    return plan.add(FittedSpline, sketch, tuple(tuple(row) for row in rows))
+
+
+def _planNotchProfile(plan: BuildPlan, geometry: ThreadGeometry, spline: int, position: float) -> int:
+    sketch = plan.add(Sketch, plan.add(PathPlane, spline, position))
+    corners = [(x, y, 0.0) for x, y in geometry.getNotchProfile()]
+    for start, end in zip(corners, corners[1:] + corners[:1]):
+        plan.add(Line, sketch, start, end)
+    return plan.add(Profile, sketch, 0)
+
+
+def _planChamfer(plan: BuildPlan, geometry: ThreadGeometry, origin: (float, float, float), plane) -> int:
+    minorX, majorX, minorZ, majorZ = geometry.getChamferTriangle()
+    point1 = _translate((minorX, 0, majorZ), origin)
+    point2 = _translate((majorX, 0, majorZ), origin)
+    point3 = _translate((majorX, 0, minorZ), origin)
+
+    sketch = _planSketchByPlane(plan, plane)
+    plan.add(Line, sketch, point1, point2)
+    plan.add(Line, sketch, point2, point3)
+    plan.add(Line, sketch, point3, point1)
+    axis = plan.add(Line, sketch, _translate((0, 0, 0), origin), _translate((0, 0, 1), origin))
+    return plan.add(Revolve, plan.add(Profile, sketch, 0), axis, CUT)
+
+
+def _translate(point: (float, float, float), origin: (float, float, float)) -> (float, float, float):
+    return tuple(float(a + b) for a, b in zip(point, origin))
@@ -0,0 +1,72 @@
+from adsk.core import Point3D, Vector3D, OrientedBoundingBox3D, Matrix3D
+from adsk.fusion import Component, BRepBody, BaseFeature, TemporaryBRepManager, BooleanTypes
+
+from ..common.Common import getDesign
+
+
+def createTemporaryCylinder(bottom: Point3D, radius: float, height: float) -> BRepBody:
+    return createTemporaryCone(bottom, radius, height, radius)
+
+
+def createTemporaryCone(bottom: Point3D, bottomRadius: float, height: float, topRadius: float) -> BRepBody:
+    top = Point3D.create(bottom.x, bottom.y, bottom.z + height)
+    return TemporaryBRepManager.get().createCylinderOrCone(bottom, bottomRadius, top, topRadius)
+
+
+def createTemporaryBox(corner1: Point3D, corner2: Point3D) -> BRepBody:
+    center = Point3D.create((corner1.x + corner2.x) / 2, (corner1.y + corner2.y) / 2, (corner1.z + corner2.z) / 2)
+    box = OrientedBoundingBox3D.create(center, Vector3D.create(1, 0, 0), Vector3D.create(0, 1, 0),
+                                       abs(corner2.x - corner1.x), abs(corner2.y - corner1.y),
+                                       abs(corner2.z - corner1.z))
+    return TemporaryBRepManager.get().createBox(box)
+
+
+def unionBodies(target: BRepBody, tool: BRepBody):
+    TemporaryBRepManager.get().booleanOperation(target, tool, BooleanTypes.UnionBooleanType)
+
+
+def subtractBodies(target: BRepBody, tool: BRepBody):
+    TemporaryBRepManager.get().booleanOperation(target, tool, BooleanTypes.DifferenceBooleanType)
+
+
+def transformBody(body: BRepBody, transform: Matrix3D):
+    TemporaryBRepManager.get().transform(body, transform)
+
+
+def createTranslation(fromPoint: Point3D, toPoint: Point3D) -> Matrix3D:
+    matrix = Matrix3D.create()
+    matrix.translation = Vector3D.create(toPoint.x - fromPoint.x, toPoint.y - fromPoint.y, toPoint.z - fromPoint.z)
+    return matrix
+
+
+def copyBody(body: BRepBody) -> BRepBody:
+    return TemporaryBRepManager.get().copy(body)
+
+
+def removeTimelineItemsAfter(timelineIndex: int):
+    getDesign().timeline.markerPosition = timelineIndex
+    getDesign().timeline.deleteAllAfterMarker()
+
+
+def compactTimeline(component: Component, timelineIndex: int) -> BaseFeature:
+    # replaces the features after `timelineIndex` by one base feature holding copies of the component's bodies
+    bodies = [copyBody(component.bRepBodies.item(i)) for i in range(component.bRepBodies.count)]
+    removeTimelineItemsAfter(timelineIndex)
+    return commitBodies(component, bodies)
+
+
+def commitBodies(component: Component, bodies: [BRepBody]) -> BaseFeature:
+    baseFeature = component.features.baseFeatures.add()
+    baseFeature.startEdit()
+    for body in bodies:
+        component.bRepBodies.add(body, baseFeature)
+    baseFeature.finishEdit()
+    return baseFeature
+
+
+def commitMesh(component: Component, coordinates: [float], coordinateIndices: [int]) -> BaseFeature:
+    baseFeature = component.features.baseFeatures.add()
+    baseFeature.startEdit()
+    component.meshBodies.addByTriangleMeshData(coordinates, coordinateIndices, [], [])
+    baseFeature.finishEdit()
+    return baseFeature
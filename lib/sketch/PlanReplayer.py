@@ -0,0 +1,113 @@
+import math
+
+from adsk.core import Point3D, ValueInput, ObjectCollection, NurbsCurve3D
+from adsk.fusion import Component, FeatureOperations, SweepOrientationTypes
+
+from .SketchUtils import extrudeProfile
+from ..common.Progress import BuildProgress
+from ..plan.BuildPlan import BuildPlan, OffsetPlane, PathPlane, Sketch, Line, Rectangle, Circle, FittedSpline, \
+    RationalSpline, Profile, Extrude, Loft, Sweep, Revolve, JOIN, CUT, NEW_BODY, FEATURE_TYPES
+
+_FEATURE_OPERATIONS = {JOIN: FeatureOperations.JoinFeatureOperation,
+                       CUT: FeatureOperations.CutFeatureOperation,
+                       NEW_BODY: FeatureOperations.NewBodyFeatureOperation}
+
+
+class PlanReplayer:
+    # executes a build plan against the Fusion API, with the same calls ThreadFeature makes
+    def __init__(self, component: Component):
+        self._component = component
+        # operation id -> created Fusion object
+        self._objects = {}
+        self._replayers = {OffsetPlane: self._replayOffsetPlane, PathPlane: self._replayPathPlane,
+                           Sketch: self._replaySketch, Line: self._replayLine, Rectangle: self._replayRectangle,
+                           Circle: self._replayCircle, FittedSpline: self._replayFittedSpline,
+                           RationalSpline: self._replayRationalSpline, Profile: self._replayProfile,
+                           Extrude: self._replayExtrude, Loft: self._replayLoft, Sweep: self._replaySweep,
+                           Revolve: self._replayRevolve}
+
+    def replay(self, plan: BuildPlan, progress: BuildProgress = None):
+        # progress is reported per feature, the other operations are quick
+        featureCount = 0
+        if progress is not None:
+            progress.start(plan.getFeatureCount(), 'Feature')
+        for operation in plan.getOperations():
+            self._objects[operation.id] = self._replayers[type(operation)](operation)
+            if progress is not None and isinstance(operation, FEATURE_TYPES):
+                featureCount += 1
+                progress.step(featureCount)
+
+    def getObject(self, operationId: int):
+        return self._objects[operationId]
+
+    def _get(self, reference):
+        if isinstance(reference, str):
+            return getattr(self._component, reference)
+        return self._objects[reference]
+
+    def _replayOffsetPlane(self, operation: OffsetPlane):
+        planeInput = self._component.constructionPlanes.createInput()
+        planeInput.setByOffset(self._get(operation.plane), ValueInput.createByReal(operation.offset))
+        return self._component.constructionPlanes.add(planeInput)
+
+    def _replayPathPlane(self, operation: PathPlane):
+        planeInput = self._component.constructionPlanes.createInput()
+        planeInput.setByDistanceOnPath(self._get(operation.path), ValueInput.createByReal(operation.distance))
+        return self._component.constructionPlanes.add(planeInput)
+
+    def _replaySketch(self, operation: Sketch):
+        return self._component.sketches.add(self._get(operation.plane))
+
+    def _replayLine(self, operation: Line):
+        return self._get(operation.sketch).sketchCurves.sketchLines.addByTwoPoints(Point3D.create(*operation.start),
+                                                                                   Point3D.create(*operation.end))
+
+    def _replayRectangle(self, operation: Rectangle):
+        return self._get(operation.sketch).sketchCurves.sketchLines.addTwoPointRectangle(
+            Point3D.create(*operation.corner1), Point3D.create(*operation.corner2))
+
+    def _replayCircle(self, operation: Circle):
+        return self._get(operation.sketch).sketchCurves.sketchCircles.addByCenterRadius(
+            Point3D.create(*operation.center), operation.radius)
+
+    def _replayFittedSpline(self, operation: FittedSpline):
+        points = ObjectCollection.create()
+        for x, y, z in operation.points:
+            points.add(Point3D.create(x, y, z))
+        return self._get(operation.sketch).sketchCurves.sketchFittedSplines.add(points)
+
+    def _replayRationalSpline(self, operation: RationalSpline):
+        controlPoints = [Point3D.create(x, y, z) for x, y, z in operation.controlPoints]
+        curve = NurbsCurve3D.createRational(controlPoints, operation.degree, list(operation.knots),
+                                            list(operation.weights), False)
+        return self._get(operation.sketch).sketchCurves.sketchFixedSplines.addByNurbsCurve(curve)
+
+    def _replayProfile(self, operation: Profile):
+        return self._get(operation.sketch).profiles.item(operation.index)
+
+    def _replayExtrude(self, operation: Extrude):
+        return extrudeProfile(self._component, self._get(operation.profile), operation.distance,
+                              _FEATURE_OPERATIONS[operation.operation])
+
+    def _replayLoft(self, operation: Loft):
+        loftFeatures = self._component.features.loftFeatures
+        loftInput = loftFeatures.createInput(_FEATURE_OPERATIONS[operation.operation])
+        for profile in operation.profiles:
+            loftInput.loftSections.add(self._get(profile))
+        loftInput.centerLineOrRails.addCenterLine(self._get(operation.centerLine))
+        return loftFeatures.add(loftInput)
+
+    def _replaySweep(self, operation: Sweep):
+        sweepFeatures = self._component.features.sweepFeatures
+        path = self._component.features.createPath(self._get(operation.path), False)
+        sweepInput = sweepFeatures.createInput(self._get(operation.profile), path,
+                                               _FEATURE_OPERATIONS[operation.operation])
+        sweepInput.orientation = SweepOrientationTypes.PerpendicularOrientationType
+        return sweepFeatures.add(sweepInput)
+
+    def _replayRevolve(self, operation: Revolve):
+        revolveFeatures = self._component.features.revolveFeatures
+        revolveInput = revolveFeatures.createInput(self._get(operation.profile), self._get(operation.axis),
+                                                   _FEATURE_OPERATIONS[operation.operation])
+        revolveInput.setAngleExtent(False, ValueInput.createByReal(math.pi * 2))
+        return revolveFeatures.add(revolveInput)
@@ -1,11 +1,13 @@
-from adsk.core import Point3D, ValueInput, Matrix3D
-from adsk.fusion import Sketch, Component, Profile, FeatureOperations, ExtrudeFeature
+from contextlib import contextmanager
 
-from ..common.Common import design
+from adsk.core import Point3D, ValueInput, Matrix3D, ObjectCollection
+from adsk.fusion import Sketch, Component, Profile, FeatureOperations, ExtrudeFeature, BRepBody, CombineFeature
+
+from ..common.Common import getDesign
 
 
 def createNewComponent() -> Component:
-    allOccurrences = design.rootComponent.occurrences
+    allOccurrences = getDesign().rootComponent.occurrences
     newOccurrence = allOccurrences.addNewComponent(Matrix3D.create())
     if newOccurrence.component is None:
         raise ('New component failed to create', 'New Component Failed')
@@ -26,6 +28,57 @@ def createCylinder(component: Component, center: Point3D, diameter: float, heigh
     extrudeProfile(component, profile, height)
 
 
+def createCylinders(component: Component, centers: [Point3D], diameter: float, height: float,
+                    operation=FeatureOperations.NewBodyFeatureOperation,
+                    isComputeDeferred: bool = False) -> ExtrudeFeature:
+    # all cylinders in one sketch and one extrude feature
+    sketch = createXYSketch(component)
+    with deferCompute(sketch, isComputeDeferred):
+        for center in centers:
+            sketch.sketchCurves.sketchCircles.addByCenterRadius(center, diameter / 2)
+    profiles = ObjectCollection.create()
+    for i in range(sketch.profiles.count):
+        profiles.add(sketch.profiles.item(i))
+    return extrudeProfile(component, profiles, height, operation)
+
+
+def combineBodies(component: Component, target: BRepBody, tools: [BRepBody],
+                  operation=FeatureOperations.JoinFeatureOperation) -> CombineFeature:
+    combineFeatures = component.features.combineFeatures
+    toolBodies = ObjectCollection.create()
+    for tool in tools:
+        toolBodies.add(tool)
+    combineInput = combineFeatures.createInput(target, toolBodies)
+    combineInput.operation = operation
+    combineInput.isKeepToolBodies = False
+    return combineFeatures.add(combineInput)
+
+
+def copyBodyByFeatures(component: Component, body: BRepBody, transform: Matrix3D) -> BRepBody:
+    # a copy/paste and a move feature, the copy is rebuilt with the body it was copied from
+    copyFeature = component.features.copyPasteBodies.add(body)
+    bodyCopy = copyFeature.bodies.item(0)
+    bodies = ObjectCollection.create()
+    bodies.add(bodyCopy)
+    moveFeatures = component.features.moveFeatures
+    moveInput = moveFeatures.createInput2(bodies)
+    moveInput.defineAsFreeMove(transform)
+    moveFeatures.add(moveInput)
+    return bodyCopy
+
+
+@contextmanager
+def deferCompute(sketch: Sketch, isComputeDeferred: bool = True):
+    # the sketch is solved once when the block ends instead of after every curve, profiles are only valid after it
+    if isComputeDeferred:
+        sketch.isComputeDeferred = True
+    try:
+        yield sketch
+    finally:
+        if isComputeDeferred:
+            sketch.isComputeDeferred = False
+
+
 def drawCircle(sketch: Sketch, center: Point3D, diameter: float) -> Profile:
     sketch.sketchCurves.sketchCircles.addByCenterRadius(center, diameter / 2)
     return sketch.profiles.item(0)
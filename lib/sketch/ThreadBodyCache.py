@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+from adsk.core import Point3D, Matrix3D, Vector3D
+from adsk.fusion import BRepBody, TemporaryBRepManager
+
+from .BRepUtils import copyBody, transformBody
+
+# bump whenever a change to the thread geometry invalidates previously cached bodies
+ENGINE_VERSION = 1
+
+
+class ThreadBodyCache:
+    def __init__(self,
+                 folder: str = os.path.join(os.path.expanduser('~'), '.ThreadGenerator', 'bodyCache'),
+                 maxSize: int = 256 * 1024 * 1024):
+        self._folder = folder
+        self._maxSize = maxSize
+        # counted in memory for the lifetime of the cache object, the folder is only scanned once and again when
+        # it has to be evicted
+        self._statistics = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._bodyCount = None
+        self._size = None
+
+    @staticmethod
+    def getKey(parameters: tuple) -> str:
+        return hashlib.sha256(repr((ENGINE_VERSION, parameters)).encode('utf-8')).hexdigest()
+
+    def load(self, key: str, origin: Point3D) -> BRepBody:
+        path = self._getPath(key)
+        if not os.path.isfile(path):
+            self._statistics['misses'] += 1
+            return None
+        # touch the file so eviction drops the least recently used bodies first
+        os.utime(path)
+        self._statistics['hits'] += 1
+        body = TemporaryBRepManager.get().createFromFile(path).item(0)
+        transformBody(body, self._getTranslation(origin, 1))
+        return body
+
+    def store(self, key: str, body: BRepBody, origin: Point3D):
+        self._scan()
+        os.makedirs(self._folder, exist_ok=True)
+        path = self._getPath(key)
+        if os.path.isfile(path):
+            self._bodyCount -= 1
+            self._size -= os.path.getsize(path)
+        # bodies are cached relative to their origin, so they can be placed anywhere on a hit
+        body = copyBody(body)
+        transformBody(body, self._getTranslation(origin, -1))
+        TemporaryBRepManager.get().exportToFile([body], path)
+        if os.path.isfile(path):
+            self._bodyCount += 1
+            self._size += os.path.getsize(path)
+        if self._size > self._maxSize:
+            self._evict()
+
+    def getStatistics(self) -> dict:
+        self._scan()
+        return dict(self._statistics, bodies=self._bodyCount, size=self._size)
+
+    def clear(self):
+        for path in self._getBodyFiles():
+            os.remove(path)
+        self._statistics = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._bodyCount = 0
+        self._size = 0
+
+    def _scan(self):
+        if self._size is None:
+            bodyFiles = self._getBodyFiles()
+            self._bodyCount = len(bodyFiles)
+            self._size = sum(os.path.getsize(path) for path in bodyFiles)
+
+    def _evict(self):
+        for path in sorted(self._getBodyFiles(), key=os.path.getmtime):
+            if self._size <= self._maxSize:
+                break
+            self._bodyCount -= 1
+            self._size -= os.path.getsize(path)
+            os.remove(path)
+            self._statistics['evictions'] += 1
+
+    def _getBodyFiles(self) -> [str]:
+        if not os.path.isdir(self._folder):
+            return []
+        return [os.path.join(self._folder, name) for name in os.listdir(self._folder) if name.endswith('.smt')]
+
+    def _getPath(self, key: str) -> str:
+        return os.path.join(self._folder, key + '.smt')
+
+    @staticmethod
+    def _getTranslation(origin: Point3D, direction: int) -> Matrix3D:
+        translation = Matrix3D.create()
+        translation.translation = Vector3D.create(origin.x * direction, origin.y * direction, origin.z * direction)
+        return translation
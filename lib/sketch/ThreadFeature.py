@@ -1,146 +1,288 @@
 import math
 
-from adsk.core import Point3D, ValueInput, ObjectCollection
-from adsk.fusion import Component, FeatureOperations, SketchFittedSpline, ConstructionPlane, Profile
+from adsk.core import Point3D, ValueInput, ObjectCollection, NurbsCurve3D, Matrix3D
+from adsk.fusion import Component, FeatureOperations, SketchCurve, ConstructionPlane, Profile, SweepOrientationTypes, \
+    BRepBody, Feature
 
-from .SketchUtils import createSketchByPlane, drawCircle, extrudeProfile, createRelativePoint
+from .BRepUtils import createTemporaryCylinder, createTemporaryCone, unionBodies, subtractBodies, copyBody, \
+    transformBody
+from .SketchUtils import createSketchByPlane, drawCircle, extrudeProfile, createRelativePoint, deferCompute, \
+    combineBodies
+from .ThreadSpec import HelixBackend, ThreadEngine, ThreadSpec
+from ..common.Instrumentation import instrumentation
+from ..geometry.ThreadGeometry import ThreadGeometry
+from ..geometry.Helix import HelixSpec, sampleHelix, sampleHelixes, getHelixSteps, getHelixDeviation, \
+    getRationalHelix, getRationalHelixSegmentsPerTurn, getRationalHelixDeviation, getSectionPositions
 
 
 class ThreadFeature:
-    def __init__(self,
-                 component: Component,
-                 origin: Point3D,
-                 plane,
-                 length: float,
-                 majorDiameter: float,
-                 minorDiameter: float,
-                 pitch: float,
-                 cutAngle: float,
-                 notchWidth: float):
+    def __init__(self, component: Component, origin: Point3D, plane, spec: ThreadSpec,
+                 isComputeDeferred: bool = False):
         self._component = component
         self._plane = plane
         self._origin = origin
-        self._length = length
-        self._pitch = pitch
-        self._majorDiameter = majorDiameter
-        self._minorDiameter = minorDiameter
-        self._cutAngle = cutAngle
-        self._notchWidth = notchWidth
-        self._cutDepth = (self._majorDiameter - self._minorDiameter) / 2
-        self._protrusionWidth = self._notchWidth + (self._cutDepth * math.tan(self._cutAngle) * 2)
-
-    def createMaleThread(self):
-        self._createShaft()
+        self._spec = spec
+        self._length = spec.length
+        self._pitch = spec.pitch
+        self._majorDiameter = spec.majorDiameter
+        self._minorDiameter = spec.minorDiameter
+        self._cutAngle = spec.cutAngle
+        self._notchWidth = spec.notchWidth
+        self._helixTolerance = spec.helixTolerance
+        self._helixBackend = spec.helixBackend
+        self._sectionsPerTurn = spec.sectionsPerTurn
+        self._threadEngine = spec.threadEngine
+        self._isChamfered = spec.isChamfered
+        self._geometry = spec.getGeometry()
+        self._cutDepth = self._geometry.getCutDepth()
+        self._protrusionWidth = self._geometry.getProtrusionWidth()
+        self._helixSamples = None
+        self._isComputeDeferred = isComputeDeferred
+
+    def getGeometry(self) -> ThreadGeometry:
+        return self._geometry
+
+    def isChamfered(self) -> bool:
+        return self._isChamfered
+
+    def getSpec(self) -> ThreadSpec:
+        return self._spec
+
+    def getFingerprint(self) -> tuple:
+        return self._origin.x, self._origin.y, self._origin.z, self._spec
+
+    def getHelixReport(self) -> (int, float):
+        helix, length = self._getHelixCurve()
+        spec = helix.getSpec(length)
+        if self._helixBackend == HelixBackend.NURBS:
+            segmentsPerTurn = getRationalHelixSegmentsPerTurn(spec)
+            controlPointCount = len(getRationalHelix(spec, segmentsPerTurn).controlPoints)
+            return controlPointCount, getRationalHelixDeviation(spec, segmentsPerTurn)
+        return getHelixSteps(spec), getHelixDeviation(spec)
+
+    def getSectionCount(self) -> int:
+        if self._threadEngine == ThreadEngine.SWEEP:
+            return 1
+        return len(self._getSectionPositions())
+
+    def _getSectionPositions(self) -> [float]:
+        helix, length = self._getHelixCurve()
+        return getSectionPositions(helix.getSpec(length), self._sectionsPerTurn)
+
+    @staticmethod
+    def precomputeHelixes(threadFeatures: ['ThreadFeature']):
+        # sample the helixes of all generations in one batch before any of them is built
+        helixes = [threadFeature._getHelixCurve() for threadFeature in threadFeatures]
+        specs = [helix.getSpec(height) for helix, height in helixes]
+        origins = [helix.getOrigin() for helix, height in helixes]
+        for threadFeature, samples in zip(threadFeatures, sampleHelixes(specs, origins)):
+            threadFeature._helixSamples = samples
+
+    def createMaleThread(self) -> Feature:
+        # the shaft feature, its body carries the thread
+        shaft = self._createShaft()
         spline = self._createHelixSpline()
-        notchProfiles = self._createNotchProfilesAlongSpline(spline)
-        self._createLoftAlongSpline(notchProfiles, spline, FeatureOperations.JoinFeatureOperation)
-        self._createChamfer()
+        self._createThreadAlongSpline(spline, FeatureOperations.JoinFeatureOperation)
+        if self._isChamfered:
+            self._createChamfer()
+        return shaft
 
     # TODO: female chamfer
     def createFemaleThread(self):
         self._createHole()
         spline = self._createHelixSpline()
-        notchProfiles = self._createNotchProfilesAlongSpline(spline)
-        self._createLoftAlongSpline(notchProfiles, spline, FeatureOperations.CutFeatureOperation)
+        self._createThreadAlongSpline(spline, FeatureOperations.CutFeatureOperation)
+
+    def createMaleThreadTools(self) -> ([Feature], [Feature]):
+        # new bodies only, the caller joins and cuts the tools of all threads with one combine feature per target
+        shaft = self._createShaft()
+        spline = self._createHelixSpline()
+        thread = self._createThreadAlongSpline(spline, FeatureOperations.NewBodyFeatureOperation)
+        cutFeatures = [self._createChamfer(FeatureOperations.NewBodyFeatureOperation)] if self._isChamfered else []
+        return [shaft, thread], cutFeatures
+
+    def createFemaleThreadTools(self) -> [Feature]:
+        hole = self._createHole(FeatureOperations.NewBodyFeatureOperation)
+        spline = self._createHelixSpline()
+        return [hole, self._createThreadAlongSpline(spline, FeatureOperations.NewBodyFeatureOperation)]
+
+    def createFemaleThreadTool(self) -> BRepBody:
+        # hole and thread joined into one new body, which the caller cuts from its targets
+        hole, thread = self.createFemaleThreadTools()
+        combineBodies(self._component, hole.bodies.item(0), [thread.bodies.item(0)])
+        return hole.bodies.item(0)
 
-    def _createShaft(self):
+    def createMaleThreadBody(self) -> BRepBody:
+        # temporary body, the helper features of the thread are left in the timeline for the caller to remove
+        threadBody, transform = self._createTemporaryThreadBody()
+        shaft = createTemporaryCylinder(self._origin, self._minorDiameter / 2, self._length)
+        transformBody(shaft, transform)
+        unionBodies(shaft, threadBody)
+        if self._isChamfered:
+            subtractBodies(shaft, self._createTemporaryChamferTool(transform))
+        return shaft
+
+    def cutFemaleThreadBody(self, target: BRepBody):
+        subtractBodies(target, self.createFemaleThreadToolBody())
+
+    def createFemaleThreadToolBody(self) -> BRepBody:
+        # temporary body of the material a female thread removes, hole and thread in one
+        threadBody, transform = self._createTemporaryThreadBody()
+        hole = createTemporaryCylinder(self._origin, self._minorDiameter / 2, self._length)
+        transformBody(hole, transform)
+        unionBodies(hole, threadBody)
+        return hole
+
+    @instrumentation.timed('chamfer')
+    def _createTemporaryChamferTool(self, transform: Matrix3D) -> BRepBody:
+        minorX, majorX, minorZ, majorZ = self._geometry.getChamferTriangle()
+        chamferTool = createTemporaryCylinder(createRelativePoint(self._origin, 0, 0, minorZ), majorX, majorZ - minorZ)
+        subtractBodies(chamferTool, createTemporaryCone(createRelativePoint(self._origin, 0, 0, minorZ), majorX,
+                                                        majorZ - minorZ, max(minorX, 0.001)))
+        transformBody(chamferTool, transform)
+        return chamferTool
+
+    def _createTemporaryThreadBody(self) -> (BRepBody, Matrix3D):
+        spline = self._createHelixSpline()
+        feature = self._createThreadAlongSpline(spline, FeatureOperations.NewBodyFeatureOperation)
+        return copyBody(feature.bodies.item(0)), spline.parentSketch.transform
+
+    @instrumentation.timed('shaft')
+    def _createShaft(self) -> Feature:
         sketch = createSketchByPlane(self._component, self._plane)
         profile = drawCircle(sketch, self._origin, self._minorDiameter)
-        extrudeProfile(self._component, profile, self._length, FeatureOperations.NewBodyFeatureOperation)
+        return extrudeProfile(self._component, profile, self._length, FeatureOperations.NewBodyFeatureOperation)
 
-    def _createHole(self):
+    @instrumentation.timed('hole')
+    def _createHole(self, operation: FeatureOperations = FeatureOperations.CutFeatureOperation) -> Feature:
         sketch = createSketchByPlane(self._component, self._plane)
         profile = drawCircle(sketch, self._origin, self._minorDiameter)
-        extrudeProfile(self._component, profile, self._length, FeatureOperations.CutFeatureOperation)
+        return extrudeProfile(self._component, profile, self._length, operation)
 
-    def _createHelixSpline(self) -> SketchFittedSpline:
-        helixAngle = math.asin(self._pitch / (math.pi * self._majorDiameter))
+    def _getHelixCurve(self) -> ('_HelixCurve', float):
         origin = self._origin.copy()
-        origin.z = origin.z + (self._protrusionWidth / 2)
-        length = self._length - (self._protrusionWidth / 2)
-        helixPoints = _HelixCurve(self._majorDiameter / 2, helixAngle, origin).getPoints(length)
+        origin.z = origin.z + self._geometry.getHelixStart()
+        spec = self._geometry.getHelixSpec(self._helixTolerance)
+        return _HelixCurve(self._majorDiameter / 2, self._geometry.getHelixAngle(), origin, self._helixTolerance), \
+            spec.height
+
+    @instrumentation.timed('helix')
+    def _createHelixSpline(self) -> SketchCurve:
+        if self._helixBackend == HelixBackend.NURBS:
+            helix, length = self._getHelixCurve()
+            sketch = createSketchByPlane(self._component, self._plane)
+            return sketch.sketchCurves.sketchFixedSplines.addByNurbsCurve(helix.getNurbsCurve(length))
+        if self._helixSamples is None:
+            helix, length = self._getHelixCurve()
+            helixPoints = helix.getPoints(length)
+        else:
+            helixPoints = _HelixCurve.toPointCollection(self._helixSamples)
         sketch = createSketchByPlane(self._component, self._plane)
         return sketch.sketchCurves.sketchFittedSplines.add(helixPoints)
 
-    def _createNotchProfilesAlongSpline(self, spline: SketchFittedSpline):
+    def _createThreadAlongSpline(self, spline: SketchCurve, operation: FeatureOperations) -> Feature:
+        if self._threadEngine == ThreadEngine.SWEEP:
+            return self._createSweepAlongSpline(spline, operation)
+        notchProfiles = self._createNotchProfilesAlongSpline(spline)
+        return self._createLoftAlongSpline(notchProfiles, spline, operation)
+
+    @instrumentation.timed('notchProfiles')
+    def _createNotchProfilesAlongSpline(self, spline: SketchCurve):
         profiles = []
-        pointIndices = [i for i in range(0, spline.fitPoints.count, 10)]
-        pointIndices.append(spline.fitPoints.count - 1)
-        for i in pointIndices:
+        for position in self._getSectionPositions():
             planeInput = self._component.constructionPlanes.createInput()
-            planeInput.setByDistanceOnPath(spline, ValueInput.createByReal(i / (spline.fitPoints.count - 1)))
+            planeInput.setByDistanceOnPath(spline, ValueInput.createByReal(position))
             plane = self._component.constructionPlanes.add(planeInput)
             notchProfile = self._createThreadNotchProfile(plane)
             profiles.append(notchProfile)
         return profiles
 
-    def _createLoftAlongSpline(self, profiles, spline: SketchFittedSpline, operation: FeatureOperations):
+    @instrumentation.timed('loft')
+    def _createLoftAlongSpline(self, profiles, spline: SketchCurve, operation: FeatureOperations) -> Feature:
         loftFeatures = self._component.features.loftFeatures
         loftInput = loftFeatures.createInput(operation)
         for profile in profiles:
             loftInput.loftSections.add(profile)
         loftInput.centerLineOrRails.addCenterLine(spline)
-        loftFeatures.add(loftInput)
+        return loftFeatures.add(loftInput)
+
+    @instrumentation.timed('sweep')
+    def _createSweepAlongSpline(self, spline: SketchCurve, operation: FeatureOperations) -> Feature:
+        # a single notch profile at the start of the helix, kept perpendicular to it along the whole sweep
+        planeInput = self._component.constructionPlanes.createInput()
+        planeInput.setByDistanceOnPath(spline, ValueInput.createByReal(0))
+        plane = self._component.constructionPlanes.add(planeInput)
+        profile = self._createThreadNotchProfile(plane)
+
+        sweepFeatures = self._component.features.sweepFeatures
+        path = self._component.features.createPath(spline, False)
+        sweepInput = sweepFeatures.createInput(profile, path, operation)
+        sweepInput.orientation = SweepOrientationTypes.PerpendicularOrientationType
+        return sweepFeatures.add(sweepInput)
 
     def _createThreadNotchProfile(self, plane: ConstructionPlane) -> Profile:
-        point1 = Point3D.create(0, self._notchWidth / 2, 0)
-        point2 = Point3D.create(self._cutDepth + 0.001, self._protrusionWidth / 2, 0)
-        point3 = Point3D.create(self._cutDepth + 0.001, -self._protrusionWidth / 2, 0)
-        point4 = Point3D.create(0, -self._notchWidth / 2, 0)
+        point1, point2, point3, point4 = [Point3D.create(x, y, 0) for x, y in self._geometry.getNotchProfile()]
 
         sketch = self._component.sketches.add(plane)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point1, point2)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point2, point3)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point3, point4)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point4, point1)
+        with deferCompute(sketch, self._isComputeDeferred):
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point1, point2)
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point2, point3)
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point3, point4)
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point4, point1)
         return sketch.profiles.item(0)
 
-    def _createChamfer(self):
-        # overshoot to compensate for small rounding errors in helix calculations
-        overshoot = 0.01
-        minorX = self._minorDiameter / 2 - self._protrusionWidth - overshoot
-        majorX = self._majorDiameter / 2 + overshoot
-        minorZ = self._length - self._protrusionWidth - overshoot
-        majorZ = self._length + self._cutDepth + overshoot
+    @instrumentation.timed('chamfer')
+    def _createChamfer(self, operation: FeatureOperations = FeatureOperations.CutFeatureOperation) -> Feature:
+        minorX, majorX, minorZ, majorZ = self._geometry.getChamferTriangle()
         point1 = createRelativePoint(self._origin, minorX, 0, majorZ)
         point2 = createRelativePoint(self._origin, majorX, 0, majorZ)
         point3 = createRelativePoint(self._origin, majorX, 0, minorZ)
 
         sketch = createSketchByPlane(self._component, self._plane)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point1, point2)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point2, point3)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(point3, point1)
+        with deferCompute(sketch, self._isComputeDeferred):
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point1, point2)
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point2, point3)
+            sketch.sketchCurves.sketchLines.addByTwoPoints(point3, point1)
 
-        axisPoint1 = createRelativePoint(self._origin, 0, 0, 0)
-        axisPoint2 = createRelativePoint(self._origin, 0, 0, 1)
-        axis = sketch.sketchCurves.sketchLines.addByTwoPoints(axisPoint1, axisPoint2)
+            axisPoint1 = createRelativePoint(self._origin, 0, 0, 0)
+            axisPoint2 = createRelativePoint(self._origin, 0, 0, 1)
+            axis = sketch.sketchCurves.sketchLines.addByTwoPoints(axisPoint1, axisPoint2)
         profile = sketch.profiles.item(0)
 
         revolveFeatures = self._component.features.revolveFeatures
-        revolveInput = revolveFeatures.createInput(profile, axis, FeatureOperations.CutFeatureOperation)
+        revolveInput = revolveFeatures.createInput(profile, axis, operation)
         revolveInput.setAngleExtent(False, ValueInput.createByReal(math.pi * 2))
-        revolveFeatures.add(revolveInput)
+        return revolveFeatures.add(revolveInput)
 
 
 class _HelixCurve:
-    def __init__(self, radius, angle, origin: Point3D):
+    def __init__(self, radius, angle, origin: Point3D, tolerance: float):
         self._radius = radius
         self._c = math.tan(angle) * self._radius
         self._origin = origin
+        self._tolerance = tolerance
+
+    def getSpec(self, height) -> HelixSpec:
+        return HelixSpec(self._radius, self._c, height, self._tolerance)
 
-    def _getPoint(self, t) -> Point3D:
-        x = self._radius * math.cos(t)
-        y = self._radius * math.sin(t)
-        z = self._c * t
-        return Point3D.create(self._origin.x + x, self._origin.y + y, self._origin.z + z)
+    def getOrigin(self) -> (float, float, float):
+        return self._origin.x, self._origin.y, self._origin.z
+
+    def getNurbsCurve(self, height) -> NurbsCurve3D:
+        spec = self.getSpec(height)
+        rationalHelix = getRationalHelix(spec, getRationalHelixSegmentsPerTurn(spec))
+        x, y, z = self.getOrigin()
+        controlPoints = [Point3D.create(x + px, y + py, z + pz) for px, py, pz in rationalHelix.controlPoints]
+        return NurbsCurve3D.createRational(controlPoints, rationalHelix.degree, rationalHelix.knots,
+                                           rationalHelix.weights, False)
 
     def getPoints(self, height) -> ObjectCollection:
-        tRange = height / self._c
-        pointsCollection = ObjectCollection.create()
-        steps = int(3 * tRange / math.pi * 2)
-        step = 1.0 / (steps - 1)
+        return _HelixCurve.toPointCollection(sampleHelix(self.getSpec(height), self.getOrigin()))
 
-        for i in range(0, steps):
-            t = tRange * step * i
-            pointsCollection.add(self._getPoint(t))
+    @staticmethod
+    def toPointCollection(samples) -> ObjectCollection:
+        pointsCollection = ObjectCollection.create()
+        rows = samples.tolist() if hasattr(samples, 'tolist') else samples
+        for x, y, z in rows:
+            pointsCollection.add(Point3D.create(x, y, z))
         return pointsCollection
@@ -0,0 +1,87 @@
+import json
+from enum import Enum
+
+from ..geometry.ThreadGeometry import ThreadGeometry
+
+
+class HelixBackend(Enum):
+    FITTED_SPLINE = 'Fitted Spline'
+    NURBS = 'NURBS'
+
+
+class ThreadEngine(Enum):
+    LOFT = 'Loft'
+    SWEEP = 'Sweep'
+
+
+class FrozenSpec:
+    # immutable value object, equal and hashable by its `_fields`
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, *args, **kwargs):
+        values = dict(zip(self._fields, args), **kwargs)
+        for field in self._fields:
+            object.__setattr__(self, field, values[field])
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.getKey() == other.getKey()
+
+    def __hash__(self):
+        return hash(self.getKey())
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__,
+                               ', '.join('{}={!r}'.format(field, getattr(self, field)) for field in self._fields))
+
+    def __reduce__(self):
+        # pickled by its fields, the default would restore the slots through the immutable __setattr__
+        return type(self), self.getKey()
+
+    def getKey(self) -> tuple:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def replace(self, **changes) -> 'FrozenSpec':
+        return type(self)(**dict(zip(self._fields, self.getKey()), **changes))
+
+
+class ThreadSpec(FrozenSpec):
+    # everything that shapes one thread, independent of where it is placed. lengths are in internal units
+    _fields = ('length', 'majorDiameter', 'minorDiameter', 'pitch', 'cutAngle', 'notchWidth', 'helixTolerance',
+               'helixBackend', 'sectionsPerTurn', 'threadEngine', 'isChamfered')
+    __slots__ = _fields + ('_geometry',)
+
+    def __init__(self, length: float, majorDiameter: float, minorDiameter: float, pitch: float, cutAngle: float,
+                 notchWidth: float, helixTolerance: float, helixBackend: HelixBackend = HelixBackend.FITTED_SPLINE,
+                 sectionsPerTurn: int = 2, threadEngine: ThreadEngine = ThreadEngine.LOFT, isChamfered: bool = True):
+        super().__init__(length, majorDiameter, minorDiameter, pitch, cutAngle, notchWidth, helixTolerance,
+                         helixBackend, sectionsPerTurn, threadEngine, isChamfered)
+        object.__setattr__(self, '_geometry', ThreadGeometry(length, majorDiameter, minorDiameter, pitch, cutAngle,
+                                                             notchWidth))
+
+    def getGeometry(self) -> ThreadGeometry:
+        return self._geometry
+
+    def withTolerances(self, majorDiameterTolerance: float, minorDiameterTolerance: float,
+                       notchWidthTolerance: float) -> 'ThreadSpec':
+        return self.replace(majorDiameter=self.majorDiameter + majorDiameterTolerance,
+                            minorDiameter=self.minorDiameter + minorDiameterTolerance,
+                            notchWidth=self.notchWidth + notchWidthTolerance)
+
+    def toJson(self) -> str:
+        values = dict(zip(self._fields, self.getKey()))
+        values.update(helixBackend=self.helixBackend.value, threadEngine=self.threadEngine.value)
+        return json.dumps(values, sort_keys=True)
+
+    @staticmethod
+    def fromJson(text: str) -> 'ThreadSpec':
+        values = json.loads(text)
+        values.update(helixBackend=HelixBackend(values['helixBackend']),
+                      threadEngine=ThreadEngine(values['threadEngine']))
+        return ThreadSpec(**values)
@@ -0,0 +1,118 @@
+import json
+from typing import NamedTuple, Optional
+
+from adsk.core import Point3D, Matrix3D
+from adsk.fusion import Component, BRepBody, BaseFeature
+
+from .BRepUtils import createTemporaryCylinder, subtractBodies, transformBody, copyBody, removeTimelineItemsAfter
+from .ThreadFeature import ThreadFeature
+from .ThreadSpec import ThreadSpec
+from ..common.Common import getDesign
+
+_ATTRIBUTE_GROUP = 'ThreadGenerator'
+
+
+class ThreadStandIn(NamedTuple):
+    # everything needed to rebuild a thread body in place, stored as attributes of the body
+    spec: ThreadSpec
+    isMale: bool
+    # (diameter, length) of the cylinder a female thread is cut into
+    tubeDimensions: Optional[tuple]
+    # from the thread's own frame, origin at the bottom center and axis along z, into the body's component
+    transform: tuple
+    isFullDetail: bool
+
+    def getKey(self) -> tuple:
+        return self.spec, self.isMale, self.tubeDimensions
+
+    def getTransform(self) -> Matrix3D:
+        matrix = Matrix3D.create()
+        matrix.setWithArray(list(self.transform))
+        return matrix
+
+    def createLocalBody(self, component: Component, isFullDetail: bool) -> BRepBody:
+        # temporary body in the thread's own frame
+        if not isFullDetail:
+            return _createStandInBody(self)
+        # the helper features of the full thread are only needed to shape the temporary body
+        helperTimelineIndex = getDesign().timeline.markerPosition
+        body = _createFullBody(component, self)
+        removeTimelineItemsAfter(helperTimelineIndex)
+        return body
+
+
+def writeStandIn(body: BRepBody, standIn: ThreadStandIn):
+    attributes = body.attributes
+    attributes.add(_ATTRIBUTE_GROUP, 'spec', standIn.spec.toJson())
+    attributes.add(_ATTRIBUTE_GROUP, 'isMale', json.dumps(standIn.isMale))
+    attributes.add(_ATTRIBUTE_GROUP, 'tubeDimensions', json.dumps(standIn.tubeDimensions))
+    attributes.add(_ATTRIBUTE_GROUP, 'transform', json.dumps(list(standIn.transform)))
+    attributes.add(_ATTRIBUTE_GROUP, 'isFullDetail', json.dumps(standIn.isFullDetail))
+
+
+def readStandIn(body: BRepBody) -> Optional[ThreadStandIn]:
+    attribute = body.attributes.itemByName(_ATTRIBUTE_GROUP, 'spec')
+    if attribute is None:
+        return None
+    values = {name: json.loads(body.attributes.itemByName(_ATTRIBUTE_GROUP, name).value)
+              for name in ('isMale', 'tubeDimensions', 'transform', 'isFullDetail')}
+    tubeDimensions = values['tubeDimensions']
+    return ThreadStandIn(ThreadSpec.fromJson(attribute.value), values['isMale'],
+                         None if tubeDimensions is None else tuple(tubeDimensions), tuple(values['transform']),
+                         values['isFullDetail'])
+
+
+def setThreadDetail(bodies: [BRepBody], isFullDetail: bool) -> int:
+    # rebuilds the selected stand-ins in their base features, bodies of the same thread are built once
+    changedCount = 0
+    bodiesByKey = {}
+    for body in bodies:
+        body = body.nativeObject or body
+        standIn = readStandIn(body)
+        if standIn is None or standIn.isFullDetail == isFullDetail:
+            continue
+        baseFeature = _findBaseFeature(body)
+        if baseFeature is None:
+            continue
+        key = standIn.getKey()
+        if key not in bodiesByKey:
+            bodiesByKey[key] = standIn.createLocalBody(body.parentComponent, isFullDetail)
+        newBody = copyBody(bodiesByKey[key])
+        transformBody(newBody, standIn.getTransform())
+        baseFeature.startEdit()
+        baseFeature.updateBody(body, newBody)
+        baseFeature.finishEdit()
+        writeStandIn(body, standIn._replace(isFullDetail=isFullDetail))
+        changedCount += 1
+    return changedCount
+
+
+def _createStandInBody(standIn: ThreadStandIn) -> BRepBody:
+    # male threads as a plain shaft at the major diameter, female threads as a plain hole at the minor diameter
+    origin = Point3D.create(0, 0, 0)
+    if standIn.isMale:
+        return createTemporaryCylinder(origin, standIn.spec.majorDiameter / 2, standIn.spec.length)
+    diameter, length = standIn.tubeDimensions
+    tube = createTemporaryCylinder(origin, diameter / 2, length)
+    subtractBodies(tube, createTemporaryCylinder(origin, standIn.spec.minorDiameter / 2, standIn.spec.length))
+    return tube
+
+
+def _createFullBody(component: Component, standIn: ThreadStandIn) -> BRepBody:
+    threadFeature = ThreadFeature(component, Point3D.create(0, 0, 0), component.xYConstructionPlane, standIn.spec)
+    if standIn.isMale:
+        return threadFeature.createMaleThreadBody()
+    diameter, length = standIn.tubeDimensions
+    tube = createTemporaryCylinder(Point3D.create(0, 0, 0), diameter / 2, length)
+    threadFeature.cutFemaleThreadBody(tube)
+    return tube
+
+
+def _findBaseFeature(body: BRepBody) -> Optional[BaseFeature]:
+    baseFeatures = body.parentComponent.features.baseFeatures
+    for i in range(baseFeatures.count):
+        baseFeature = baseFeatures.item(i)
+        for j in range(baseFeature.bodies.count):
+            if baseFeature.bodies.item(j).entityToken == body.entityToken:
+                return baseFeature
+    return None
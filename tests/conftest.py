@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the tests import the pure python modules of the add-in as the `lib` package, without Fusion 360
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,19 @@
+import pytest
+
+from lib.geometry.CouponArguments import createCouponArgumentParser, parseCouponArguments
+
+
+def test_threadDefinitionFillsInTheArguments():
+    args = parseCouponArguments(createCouponArgumentParser('test'), ['--thread-definition', 'M6', '--pitch', '3'])
+    # the table row takes precedence over the explicit arguments
+    assert (args.length, args.major_diameter, args.minor_diameter, args.pitch) == (4, 6, 4.9175, 1)
+
+
+def test_unknownThreadDefinitionIsRejected(capsys):
+    with pytest.raises(SystemExit):
+        parseCouponArguments(createCouponArgumentParser('test'), ['--thread-definition', 'm6x0.7'])
+    assert "unknown thread definition 'm6x0.7', names starting with it: M6x0.75" in capsys.readouterr().err
+
+
+def test_helpDoesNotListTheThreadTable():
+    assert 'M6x0.75' not in createCouponArgumentParser('test').format_help()
@@ -0,0 +1,73 @@
+import math
+
+import pytest
+
+from lib.geometry import Helix
+from lib.geometry.Helix import HelixSpec, clearHelixCache, getHelixDeviation, getHelixSteps, \
+    getRationalHelix, getRationalHelixDeviation, getRationalHelixSegmentsPerTurn, getSectionPositions, sampleHelix
+
+
+def createSpec(turnCount=10.0, radius=0.55, pitch=0.2, tolerance=0.002) -> HelixSpec:
+    rise = pitch / (2 * math.pi)
+    return HelixSpec(radius, rise, turnCount * pitch, tolerance)
+
+
+@pytest.mark.parametrize('tolerance', [0.02, 0.002, 0.0002, 0.00001])
+def test_helixStepsKeepTheDeviationWithinTolerance(tolerance):
+    spec = createSpec(tolerance=tolerance)
+    assert getHelixDeviation(spec) <= tolerance
+
+
+def test_helixStepsGrowAsTheToleranceShrinks():
+    stepCounts = [getHelixSteps(createSpec(tolerance=tolerance)) for tolerance in (0.02, 0.002, 0.0002)]
+    assert stepCounts == sorted(stepCounts)
+    assert stepCounts[0] < stepCounts[-1]
+
+
+def test_looseToleranceStillWindsAroundTheAxis():
+    # at most a quarter turn between samples, never fewer than four samples
+    assert getHelixSteps(createSpec(tolerance=10.0)) == 10 * 4 + 1
+    assert getHelixSteps(createSpec(turnCount=0.1, tolerance=10.0)) == 4
+
+
+def test_sectionPositionsSpanTheHelix():
+    positions = getSectionPositions(createSpec(turnCount=5), 2)
+    assert len(positions) == 11
+    assert positions[0] == 0 and positions[-1] == 1
+    assert positions == pytest.approx([i / 10 for i in range(11)])
+    # a partial turn rounds up, a helix always has both end sections
+    assert len(getSectionPositions(createSpec(turnCount=5.2), 2)) == 12
+    assert getSectionPositions(createSpec(turnCount=0.1), 1) == [0.0, 1.0]
+
+
+@pytest.mark.parametrize('isNumpyUsed', [True, False])
+def test_samplesEndAtTheHelixHeight(monkeypatch, isNumpyUsed):
+    if not isNumpyUsed:
+        monkeypatch.setattr(Helix, 'numpy', None)
+    clearHelixCache()
+    spec = createSpec(turnCount=2.25)
+    samples = [tuple(sample) for sample in sampleHelix(spec, (1.0, 2.0, 3.0))]
+    clearHelixCache()
+    assert len(samples) == getHelixSteps(spec)
+    assert samples[0] == pytest.approx((1.0 + spec.radius, 2.0, 3.0))
+    # a quarter turn past two full turns
+    assert samples[-1] == pytest.approx((1.0, 2.0 + spec.radius, 3.0 + spec.height))
+
+
+@pytest.mark.parametrize('tolerance', [0.02, 0.002, 0.0002])
+def test_rationalHelixUsesTheFewestSegmentsWithinTolerance(tolerance):
+    spec = createSpec(tolerance=tolerance)
+    segmentsPerTurn = getRationalHelixSegmentsPerTurn(spec)
+    assert getRationalHelixDeviation(spec, segmentsPerTurn) <= tolerance
+    assert segmentsPerTurn == 3 or getRationalHelixDeviation(spec, segmentsPerTurn - 1) > tolerance
+
+
+def test_rationalHelixEndsAtTheHelixHeight():
+    spec = createSpec(turnCount=2.5)
+    helix = getRationalHelix(spec, 4)
+    segmentCount = 10
+    assert len(helix.controlPoints) == 2 * segmentCount + 1
+    assert len(helix.knots) == len(helix.controlPoints) + helix.degree + 1
+    assert helix.controlPoints[0] == pytest.approx((spec.radius, 0, 0))
+    # two and a half turns end on the opposite side of the axis
+    assert helix.controlPoints[-1] == pytest.approx((-spec.radius, 0, spec.height))
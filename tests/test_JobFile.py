@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from lib.ThreadDefinitions import ThreadDefinition
+from lib.batch.JobFile import JobCheckpoint, ThreadJob, loadJobs
+
+
+def writeJobFile(tmp_path, entries: [dict]) -> str:
+    path = str(tmp_path / 'jobs.json')
+    with open(path, 'w') as jobFile:
+        json.dump({'jobs': entries}, jobFile)
+    return path
+
+
+def test_entryWithoutListsIsOneJob(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'pitch': 1.5, 'isMale': False}]))
+    assert jobs == [ThreadJob(pitch=1.5, isMale=False)]
+
+
+def test_listsAreSweptInEveryCombination(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'pitch': [1, 2], 'isMale': [True, False], 'generationCount': 3}]))
+    assert [(job.pitch, job.isMale) for job in jobs] == [(1, True), (1, False), (2, True), (2, False)]
+    assert all(job.generationCount == 3 for job in jobs)
+
+
+def test_threadDefinitionFillsInTheThreadDimensions(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'threadDefinition': 'M6'}]))
+    assert jobs == [ThreadJob(threadDefinition='M6', length=4, majorDiameter=6, minorDiameter=4.9175, pitch=1,
+                              cutAngle=30, notchWidth=0.125)]
+
+
+def test_explicitFieldsOverrideTheThreadDefinition(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'threadDefinition': 'M6', 'length': 12, 'notchWidth': [0.1, 0.2]}]))
+    assert [(job.length, job.notchWidth) for job in jobs] == [(12, 0.1), (12, 0.2)]
+    # the fields not given still come from the table row
+    assert all((job.majorDiameter, job.minorDiameter, job.pitch) == (6, 4.9175, 1) for job in jobs)
+
+
+def test_allThreadDefinitionsAreExpanded(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'threadDefinition': '*', 'isMale': [True, False]}]))
+    threadNames = ThreadDefinition.getThreadNames()
+    assert len(jobs) == 2 * len(threadNames)
+    assert [job.threadDefinition for job in jobs[::2]] == threadNames
+    assert jobs[0].majorDiameter == ThreadDefinition.fromThreadName(threadNames[0]).majorDiameter
+
+
+def test_allThreadDefinitionsInAList(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'threadDefinition': ['M6', '*']}]))
+    # M6 is part of the table, the overlapping job is built once
+    threadNames = ThreadDefinition.getThreadNames()
+    assert [job.threadDefinition for job in jobs] == ['M6'] + [name for name in threadNames if name != 'M6']
+
+
+def test_unknownThreadDefinitionsAreRejected(tmp_path):
+    with pytest.raises(ValueError, match='unknown thread definitions M6x9'):
+        loadJobs(writeJobFile(tmp_path, [{'threadDefinition': ['*', 'M6x9']}]))
+
+
+def test_unknownFieldsAreRejected(tmp_path):
+    with pytest.raises(ValueError, match='unknown job fields majorDiamter, pich'):
+        loadJobs(writeJobFile(tmp_path, [{'pitch': 1}, {'majorDiamter': 6, 'pich': 1}]))
+
+
+def test_overlappingEntriesAreBuiltOnce(tmp_path):
+    jobs = loadJobs(writeJobFile(tmp_path, [{'pitch': [1, 2]}, {'pitch': [2, 3]}, {'threadDefinition': 'M6'},
+                                            {'threadDefinition': ['M6', 'M8']}]))
+    assert [(job.threadDefinition, job.pitch) for job in jobs] == [(None, 1), (None, 2), (None, 3), ('M6', 1),
+                                                                    ('M8', 1.25)]
+
+
+def test_checkpointRunsFailedJobsAgain(tmp_path):
+    path = writeJobFile(tmp_path, [{'pitch': [1, 2]}])
+    builtJob, failedJob = loadJobs(path)
+    checkpoint = JobCheckpoint(path)
+    checkpoint.add(builtJob, {'error': None, 'time': 1.0, 'generationCount': 10, 'timelineItems': 40})
+    checkpoint.add(failedJob, {'error': 'loft failed', 'time': 0.5, 'generationCount': 10, 'timelineItems': 0})
+    # a new run reads the checkpoint back from next to the job file
+    checkpoint = JobCheckpoint(path)
+    assert checkpoint.getPath() == str(tmp_path / 'jobs.checkpoint.json')
+    assert checkpoint.isFinished(builtJob)
+    assert not checkpoint.isFinished(failedJob)
@@ -0,0 +1,112 @@
+import math
+
+from lib.CouponSpec import CouponSpec
+from lib.OutputMode import OutputMode
+from lib.plan.BuildPlan import BuildPlan, OffsetPlane, Sketch, Circle, Line, Profile, Extrude, Loft, \
+    REFERENCE_FIELDS, FEATURE_TYPES, NEW_BODY, JOIN, XY_PLANE
+from lib.plan.PlanCli import main
+from lib.plan.PlanOptimizer import optimizePlan
+from lib.plan.Planner import planCoupon
+from lib.sketch.ThreadSpec import ThreadSpec
+
+
+def createCouponSpec(isMale=True, generationCount=3) -> CouponSpec:
+    threadSpec = ThreadSpec(2.0, 1.1, 1.0, 0.2, math.radians(30), 0.05, 0.002)
+    return CouponSpec(threadSpec, isMale, generationCount, 0.01, 0.01, 0.01, OutputMode.PLANNED)
+
+
+def planCircleExtrude(plan: BuildPlan, radius: float, distance: float) -> int:
+    sketch = plan.add(Sketch, plan.add(OffsetPlane, XY_PLANE, 0.0))
+    plan.add(Circle, sketch, (0.0, 0.0, 0.0), radius)
+    return plan.add(Extrude, plan.add(Profile, sketch, 0), distance, NEW_BODY)
+
+
+def getReferences(operation) -> list:
+    references = []
+    for field in REFERENCE_FIELDS[type(operation)]:
+        reference = getattr(operation, field)
+        references += list(reference) if isinstance(reference, tuple) else [reference]
+    return [reference for reference in references if not isinstance(reference, str)]
+
+
+def assertReferencesResolve(plan: BuildPlan):
+    ids = set()
+    for operation in plan.getOperations():
+        assert set(getReferences(operation)) <= ids
+        ids.add(operation.id)
+
+
+def test_duplicatePlaneSketchAndProfileCollapse():
+    plan = BuildPlan()
+    planCircleExtrude(plan, 0.5, 1.0)
+    planCircleExtrude(plan, 0.5, 2.0)
+    optimizedPlan = optimizePlan(plan)
+    statistics = optimizedPlan.getStatistics()
+    assert statistics['OffsetPlane'] == 1
+    assert statistics['Sketch'] == 1
+    assert statistics['Circle'] == 1
+    assert statistics['Profile'] == 1
+    # features are never merged, both extrudes now use the kept profile
+    extrudes = [operation for operation in optimizedPlan.getOperations() if isinstance(operation, Extrude)]
+    assert [extrude.distance for extrude in extrudes] == [1.0, 2.0]
+    assert extrudes[0].profile == extrudes[1].profile
+    assertReferencesResolve(optimizedPlan)
+
+
+def test_sketchesWithDifferentCurvesAreKept():
+    plan = BuildPlan()
+    planCircleExtrude(plan, 0.5, 1.0)
+    planCircleExtrude(plan, 0.6, 1.0)
+    statistics = optimizePlan(plan).getStatistics()
+    # the planes still merge, the sketches on them differ
+    assert statistics['OffsetPlane'] == 1
+    assert statistics['Sketch'] == 2
+    assert statistics['Profile'] == 2
+
+
+def test_loftReferencesAreRemapped():
+    plan = BuildPlan()
+    profiles = []
+    for i in range(2):
+        sketch = plan.add(Sketch, plan.add(OffsetPlane, XY_PLANE, 1.0))
+        plan.add(Line, sketch, (0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+        profiles.append(plan.add(Profile, sketch, 0))
+    centerLine = plan.add(Line, plan.add(Sketch, XY_PLANE), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0))
+    plan.add(Loft, tuple(profiles), centerLine, JOIN)
+    optimizedPlan = optimizePlan(plan)
+    loft = optimizedPlan.getOperations()[-1]
+    assert loft.profiles == (profiles[0], profiles[0])
+    assert loft.centerLine == centerLine
+    assertReferencesResolve(optimizedPlan)
+
+
+def test_couponPlanKeepsFeatures():
+    for isMale in (True, False):
+        plan = planCoupon(createCouponSpec(isMale))
+        optimizedPlan = optimizePlan(plan)
+        assert len(optimizedPlan.getOperations()) < len(plan.getOperations())
+        assert optimizedPlan.getFeatureCount() == plan.getFeatureCount()
+        assert [type(operation) for operation in optimizedPlan.getOperations()
+                if isinstance(operation, FEATURE_TYPES)] == \
+               [type(operation) for operation in plan.getOperations() if isinstance(operation, FEATURE_TYPES)]
+        assertReferencesResolve(optimizedPlan)
+
+
+def test_optimizedPlanSurvivesJson():
+    optimizedPlan = optimizePlan(planCoupon(createCouponSpec()))
+    assert BuildPlan.fromJson(optimizedPlan.toJson()).getOperations() == optimizedPlan.getOperations()
+
+
+def test_workersPlanLikeSerial():
+    spec = createCouponSpec(generationCount=4)
+    assert planCoupon(spec, workers=2).toJson() == planCoupon(spec).toJson()
+
+
+def test_cliWorkersWriteTheSamePlan(tmp_path):
+    arguments = ['--generation-count', '4', '--major-diameter-step', '0.1', '--notch-width-step', '0.05']
+    serialPath = str(tmp_path / 'serial.json')
+    workersPath = str(tmp_path / 'workers.json')
+    assert main([serialPath] + arguments) == 0
+    assert main([workersPath, '--workers', '2'] + arguments) == 0
+    with open(serialPath) as serialFile, open(workersPath) as workersFile:
+        assert serialFile.read() == workersFile.read()
@@ -0,0 +1,22 @@
+from lib.ThreadDefinitions import ThreadDefinition
+
+
+def test_prefixSearchIgnoresCase():
+    assert ThreadDefinition.findThreadNames('m6x') == ['M6x0.75']
+    assert ThreadDefinition.findThreadNames(' g 1/') == ['G 1/16', 'G 1/8', 'G 1/4', 'G 1/2']
+
+
+def test_prefixSearchKeepsTheTableOrder():
+    names = ThreadDefinition.findThreadNames('M6', 4)
+    assert names == ['M6', 'M6x0.75', 'M60', 'M60x4']
+    assert ThreadDefinition.findThreadNames('#') == [name for name in ThreadDefinition.getThreadNames()
+                                                     if name.startswith('#')]
+
+
+def test_unmatchedPrefixFindsNothing():
+    assert ThreadDefinition.findThreadNames('X') == []
+    assert len(ThreadDefinition.findThreadNames('')) == 100
+
+
+def test_rowsKeepTheirValues():
+    assert tuple(ThreadDefinition.fromThreadName('G 1/4'))[1:] == (9, 13.16, 11.44, 1.34, 27.5, 0.2)
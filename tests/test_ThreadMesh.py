@@ -0,0 +1,82 @@
+import math
+
+import numpy
+import pytest
+
+from lib.geometry.Coupon import CouponParameters
+from lib.geometry.ThreadGeometry import ThreadGeometry
+from lib.geometry.ThreadMesh import MeshResolution, MeshShell, createBoxShell, createCouponMesh, \
+    createThreadShells, mergeShells, transformShell
+
+_RESOLUTION = MeshResolution(64, 16)
+
+
+def createGeometry(majorDiameter=1.1) -> ThreadGeometry:
+    return ThreadGeometry(2.0, majorDiameter, 1.0, 0.2, math.radians(30), 0.05)
+
+
+def getVolume(shell: MeshShell) -> float:
+    v0, v1, v2 = (shell.vertices[shell.faces[:, i]] for i in range(3))
+    return numpy.einsum('ij,ij->', v0, numpy.cross(v1, v2)) / 6
+
+
+def assertWatertight(shell: MeshShell):
+    # every directed edge is matched by exactly one opposite edge, so the shell is closed and consistently oriented
+    edges = numpy.concatenate((shell.faces[:, [0, 1]], shell.faces[:, [1, 2]], shell.faces[:, [2, 0]]))
+    uniqueEdges = numpy.unique(edges, axis=0)
+    assert len(uniqueEdges) == len(edges)
+    assert numpy.array_equal(uniqueEdges, numpy.unique(edges[:, ::-1], axis=0))
+
+
+def getPolygonArea(radius: float) -> float:
+    return _RESOLUTION.segmentsPerTurn / 2 * radius ** 2 * math.sin(2 * math.pi / _RESOLUTION.segmentsPerTurn)
+
+
+def test_boxShell():
+    box = createBoxShell((0, 0, 0), (1, 2, 3))
+    assertWatertight(box)
+    assert getVolume(box) == pytest.approx(6)
+
+
+def test_maleThreadShells():
+    geometries = [createGeometry(), createGeometry(1.12)]
+    shell = createThreadShells(geometries, [(0, 0), (3, 0)], _RESOLUTION, True, isChamfered=False)
+    assertWatertight(shell)
+    volume = getVolume(shell)
+    # both shafts lie between their minor and major cylinders
+    assert 2 * getPolygonArea(0.5) * 2.0 < volume < (getPolygonArea(0.55) + getPolygonArea(0.56)) * 2.0
+
+
+def test_chamferOnlyRemovesMaterial():
+    shells = [createThreadShells([createGeometry()], [(0, 0)], _RESOLUTION, True, isChamfered=isChamfered)
+              for isChamfered in (False, True)]
+    assertWatertight(shells[1])
+    assert getVolume(shells[1]) < getVolume(shells[0])
+
+
+def test_femaleThreadShells():
+    shell = createThreadShells([createGeometry()], [(0, 0)], _RESOLUTION, False, outerRadius=1.0, height=2.5)
+    assertWatertight(shell)
+    # a tube around the threaded hole
+    assert (getPolygonArea(1.0) - getPolygonArea(0.55)) * 2.5 < getVolume(shell) < \
+        (getPolygonArea(1.0) - getPolygonArea(0.5)) * 2.5
+
+
+@pytest.mark.parametrize('isMale', [True, False])
+def test_couponMeshIsClosed(isMale):
+    parameters = CouponParameters(2.0, 1.1, 1.0, 0.2, math.radians(30), 0.05, isMale, 3, 0.01, 0.01, 0.01)
+    mesh = createCouponMesh(parameters, MeshResolution(32, 8))
+    assertWatertight(mesh)
+    assert getVolume(mesh) > 0
+
+
+def test_mergeAndTransformKeepTheVolume():
+    boxes = [createBoxShell((0, 0, 0), (1, 1, 1)), createBoxShell((2, 0, 0), (3, 2, 1))]
+    merged = mergeShells(boxes)
+    assertWatertight(merged)
+    assert getVolume(merged) == pytest.approx(3)
+    # a quarter turn about z and a translation
+    matrix = [0, -1, 0, 5, 1, 0, 0, 6, 0, 0, 1, 7, 0, 0, 0, 1]
+    transformed = transformShell(merged, matrix)
+    assert getVolume(transformed) == pytest.approx(3)
+    assert transformed.vertices[0] == pytest.approx([5, 6, 7])
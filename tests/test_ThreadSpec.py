@@ -0,0 +1,44 @@
+import pickle
+
+import pytest
+
+from lib.sketch.ThreadSpec import HelixBackend, ThreadEngine, ThreadSpec
+
+
+def createSpec(**changes) -> ThreadSpec:
+    return ThreadSpec(2.0, 1.1, 1.0, 0.2, 0.52, 0.05, 0.002, HelixBackend.NURBS, 3, ThreadEngine.SWEEP,
+                      False).replace(**changes)
+
+
+def test_jsonRoundTrip():
+    spec = createSpec()
+    assert ThreadSpec.fromJson(spec.toJson()) == spec
+    assert ThreadSpec.fromJson(spec.toJson()).helixBackend is HelixBackend.NURBS
+
+
+def test_equalSpecsShareAHash():
+    specs = {createSpec(): 'a'}
+    assert specs[createSpec()] == 'a'
+    assert createSpec(pitch=0.25) not in specs
+    assert createSpec() != createSpec().getKey()
+
+
+def test_pickleKeepsTheGeometry():
+    spec = pickle.loads(pickle.dumps(createSpec()))
+    assert spec == createSpec()
+    assert spec.getGeometry().getPitch() == 0.2
+
+
+def test_specIsImmutable():
+    spec = createSpec()
+    with pytest.raises(AttributeError):
+        spec.pitch = 0.3
+    with pytest.raises(AttributeError):
+        del spec.pitch
+
+
+def test_tolerancesOnlyChangeTheSteppedFields():
+    spec = createSpec().withTolerances(0.01, 0.02, 0.03)
+    assert (spec.majorDiameter, spec.minorDiameter, spec.notchWidth) == pytest.approx((1.11, 1.02, 0.08))
+    assert spec.replace(majorDiameter=1.1, minorDiameter=1.0, notchWidth=0.05) == createSpec()
+    assert spec.getGeometry().getMajorDiameter() == pytest.approx(1.11)
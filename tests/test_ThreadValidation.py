@@ -0,0 +1,71 @@
+import math
+
+import pytest
+
+from lib.geometry.ThreadGeometry import ThreadGeometry
+from lib.geometry.ThreadValidation import ThreadValidationError, getViolations, validateGenerations
+
+
+def createGeometry(length=2.0, majorDiameter=1.1, minorDiameter=1.0, pitch=0.2, cutAngle=math.radians(30),
+                   notchWidth=0.05) -> ThreadGeometry:
+    # the dialog defaults, in centimeters
+    return ThreadGeometry(length, majorDiameter, minorDiameter, pitch, cutAngle, notchWidth)
+
+
+def test_validGeometryHasNoViolations():
+    assert getViolations(createGeometry(), True) == []
+
+
+def test_minorDiameterNotLessThanMajorDiameter():
+    violations = getViolations(createGeometry(minorDiameter=1.2), False)
+    assert len(violations) == 1
+    assert 'minor diameter 12 mm is not less than the major diameter 11 mm' in violations[0]
+
+
+def test_minorDiameterNotPositive():
+    violations = getViolations(createGeometry(majorDiameter=0.2, minorDiameter=-0.1, notchWidth=0.01, pitch=0.5),
+                               True)
+    assert violations == ['minor diameter -1 mm is not positive, the cut depth reaches past the thread axis']
+    assert getViolations(createGeometry(majorDiameter=0.2, minorDiameter=0.0, notchWidth=0.01, pitch=0.5), False)
+
+
+@pytest.mark.parametrize('cutAngle', [0.0, -10.0, 90.0, 120.0])
+def test_cutAngleOutsideOpenRange(cutAngle):
+    violations = getViolations(createGeometry(cutAngle=math.radians(cutAngle)), False)
+    assert violations == ['cut angle {:g} deg is not between 0 and 90 deg'.format(cutAngle)]
+
+
+def test_protrusionWidthNotLessThanPitch():
+    # a 0.5 mm notch with a 30 degree cut protrudes 1.0774 mm
+    violations = getViolations(createGeometry(pitch=0.1), False)
+    assert len(violations) == 1
+    assert 'protrusion width 1.0774 mm is not less than the pitch 1 mm' in violations[0]
+
+
+def test_pitchNotLessThanCircumference():
+    # the helix angle would be asin(pitch / (pi * majorDiameter)) of a value past 1
+    geometry = createGeometry(majorDiameter=0.05, minorDiameter=0.049, notchWidth=0.0, pitch=0.2)
+    violations = getViolations(geometry, False)
+    assert len(violations) == 1
+    assert 'is not less than the circumference' in violations[0]
+
+
+def test_chamferTriangleInversion():
+    # the protrusion is wider than the minor radius, the chamfer triangle folds over the thread axis
+    geometry = createGeometry(majorDiameter=0.3, minorDiameter=0.04, pitch=0.6, cutAngle=0.1, notchWidth=0.01)
+    assert getViolations(geometry, False) == []
+    violations = getViolations(geometry, True)
+    assert len(violations) == 1
+    assert 'chamfer triangle inverts' in violations[0]
+
+
+def test_validateGenerationsReportsEveryGeneration():
+    geometries = [(0, createGeometry()), (1, createGeometry(minorDiameter=1.2)), (2, createGeometry(pitch=0.1))]
+    with pytest.raises(ThreadValidationError) as errorInfo:
+        validateGenerations(geometries, True)
+    assert [i for i, message in errorInfo.value.violations] == [1, 2]
+    assert str(errorInfo.value).splitlines()[0].startswith('Generation 1: minor diameter')
+
+
+def test_validateGenerationsAcceptsValidGenerations():
+    validateGenerations([(i, createGeometry(majorDiameter=1.1 + i * 0.01)) for i in range(10)], True)